@@ -0,0 +1,38 @@
+"""unique payroll per employee and period
+
+Revision ID: d3542d3b3812
+Revises: ebde81f71a21
+Create Date: 2026-10-19 17:31:57.486982
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3542d3b3812'
+down_revision: Union[str, Sequence[str], None] = 'ebde81f71a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drop pending duplicates from earlier concurrent runs, keeping the approved or
+    # paid row, else the first one created
+    op.execute(
+        "DELETE FROM payroll WHERE status = 'pending' AND EXISTS ("
+        "SELECT 1 FROM payroll AS other WHERE other.employee_id = payroll.employee_id "
+        "AND other.month = payroll.month AND other.year = payroll.year AND other.id != payroll.id "
+        "AND (other.status != 'pending' OR other.id < payroll.id))"
+    )
+    with op.batch_alter_table('payroll', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_payroll_employee_period', ['employee_id', 'month', 'year'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('payroll', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_payroll_employee_period', type_='unique')
@@ -0,0 +1,72 @@
+from typing import Any, List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.api import deps
+from app.db.session import AsyncSessionLocal
+from app.models.batch_job import BatchJob as BatchJobModel
+from app.models.academic_standing import AcademicStanding as AcademicStandingModel
+from app.schemas.batch_job import BatchJob
+from app.schemas.academic_standing import AcademicStanding
+from app.services.academic_service import academic_service
+
+router = APIRouter()
+
+async def _run_standing_job(job_id: int, chunk_size: int) -> None:
+    # Background tasks outlive the request session, so open a dedicated one
+    async with AsyncSessionLocal() as db:
+        job = await db.get(BatchJobModel, job_id)
+        if job:
+            await academic_service.run_term_standing(db, job, chunk_size=chunk_size)
+
+@router.post("/run", response_model=BatchJob)
+async def run_term_standing(
+    term: str,
+    background_tasks: BackgroundTasks,
+    chunk_size: int = 500,
+    restart: bool = False,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Start the term-end standing batch job, or resume an interrupted one from its checkpoint.
+    A job that is still running is returned as is.
+    """
+    job = await academic_service.get_standing_job(db, term=term, restart=restart)
+    if await academic_service.claim_standing_job(db, job):
+        background_tasks.add_task(_run_standing_job, job.id, chunk_size)
+    return job
+
+@router.get("/jobs/{job_id}", response_model=BatchJob)
+async def read_standing_job(
+    job_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Progress and throughput of a standing job.
+    """
+    job = await db.get(BatchJobModel, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/", response_model=List[AcademicStanding])
+async def read_term_standings(
+    term: str,
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor", "Staff"]))
+) -> Any:
+    """
+    Read the standing snapshot for a term.
+    """
+    result = await db.execute(
+        select(AcademicStandingModel)
+        .where(AcademicStandingModel.term == term)
+        .order_by(AcademicStandingModel.student_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
@@ -1,12 +1,13 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.services.analytics_service import analytics_service
+from app.services.recommendation_service import course_recommender
+from app.services.ledger_service import ledger_service, CASH
 from app.models.student import Student
 from app.models.course import Course
 from app.models.user import User
-from app.models.tuition_invoice import TuitionInvoice
 from sqlalchemy import select, func
 
 router = APIRouter()
@@ -40,9 +41,8 @@ async def read_stats(
     result_employees = await db.execute(select(func.count(User.id)))
     total_employees = result_employees.scalar() or 0
     
-    # Calculate Balance (Total revenue collected)
-    result_balance = await db.execute(select(func.sum(TuitionInvoice.amount_paid)))
-    balance = result_balance.scalar() or 0.0
+    # Cash balance from the ledger
+    balance = await ledger_service.balance(db, CASH)
 
     return {
         "total_students": total_students,
@@ -65,30 +65,82 @@ async def get_student_risk(
 @router.get("/course-recommendations/{student_id}")
 async def get_course_recommendations(
     student_id: int,
+    limit: int = 3,
+    term: Optional[str] = None,
     db: AsyncSession = Depends(deps.get_db),
     current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
 ) -> Any:
     """
-    Get AI-driven course recommendations for a student.
+    Get AI-driven course recommendations for a student. Seats are checked for the
+    given term, by default the term of the latest enrollment.
     """
-    return await analytics_service.get_course_recommendations(db, student_id=student_id)
+    return await analytics_service.get_course_recommendations(db, student_id=student_id, limit=limit, term=term)
+
+@router.post("/course-recommendations/rebuild")
+async def rebuild_course_recommendations(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Rebuild the co-enrollment recommendation model from all enrollments and grades.
+    """
+    return await course_recommender.build(db)
 
 @router.get("/at-risk-students")
 async def get_at_risk_students(
     db: AsyncSession = Depends(deps.get_db),
     threshold: int = 40,
+    skip: int = 0,
+    limit: int = 100,
     current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
 ) -> Any:
     """
-    Get a list of all students whose risk score is above the threshold.
+    Get a page of students whose persisted risk score is above the threshold.
     """
-    result = await db.execute(select(Student))
-    students = result.scalars().all()
-    
-    at_risk = []
-    for student in students:
-        prediction = await analytics_service.predict_student_risk(db, student.id)
-        if prediction.get("risk_score", 0) >= threshold:
-            at_risk.append(prediction)
-            
-    return sorted(at_risk, key=lambda x: x["risk_score"], reverse=True)
+    return await analytics_service.get_at_risk_students(db, threshold=threshold, skip=skip, limit=limit)
+
+@router.post("/risk-scores/refresh")
+async def refresh_risk_scores(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Rebuild the risk-score table for all students.
+    """
+    count = await analytics_service.refresh_risk_scores(db)
+    return {"message": f"Refreshed risk scores for {count} students"}
+
+@router.get("/cohorts/programs/{program_id}")
+async def get_program_cohort(
+    program_id: int,
+    term: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    GPA distribution, pass/resit rates and classifications for a program.
+    """
+    return await analytics_service.get_cohort_stats(db, program_id=program_id, term=term)
+
+@router.get("/cohorts/courses/{course_id}")
+async def get_course_cohort(
+    course_id: int,
+    term: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    Grade-point distribution, pass/resit rates and classifications for a course.
+    """
+    return await analytics_service.get_cohort_stats(db, course_id=course_id, term=term)
+
+@router.get("/cohorts/terms")
+async def get_term_cohort(
+    term: str,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    Institution-wide cohort statistics for a term.
+    """
+    return await analytics_service.get_cohort_stats(db, term=term)
@@ -0,0 +1,69 @@
+from typing import Any, List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.schemas.budget import Budget, BudgetCreate, BudgetUpdate, BudgetUtilization
+from app.services.budget_service import budget_service
+
+router = APIRouter()
+
+@router.post("/", response_model=Budget)
+async def create_budget(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    budget_in: BudgetCreate,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Budget for a category, a vendor, both, or all spending (leave both empty) over a
+    YYYY-MM period. Expenses already approved in the period are counted in.
+    """
+    budget = await budget_service.create_budget(db, budget_in)
+    if isinstance(budget, dict):
+        raise HTTPException(status_code=400, detail=budget["error"])
+    return budget
+
+@router.get("/utilization", response_model=List[BudgetUtilization])
+async def read_budget_utilization(
+    period: str,
+    category: Optional[str] = None,
+    vendor_id: Optional[int] = None,
+    over_only: bool = False,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    budgets = await budget_service.get_utilization(
+        db, period=period, category=category, vendor_id=vendor_id, over_only=over_only
+    )
+    if isinstance(budgets, dict):
+        raise HTTPException(status_code=400, detail=budgets["error"])
+    return budgets
+
+@router.get("/burn-rate")
+async def read_budget_burn_rate(
+    period: str,
+    as_of: Optional[date] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Spend per day so far, projected month-end spend and days until each budget runs out.
+    """
+    burn_rate = await budget_service.get_burn_rate(db, period=period, as_of=as_of)
+    if isinstance(burn_rate, dict):
+        raise HTTPException(status_code=400, detail=burn_rate["error"])
+    return burn_rate
+
+@router.patch("/{id}", response_model=Budget)
+async def update_budget(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    id: int,
+    budget_in: BudgetUpdate,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    budget = await budget_service.update_amount(db, id, budget_in.amount)
+    if isinstance(budget, dict):
+        raise HTTPException(status_code=404 if budget["error"] == "Budget not found" else 400, detail=budget["error"])
+    return budget
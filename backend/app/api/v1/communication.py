@@ -159,7 +159,8 @@ async def send_message(
         user_id=current_user.id,
         action="SEND_MESSAGE",
         target_table="message",
-        changes={"is_encrypted": message_in.is_encrypted}
+        changes={"is_encrypted": message_in.is_encrypted},
+        commit=False
     )
     
     await db.commit()
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api import deps
+from app.core.config import settings
 from app.crud.crud_enrollment import enrollment as crud_enrollment
 from app.crud.crud_student import student as crud_student
 from app.crud.crud_course import course as crud_course
@@ -15,6 +16,9 @@ from app.utils.academic import (
     check_max_stay
 )
 from app.models.tuition_invoice import TuitionInvoice
+from app.services.academic_service import academic_service
+from app.services.recommendation_service import course_recommender
+from app.services.timetable_service import timetable_service
 
 router = APIRouter()
 
@@ -27,6 +31,8 @@ async def enroll_student(
 ) -> Any:
     """
     Enroll a student in a course with strict ICT University rule enforcement.
+    Timetable clashes block registration only with ENROLLMENT_BLOCK_TIMETABLE_CLASHES;
+    otherwise check them through GET /timetable/clashes.
     """
     # 1. Fetch Student and Course
     student = await crud_student.get(db, id=enroll_in.student_id)
@@ -44,8 +50,12 @@ async def enroll_student(
             detail="Registration Blocked: 50% Fee Clearance required for this semester."
         )
 
+    # Term-end standing snapshot, if the batch job has produced one
+    standing = await academic_service.get_latest_standing(db, student.id)
+
     # 3. Rule 4.2: Maximum Stay (7 Years)
-    if not check_max_stay(student.enrollment_date):
+    within_max_stay = standing.within_max_stay if standing else check_max_stay(student.enrollment_date)
+    if not within_max_stay:
         raise HTTPException(status_code=403, detail="Registration Blocked: Maximum stay of 7 years exceeded.")
 
     # 4. Rule 1.2: Prerequisite Enforcement
@@ -57,8 +67,12 @@ async def enroll_student(
 
     # 5. Rule 5.2 & 2.1: Credit Limits (30 Standard / 20 Probation)
     courses_db = await crud_course.get_multi(db)
-    cgpa = calculate_cgpa(student.grades, courses_db)
-    max_credits = check_max_credits(cgpa)
+    if standing:
+        cgpa = standing.cgpa
+        max_credits = standing.max_credits
+    else:
+        cgpa = calculate_cgpa(student.grades, courses_db)
+        max_credits = check_max_credits(cgpa)
     
     # Calculate current credits in this term (including the requested course)
     current_enrollments = await crud_enrollment.get_by_student(db, student_id=student.id)
@@ -80,8 +94,49 @@ async def enroll_student(
     if any(e.course_id == course.id for e in term_enrollments):
         raise HTTPException(status_code=400, detail="Student is already enrolled in this course for this term.")
 
-    # 7. Create Enrollment
-    return await crud_enrollment.create(db, obj_in=enroll_in)
+    # 7. Timetable clash with the student's other courses this term, when configured to block
+    if settings.ENROLLMENT_BLOCK_TIMETABLE_CLASHES:
+        clashes = await timetable_service.get_clashes(
+            db, student_id=student.id, course_id=course.id, term=enroll_in.term
+        )
+        if clashes:
+            clash = clashes[0]
+            raise HTTPException(
+                status_code=400,
+                detail=f"Registration Blocked: {course.code} clashes with course {clash['course_id']} on {clash['day']} period {clash['period']}."
+            )
+
+    # 8. Create Enrollment
+    enrollment = await crud_enrollment.create(db, obj_in=enroll_in)
+    course_recommender.record_enrollment(
+        course.id, [e.course_id for e in current_enrollments if e.status != "dropped"], enroll_in.term
+    )
+    return enrollment
+
+@router.patch("/{id}", response_model=Enrollment)
+async def update_enrollment_status(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    id: int,
+    enroll_in: EnrollmentUpdate,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Drop or complete an enrollment. Registering again goes through enrollment, where the rules apply.
+    """
+    enrollment = await crud_enrollment.get(db, id=id)
+    if not enrollment:
+        raise HTTPException(status_code=404, detail="Enrollment not found")
+    if enroll_in.status not in ("dropped", "completed"):
+        raise HTTPException(status_code=400, detail="Status must be dropped or completed")
+    if enrollment.status != "enrolled":
+        raise HTTPException(status_code=400, detail=f"Enrollment is already {enrollment.status}")
+    enrollment = await crud_enrollment.update(db, db_obj=enrollment, obj_in={"status": enroll_in.status})
+    # The seat is free again; a drop also leaves the co-enrollment counts
+    course_recommender.release_seat(enrollment.course_id, enrollment.term)
+    if enroll_in.status == "dropped":
+        course_recommender.mark_stale()
+    return enrollment
 
 @router.get("/student/{student_id}", response_model=List[Enrollment])
 async def read_student_enrollments(
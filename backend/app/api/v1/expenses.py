@@ -1,11 +1,14 @@
 import os
 from typing import Any, List
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import func
 from app.api import deps
 from app.crud.crud_expense import expense_approval as crud_expense
-from app.schemas.expense import ExpenseApproval, ExpenseApprovalCreate, ExpenseApprovalUpdate
+from app.schemas.expense import ExpenseApproval, ExpenseApprovalCreate, ExpenseApprovalUpdate, ExpenseBulkAction
+from app.services.ledger_service import ledger_service
+from app.services.budget_service import APPROVED_STATUSES, budget_service
+from app.services.expense_service import expense_service
 
 router = APIRouter()
 
@@ -25,6 +28,36 @@ async def create_expense(
 ) -> Any:
     return await crud_expense.create(db, obj_in=expense_in)
 
+@router.post("/bulk-approve")
+async def bulk_approve_expenses(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    selection: ExpenseBulkAction,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Approve all pending expenses matching the given ids and/or filters in one transaction.
+    """
+    result = await expense_service.bulk_approve(db, selection, user_id=current_user.id)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+@router.post("/bulk-reject")
+async def bulk_reject_expenses(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    selection: ExpenseBulkAction,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Reject all pending expenses matching the given ids and/or filters in one transaction.
+    """
+    result = await expense_service.bulk_reject(db, selection, user_id=current_user.id)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
 @router.patch("/{id}/approve", response_model=ExpenseApproval)
 async def approve_expense(
     *,
@@ -34,7 +67,15 @@ async def approve_expense(
     db_obj = await crud_expense.get(db, id=id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Expense not found")
-    return await crud_expense.update(db, db_obj=db_obj, obj_in={"status": "approved", "approved_at": func.now()})
+    if db_obj.status != "pending":
+        raise HTTPException(status_code=400, detail=f"Expense is already {db_obj.status}")
+    # The approval, its journal entry and the budget actuals commit together
+    approved_at = datetime.now()
+    await ledger_service.post_expense(db, db_obj)
+    over_budget = await budget_service.apply_expense(db, db_obj, approved_at)
+    return await crud_expense.update(
+        db, db_obj=db_obj, obj_in={"status": "approved", "approved_at": approved_at, "over_budget": over_budget}
+    )
 
 @router.patch("/{id}/reject", response_model=ExpenseApproval)
 async def reject_expense(
@@ -45,6 +86,10 @@ async def reject_expense(
     db_obj = await crud_expense.get(db, id=id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Expense not found")
+    if db_obj.status in APPROVED_STATUSES and db_obj.approved_at is not None:
+        # Reverse its journal entry and take it back out of the budgets it was counted against
+        await ledger_service.reverse_expense(db, db_obj)
+        await budget_service.apply_expense(db, db_obj, db_obj.approved_at, sign=-1)
     return await crud_expense.update(db, db_obj=db_obj, obj_in={"status": "rejected"})
 
 @router.post("/{id}/upload-receipt")
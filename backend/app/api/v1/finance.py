@@ -1,32 +1,134 @@
-from typing import Any, List
+from typing import Any, List, Optional
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.crud.crud_transaction import transaction as crud_transaction
-from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate
+from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate, TransactionDailyRollup
+from app.services.finance_service import finance_service
+from app.services.aging_service import aging_service
+from app.services.statement_service import STATEMENT_COLUMNS, statement_service
+from app.utils.export import EXPORT_MEDIA_TYPES
 
 router = APIRouter()
 
 @router.get("/stats")
 async def get_finance_stats(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
     db: AsyncSession = Depends(deps.get_db),
     current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
 ) -> Any:
-    transactions = await crud_transaction.get_multi(db, limit=1000)
-    income = sum(t.amount for t in transactions if t.type == "income")
-    expenses = sum(t.amount for t in transactions if t.type == "expense")
-    return {
-        "total_income": income,
-        "total_expenses": expenses,
-        "net_profit": income - expenses,
-        "transaction_count": len(transactions)
-    }
+    """
+    Income, expense and net totals over all transactions, optionally within a date range or category.
+    """
+    return await crud_transaction.get_stats(db, start_date=start_date, end_date=end_date, category=category)
+
+@router.get("/stats/daily", response_model=List[TransactionDailyRollup])
+async def get_daily_finance_stats(
+    start_date: date,
+    end_date: date,
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Per-day, per-category income and expense totals for dashboards.
+    """
+    return await crud_transaction.get_daily(db, start_date=start_date, end_date=end_date, category=category)
+
+@router.post("/stats/rebuild")
+async def rebuild_finance_stats(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Recompute the daily rollup from the transaction table.
+    """
+    rows = await crud_transaction.rebuild_rollup(db)
+    return {"rollup_rows": rows}
+
+@router.get("/ar-aging")
+async def get_ar_aging(
+    group_by: str = "program",
+    as_of: Optional[date] = None,
+    program_id: Optional[int] = None,
+    refresh: bool = False,
+    limit: int = 100,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Outstanding receivables by aging bucket (current, 1-30, 31-60, 61-90, 90+), grouped by
+    program, fee_structure or student. Program and fee structure views come from the daily
+    snapshot; pass refresh=true to retake today's.
+    """
+    return await aging_service.get_report(
+        db, group_by=group_by, as_of=as_of, program_id=program_id, refresh=refresh, limit=limit
+    )
+
+@router.get("/ar-aging/trend")
+async def get_ar_aging_trend(
+    start_date: date,
+    end_date: date,
+    program_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Daily aging totals from stored snapshots, for trend charts.
+    """
+    return await aging_service.get_trend(db, start_date=start_date, end_date=end_date, program_id=program_id)
+
+@router.post("/ar-aging/snapshots")
+async def create_ar_aging_snapshot(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Take (or retake) today's aging snapshot.
+    """
+    rows = await aging_service.create_snapshot(db)
+    return {"snapshot_rows": rows}
+
+@router.get("/statements/export")
+async def export_statement(
+    source: str = "transactions",
+    format: str = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Stream a transaction or payment statement as CSV or NDJSON with a running balance,
+    for any date range (end_date inclusive). The balance carries in everything before
+    start_date. category applies to transactions only.
+    """
+    if source not in STATEMENT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown statement source. Use one of: {', '.join(STATEMENT_COLUMNS)}")
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown export format. Use one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+    filename = f"{source}-{start_date or 'start'}-{end_date or 'end'}.{format}"
+    return StreamingResponse(
+        statement_service.export(
+            source=source, format=format, start_date=start_date, end_date=end_date,
+            category=category if source == "transactions" else None
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.post("/apply-late-fees")
 async def apply_late_fees(
     db: AsyncSession = Depends(deps.get_db),
     current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
 ) -> Any:
+    """
+    Charge this month's late fees. Safe to rerun: each invoice or installment is charged once per month.
+    """
     return await finance_service.apply_late_fees(db)
 
 @router.get("/recruitment-funnel")
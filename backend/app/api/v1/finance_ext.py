@@ -5,8 +5,10 @@ from app.api import deps
 from app.crud.crud_finance_ext import vendor as crud_vendor, installment as crud_installment
 from app.schemas.finance_ext import (
     Vendor, VendorCreate, VendorUpdate,
-    TuitionInstallment, TuitionInstallmentCreate, TuitionInstallmentUpdate
+    TuitionInstallment, TuitionInstallmentCreate, TuitionInstallmentUpdate,
+    InstallmentPlanCreate
 )
+from app.services.finance_service import finance_service
 
 router = APIRouter()
 
@@ -55,3 +57,31 @@ async def create_installment(
     inst_in: TuitionInstallmentCreate,
 ) -> Any:
     return await crud_installment.create(db, obj_in=inst_in)
+
+@router.post("/installments/plans")
+async def create_installment_plans(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    plan_in: InstallmentPlanCreate,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Split many invoices into equal installments at once; the last installment takes the rounding residue.
+    """
+    return await finance_service.create_installment_plans(
+        db,
+        plan_in.invoice_ids,
+        plan_in.num_installments,
+        first_due=plan_in.first_due_date,
+        interval_days=plan_in.interval_days
+    )
+
+@router.post("/installments/sweep-overdue")
+async def sweep_overdue_installments(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Mark every pending installment past its due date as overdue.
+    """
+    return {"marked_overdue": await finance_service.sweep_overdue_installments(db)}
@@ -3,7 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.crud.crud_grade import grade as crud_grade
+from app.crud.crud_course_grade_stat import course_grade_stat as crud_course_grade_stat
 from app.schemas.grade import Grade, GradeCreate, GradeUpdate
+from app.schemas.course_grade_stat import CourseGradeStat
+from app.services.analytics_service import analytics_service, cohort_cache
+from app.services.recommendation_service import course_recommender
 
 router = APIRouter()
 
@@ -24,6 +28,30 @@ async def read_grades(
         return await crud_grade.get_by_course(db, course_id=course_id)
     return await crud_grade.get_multi(db, skip=skip, limit=limit)
 
+@router.get("/stats", response_model=List[CourseGradeStat])
+async def read_course_grade_stats(
+    course_id: int,
+    term: str = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    Running score statistics for a course, per term and assessment type.
+    """
+    return await crud_course_grade_stat.get_by_course(db, course_id=course_id, term=term)
+
+@router.post("/stats/rebuild")
+async def rebuild_course_grade_stats(
+    course_id: int = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Recompute course grade statistics from the grade table.
+    """
+    rebuilt = await crud_course_grade_stat.rebuild(db, course_id=course_id)
+    return {"rebuilt": rebuilt}
+
 from app.utils.academic import is_barred_from_final
 
 @router.post("/", response_model=Grade)
@@ -58,6 +86,9 @@ async def create_grade(
             )
 
     grade = await crud_grade.create(db, obj_in=grade_in)
+    await analytics_service.refresh_risk_scores(db, [grade.student_id])
+    course_recommender.mark_stale()
+    cohort_cache.invalidate(grade.term)
     return grade
 
 @router.put("/{id}", response_model=Grade)
@@ -73,7 +104,12 @@ async def update_grade(
     grade = await crud_grade.get(db, id=id)
     if not grade:
         raise HTTPException(status_code=404, detail="Grade not found")
+    previous_term = grade.term
     grade = await crud_grade.update(db, db_obj=grade, obj_in=grade_in)
+    await analytics_service.refresh_risk_scores(db, [grade.student_id])
+    course_recommender.mark_stale()
+    cohort_cache.invalidate(previous_term)
+    cohort_cache.invalidate(grade.term)
     return grade
 
 @router.delete("/{id}", response_model=Grade)
@@ -89,4 +125,7 @@ async def delete_grade(
     if not grade:
         raise HTTPException(status_code=404, detail="Grade not found")
     grade = await crud_grade.remove(db, id=id)
+    await analytics_service.refresh_risk_scores(db, [grade.student_id])
+    course_recommender.mark_stale()
+    cohort_cache.invalidate(grade.term)
     return grade
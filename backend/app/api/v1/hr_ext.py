@@ -22,6 +22,7 @@ from app.schemas.hr_ext import (
     PerformanceReview, PerformanceReviewCreate
 )
 from app.services.hr_service import hr_service
+from app.services.payroll_service import payroll_service
 
 router = APIRouter()
 
@@ -30,10 +31,35 @@ router = APIRouter()
 async def generate_payroll(
     month: int,
     year: int,
+    dry_run: bool = False,
     db: AsyncSession = Depends(deps.get_db),
     current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
 ) -> Any:
-    return await hr_service.generate_monthly_payroll(db, month=month, year=year)
+    """
+    Create pending payroll for active employees without one for the period. With
+    dry_run, only report how many rows would be created and their totals.
+    """
+    result = await hr_service.generate_monthly_payroll(db, month=month, year=year, dry_run=dry_run)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+@router.post("/payroll/recalculate")
+async def recalculate_payroll(
+    month: int,
+    year: int,
+    dry_run: bool = False,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Recalculate the period's pending payroll from current salaries, allowances,
+    unpaid leave and attendance. Approved and paid rows are not touched.
+    """
+    result = await payroll_service.recalculate(db, month=month, year=year, dry_run=dry_run)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
 
 @router.get("/payroll", response_model=List[Payroll])
 async def read_payroll(
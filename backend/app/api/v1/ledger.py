@@ -0,0 +1,66 @@
+from typing import Any, List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.api import deps
+from app.models.ledger import JournalEntry as JournalEntryModel
+from app.schemas.ledger import AccountBalance, JournalEntry
+from app.services.ledger_service import ledger_service
+
+router = APIRouter()
+
+@router.get("/accounts", response_model=List[AccountBalance])
+async def read_account_balances(
+    as_of: Optional[datetime] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Trial balance: every account's balance at a point in time (now by default).
+    """
+    return await ledger_service.balances(db, as_of=as_of)
+
+@router.get("/accounts/{code}/balance")
+async def read_account_balance(
+    code: str,
+    as_of: Optional[datetime] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    try:
+        balance = await ledger_service.balance(db, code, as_of=as_of)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return {"code": code, "as_of": as_of or datetime.now(), "balance": balance}
+
+@router.get("/entries", response_model=List[JournalEntry])
+async def read_journal_entries(
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    source_type: Optional[str] = None,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Journal entries, newest first.
+    """
+    stmt = select(JournalEntryModel).options(selectinload(JournalEntryModel.postings))
+    if source_type:
+        stmt = stmt.where(JournalEntryModel.source_type == source_type)
+    result = await db.execute(stmt.order_by(JournalEntryModel.id.desc()).offset(skip).limit(limit))
+    return result.scalars().all()
+
+@router.post("/checkpoints")
+async def create_balance_checkpoints(
+    as_of: Optional[datetime] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Snapshot all account balances, e.g. at month end, so balance queries only scan later postings.
+    """
+    as_of = as_of or datetime.now()
+    count = await ledger_service.create_checkpoints(db, as_of)
+    return {"as_of": as_of, "accounts": count}
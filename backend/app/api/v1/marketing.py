@@ -1,5 +1,5 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.crud.crud_marketing import marketing_campaign as crud_campaign, lead as crud_lead
@@ -8,6 +8,10 @@ from app.schemas.marketing import (
     Lead, LeadCreate, LeadUpdate
 )
 
+from app.services.marketing_service import marketing_service
+from app.services.lead_dedup_service import lead_dedup_service
+from app.services.lead_capture_service import lead_capture_buffer, BufferFull
+
 router = APIRouter()
 
 # Campaigns
@@ -25,7 +29,28 @@ async def create_campaign(
     db: AsyncSession = Depends(deps.get_db),
     campaign_in: MarketingCampaignCreate,
 ) -> Any:
-    return await crud_campaign.create(db, obj_in=campaign_in)
+    return await marketing_service.create_campaign(db, campaign_in)
+
+@router.get("/campaigns/metrics")
+async def read_campaign_metrics(
+    campaign_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """
+    Cost per lead, cost per enrolled student, revenue collected and ROI per campaign.
+    """
+    return await marketing_service.get_campaign_metrics(db, campaign_id=campaign_id)
+
+@router.post("/campaigns/metrics/refresh")
+async def refresh_campaign_metrics(
+    campaign_ids: List[int] = Query(None),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Recompute campaign metrics from leads and invoices, for the given campaigns or all of them.
+    """
+    return {"campaigns": await marketing_service.refresh_metrics(db, campaign_ids)}
 
 # Leads
 @router.get("/leads", response_model=List[Lead])
@@ -42,7 +67,43 @@ async def create_lead(
     db: AsyncSession = Depends(deps.get_db),
     lead_in: LeadCreate,
 ) -> Any:
-    return await crud_lead.create(db, obj_in=lead_in)
+    return await marketing_service.create_lead(db, lead_in)
+
+@router.post("/leads/capture", status_code=202)
+async def capture_lead(
+    *,
+    lead_in: LeadCreate,
+) -> Any:
+    """
+    Accept a lead for buffered insertion and acknowledge it at once. Answers 503
+    with Retry-After while the buffer is full.
+    """
+    try:
+        seq = lead_capture_buffer.submit(lead_in)
+    except BufferFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return {"status": "accepted", "seq": seq}
+
+@router.get("/leads/capture/stats")
+async def read_capture_stats(
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    return lead_capture_buffer.get_stats()
+
+@router.patch("/leads/{id}/status", response_model=Lead)
+async def change_lead_status(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    id: int,
+    status: str,
+) -> Any:
+    """
+    Move a lead to another funnel stage; the transition is timestamped for conversion times.
+    """
+    lead = await marketing_service.change_status(db, id, status)
+    if isinstance(lead, dict):
+        raise HTTPException(status_code=404 if lead["error"] == "Lead not found" else 400, detail=lead["error"])
+    return lead
 
 @router.patch("/leads/{id}/convert", response_model=Lead)
 async def convert_lead(
@@ -50,7 +111,71 @@ async def convert_lead(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
 ) -> Any:
-    db_obj = await crud_lead.get(db, id=id)
-    if not db_obj:
-        raise HTTPException(status_code=404, detail="Lead not found")
-    return await crud_lead.update(db, db_obj=db_obj, obj_in={"status": "converted"})
+    lead = await marketing_service.change_status(db, id, "enrolled")
+    if isinstance(lead, dict):
+        raise HTTPException(status_code=404, detail=lead["error"])
+    return lead
+
+@router.patch("/leads/{id}/student", response_model=Lead)
+async def link_lead_student(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    id: int,
+    student_id: int,
+) -> Any:
+    """
+    Link a lead to the student it became; the lead moves to "enrolled".
+    """
+    lead = await marketing_service.link_student(db, id, student_id)
+    if isinstance(lead, dict):
+        raise HTTPException(status_code=404, detail=lead["error"])
+    return lead
+
+@router.post("/leads/link-students")
+async def link_leads_by_email(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Link unlinked leads to students with the same email.
+    """
+    return await marketing_service.link_students_by_email(db)
+
+@router.post("/leads/dedup")
+async def dedup_leads(
+    dry_run: bool = True,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Find duplicate leads by normalized email, phone and fuzzy name, and merge each
+    cluster into one lead. Defaults to a dry run that only reports the clusters.
+    """
+    return await lead_dedup_service.dedup_leads(db, dry_run=dry_run)
+
+# Funnel
+@router.get("/funnel")
+async def read_funnel(
+    campaign_id: Optional[int] = None,
+    by_campaign: bool = False,
+    period: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    """
+    Lead counts per stage, optionally per campaign and per week or month of lead creation.
+    """
+    funnel = await marketing_service.get_funnel(db, campaign_id=campaign_id, by_campaign=by_campaign, period=period)
+    if "error" in funnel:
+        raise HTTPException(status_code=400, detail=funnel["error"])
+    return funnel
+
+@router.get("/funnel/conversion-times")
+async def read_conversion_times(
+    stage: str = "enrolled",
+    campaign_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    result = await marketing_service.get_conversion_times(db, stage=stage, campaign_id=campaign_id)
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
@@ -0,0 +1,90 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.models.reconciliation import BankStatementImport as BankStatementImportModel
+from app.schemas.reconciliation import BankStatementImport, ReconciliationItem
+from app.services.reconciliation_service import reconciliation_service
+from app.utils.bank_statement import PARSERS, text_lines
+
+router = APIRouter()
+
+@router.post("/imports", response_model=BankStatementImport)
+async def import_bank_statement(
+    format: str = "csv",
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Reconcile a bank statement (format "csv" or "fixed"). Matched credits are
+    recorded as payments; the rest are queued for review.
+    """
+    if format not in PARSERS:
+        raise HTTPException(status_code=400, detail=f"Unknown statement format. Use one of: {', '.join(PARSERS)}")
+    return await reconciliation_service.import_statement(
+        db, text_lines(file.file), format=format, filename=file.filename, imported_by=current_user.id
+    )
+
+@router.get("/imports", response_model=List[BankStatementImport])
+async def read_imports(
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    result = await db.execute(
+        select(BankStatementImportModel).order_by(BankStatementImportModel.id.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+@router.get("/imports/{id}", response_model=BankStatementImport)
+async def read_import(
+    id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    statement = await db.get(BankStatementImportModel, id)
+    if not statement:
+        raise HTTPException(status_code=404, detail="Statement import not found")
+    return statement
+
+@router.get("/items", response_model=List[ReconciliationItem])
+async def read_review_queue(
+    status: str = "unmatched",
+    import_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Statement lines by status; the default lists the unmatched lines awaiting review.
+    """
+    return await reconciliation_service.get_review_queue(
+        db, status=status, import_id=import_id, skip=skip, limit=limit
+    )
+
+@router.post("/items/{id}/resolve")
+async def resolve_item(
+    id: int,
+    invoice_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Record an unmatched line as a payment against the given invoice.
+    """
+    result = await reconciliation_service.resolve_item(db, id, invoice_id)
+    return result if isinstance(result, dict) else ReconciliationItem.model_validate(result)
+
+@router.post("/items/{id}/ignore")
+async def ignore_item(
+    id: int,
+    reason: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    result = await reconciliation_service.ignore_item(db, id, reason)
+    return result if isinstance(result, dict) else ReconciliationItem.model_validate(result)
@@ -1,12 +1,25 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.crud.crud_scholarship import scholarship as crud_scholarship
-from app.schemas.scholarship import Scholarship, ScholarshipCreate, ScholarshipUpdate
+from app.schemas.scholarship import Scholarship, ScholarshipCreate, ScholarshipUpdate, ScholarshipAllocation
+from app.services.scholarship_service import scholarship_service
 
 router = APIRouter()
 
+@router.post("/apply")
+async def apply_scholarships(
+    program_ids: List[int] = Query(None),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Credit unallocated scholarship amounts against open invoices, for the given programs
+    or all of them. Safe to rerun: only amounts not yet allocated are applied.
+    """
+    return await scholarship_service.apply_scholarships(db, program_ids)
+
 @router.get("/", response_model=List[Scholarship])
 async def read_scholarships(
     db: AsyncSession = Depends(deps.get_db),
@@ -33,7 +46,10 @@ async def update_scholarship(
     db_obj = await crud_scholarship.get(db, id=id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Scholarship not found")
-    return await crud_scholarship.update(db, db_obj=db_obj, obj_in=scholarship_in)
+    scholarship = await scholarship_service.update_scholarship(db, db_obj, scholarship_in)
+    if isinstance(scholarship, dict):
+        raise HTTPException(status_code=400, detail=scholarship["error"])
+    return scholarship
 
 @router.get("/{id}", response_model=Scholarship)
 async def read_scholarship(
@@ -46,6 +62,14 @@ async def read_scholarship(
         raise HTTPException(status_code=404, detail="Scholarship not found")
     return db_obj
 
+@router.get("/{id}/allocations", response_model=List[ScholarshipAllocation])
+async def read_scholarship_allocations(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    id: int,
+) -> Any:
+    return await scholarship_service.get_allocations(db, id)
+
 @router.delete("/{id}", response_model=Scholarship)
 async def delete_scholarship(
     *,
@@ -55,4 +79,7 @@ async def delete_scholarship(
     db_obj = await crud_scholarship.get(db, id=id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Scholarship not found")
-    return await crud_scholarship.remove(db, id=id)
+    scholarship = await scholarship_service.delete_scholarship(db, db_obj)
+    if isinstance(scholarship, dict):
+        raise HTTPException(status_code=400, detail=scholarship["error"])
+    return scholarship
@@ -0,0 +1,83 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.schemas.student_attendance import (
+    ClassSession, ClassSessionCreate,
+    RollCall, RollCallEntry, RollCallResult,
+    AttendanceSummary
+)
+from app.services.attendance_service import student_attendance_service
+from app.services.analytics_service import analytics_service
+
+router = APIRouter()
+
+async def _record_roll_calls(db: AsyncSession, roll_calls: List[RollCall]) -> Any:
+    result = await student_attendance_service.submit_roll_calls(db, roll_calls)
+    if "error" in result:
+        raise HTTPException(status_code=404 if "not found" in result["error"] else 400, detail=result["error"])
+    # Attendance feeds the engagement factor of the risk score
+    await analytics_service.refresh_risk_scores(db, result["student_ids"])
+    return result
+
+@router.post("/sessions", response_model=ClassSession)
+async def create_class_session(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    session_in: ClassSessionCreate,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    Open the next roll-call session for a course.
+    """
+    session = await student_attendance_service.create_session(db, session_in)
+    if isinstance(session, dict):
+        raise HTTPException(status_code=404, detail=session["error"])
+    return session
+
+@router.post("/sessions/{session_id}/roll-call", response_model=RollCallResult)
+async def submit_roll_call(
+    session_id: int,
+    entries: List[RollCallEntry],
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    Record the roll call of a single session.
+    """
+    return await _record_roll_calls(db, [RollCall(session_id=session_id, entries=entries)])
+
+@router.post("/roll-calls", response_model=RollCallResult)
+async def submit_roll_calls(
+    roll_calls: List[RollCall],
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    Record roll calls for many sessions in one transaction.
+    """
+    return await _record_roll_calls(db, roll_calls)
+
+@router.get("/students/{student_id}", response_model=List[AttendanceSummary])
+async def read_student_attendance(
+    student_id: int,
+    term: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor", "Staff"]))
+) -> Any:
+    """
+    Attendance percentages of a student per course.
+    """
+    return await student_attendance_service.summaries(db, student_id=student_id, term=term)
+
+@router.get("/courses/{course_id}", response_model=List[AttendanceSummary])
+async def read_course_attendance(
+    course_id: int,
+    term: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Instructor"]))
+) -> Any:
+    """
+    Attendance percentages of every student in a course.
+    """
+    return await student_attendance_service.summaries(db, course_id=course_id, term=term)
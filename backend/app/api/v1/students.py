@@ -9,6 +9,8 @@ from app.utils.academic import calculate_cgpa, calculate_course_total, get_class
 from app.crud.crud_tuition_invoice import tuition_invoice as crud_invoice
 from sqlalchemy import select
 from app.models.tuition_invoice import TuitionInvoice
+from app.services.academic_service import academic_service
+from app.services.analytics_service import analytics_service
 
 router = APIRouter()
 
@@ -23,12 +25,20 @@ async def read_students(
     Retrieve students with CGPA, Classification, and Fee Status enforcement.
     """
     students = await crud_student.get_multi(db, skip=skip, limit=limit)
-    courses = await crud_course.get_multi(db)
+    # Term-end standing snapshots; only students without one are recomputed
+    standings = await academic_service.get_latest_standings(db, [s.id for s in students])
+    courses = None
     
     enriched_students = []
     for s in students:
         student_data = Student.model_validate(s)
-        student_data.cumulative_gpa = calculate_cgpa(s.grades, courses)
+        standing = standings.get(s.id)
+        if standing:
+            student_data.cumulative_gpa = standing.cgpa
+        else:
+            if courses is None:
+                courses = await crud_course.get_multi(db)
+            student_data.cumulative_gpa = calculate_cgpa(s.grades, courses)
         
         # Rule 1.1: Fee Clearance Verification
         # Fetch invoices for this student
@@ -41,7 +51,8 @@ async def read_students(
             student_data.status = "overdue_payment" # Regional rule specific status
             
         # Rule 4.2: Max Stay Check (7 Years)
-        if not check_max_stay(s.enrollment_date):
+        within_max_stay = standing.within_max_stay if standing else check_max_stay(s.enrollment_date)
+        if not within_max_stay:
             student_data.status = "max_stay_exceeded"
             
         enriched_students.append(student_data)
@@ -61,10 +72,14 @@ async def read_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    # Enrich with CGPA
-    courses = await crud_course.get_multi(db)
+    # Enrich with CGPA, from the standing snapshot when one exists
+    standing = await academic_service.get_latest_standing(db, student.id)
     student_data = Student.model_validate(student)
-    student_data.cumulative_gpa = calculate_cgpa(student.grades, courses)
+    if standing:
+        student_data.cumulative_gpa = standing.cgpa
+    else:
+        courses = await crud_course.get_multi(db)
+        student_data.cumulative_gpa = calculate_cgpa(student.grades, courses)
     
     # Rule 1.1 & 4.2 enforcement for individual fetch
     stmt = select(TuitionInvoice).where(TuitionInvoice.student_id == student.id)
@@ -74,7 +89,8 @@ async def read_student(
     if invoices and not all(is_fee_cleared(inv) for inv in invoices):
         student_data.status = "overdue_payment"
         
-    if not check_max_stay(student.enrollment_date):
+    within_max_stay = standing.within_max_stay if standing else check_max_stay(student.enrollment_date)
+    if not within_max_stay:
         student_data.status = "max_stay_exceeded"
 
     return student_data
@@ -104,6 +120,8 @@ async def create_student(
     # Update student with matricule
     student.matricule = matricule
     db.add(student)
+    # Give the new student a risk score row so the at-risk list includes them
+    await analytics_service.refresh_risk_scores(db, [student.id], commit=False)
     await db.commit()
     await db.refresh(student)
     
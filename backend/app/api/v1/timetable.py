@@ -0,0 +1,76 @@
+from typing import Any, List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.db.session import AsyncSessionLocal
+from app.models.batch_job import BatchJob as BatchJobModel
+from app.schemas.batch_job import BatchJob
+from app.schemas.timetable import TimetableClash, TimetableEntry, TimetableGenerate
+from app.services.timetable_service import timetable_service
+
+router = APIRouter()
+
+async def _run_timetable_job(job_id: int) -> None:
+    # Background tasks outlive the request session, so open a dedicated one
+    async with AsyncSessionLocal() as db:
+        job = await db.get(BatchJobModel, job_id)
+        if job:
+            await timetable_service.run_timetable(db, job)
+
+@router.post("/generate", response_model=BatchJob)
+async def generate_timetable(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    request_in: TimetableGenerate,
+    background_tasks: BackgroundTasks,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator"]))
+) -> Any:
+    """
+    Start a timetable generation job for a term. Replaces the term's current timetable when done.
+    A job still running for the term is returned as is.
+    """
+    if not request_in.days or request_in.periods_per_day < 1:
+        raise HTTPException(status_code=400, detail="At least one day and one period are required")
+    job = await timetable_service.get_timetable_job(db, request_in.term)
+    if await timetable_service.claim_timetable_job(db, job, request_in):
+        background_tasks.add_task(_run_timetable_job, job.id)
+    return job
+
+@router.get("/jobs/{job_id}", response_model=BatchJob)
+async def read_timetable_job(
+    job_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Progress of a timetable job: solver phase, sections placed and remaining clashes.
+    """
+    job = await db.get(BatchJobModel, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/", response_model=List[TimetableEntry])
+async def read_timetable(
+    term: str,
+    course_id: int = None,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Weekly timetable for a term, optionally for one course.
+    """
+    return await timetable_service.get_timetable(db, term, course_id=course_id)
+
+@router.get("/clashes", response_model=List[TimetableClash])
+async def check_timetable_clashes(
+    student_id: int,
+    course_id: int,
+    term: str,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Check whether adding a course would clash with the student's current timetable.
+    """
+    return await timetable_service.get_clashes(db, student_id=student_id, course_id=course_id, term=term)
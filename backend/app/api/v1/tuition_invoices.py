@@ -1,20 +1,44 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.crud.crud_tuition_invoice import tuition_invoice as crud_tuition_invoice
 from app.schemas.tuition_invoice import TuitionInvoice, TuitionInvoiceCreate, TuitionInvoiceUpdate
+from app.schemas.payment import Payment, PaymentBatch
 
 from app.services.finance_service import finance_service
 
 router = APIRouter()
 
+@router.post("/generate-bulk")
+async def bulk_invoice_programs(
+    billing_period: str,
+    program_ids: List[int] = Query(None),
+    dry_run: bool = False,
+    apply_scholarships: bool = True,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Bill a period for several programs, or every program with a fee structure when
+    none are given. Use dry_run to preview how many invoices would be created.
+    """
+    return await finance_service.generate_invoices(
+        db, billing_period=billing_period, program_ids=program_ids, dry_run=dry_run,
+        apply_scholarships=apply_scholarships
+    )
+
 @router.post("/generate-bulk/{program_id}")
 async def bulk_invoice(
     program_id: int,
+    billing_period: str,
+    dry_run: bool = False,
     db: AsyncSession = Depends(deps.get_db),
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
 ) -> Any:
-    return await finance_service.generate_invoices_for_program(db, program_id=program_id)
+    return await finance_service.generate_invoices_for_program(
+        db, program_id=program_id, billing_period=billing_period, dry_run=dry_run
+    )
 
 @router.get("/", response_model=List[TuitionInvoice])
 async def read_tuition_invoices(
@@ -31,7 +55,7 @@ async def create_tuition_invoice(
     invoice_in: TuitionInvoiceCreate,
     current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
 ) -> Any:
-    return await crud_tuition_invoice.create(db, obj_in=invoice_in)
+    return await finance_service.create_invoice(db, invoice_in)
 
 @router.put("/{id}", response_model=TuitionInvoice)
 async def update_tuition_invoice(
@@ -44,7 +68,10 @@ async def update_tuition_invoice(
     db_obj = await crud_tuition_invoice.get(db, id=id)
     if not db_obj:
         raise HTTPException(status_code=404, detail="Invoice not found")
-    return await crud_tuition_invoice.update(db, db_obj=db_obj, obj_in=invoice_in)
+    invoice = await finance_service.update_invoice(db, db_obj, invoice_in)
+    if isinstance(invoice, dict):
+        raise HTTPException(status_code=400, detail=invoice["error"])
+    return invoice
 
 @router.get("/{id}", response_model=TuitionInvoice)
 async def read_tuition_invoice(
@@ -57,11 +84,31 @@ async def read_tuition_invoice(
         raise HTTPException(status_code=404, detail="Invoice not found")
     return db_obj
 
+@router.post("/payments/batch")
+async def pay_invoices_batch(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    batch: PaymentBatch,
+    current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
+) -> Any:
+    """
+    Apply many payments in one request. Payments carrying an idempotency key that
+    was already used are returned as recorded rather than applied twice.
+    """
+    result = await finance_service.record_payments(db, batch.payments)
+    return {**result, "payments": [Payment.model_validate(p) if p is not None else None for p in result["payments"]]}
+
 @router.post("/{id}/pay")
 async def pay_invoice(
     id: int,
     amount: float,
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(deps.get_db),
     current_user: Any = Depends(deps.RoleChecker(["Super Admin", "Administrator", "Staff"]))
 ) -> Any:
-    return await finance_service.record_payment(db, invoice_id=id, amount=amount)
+    """
+    Record a payment. Send an Idempotency-Key header to make retries safe: a repeated
+    key returns the original payment.
+    """
+    result = await finance_service.record_payment(db, invoice_id=id, amount=amount, idempotency_key=idempotency_key)
+    return result if isinstance(result, dict) else Payment.model_validate(result)
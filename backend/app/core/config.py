@@ -1,4 +1,4 @@
-from typing import List, Union, Any, Optional
+from typing import List, Union, Any, Optional, Tuple
 from pydantic import AnyHttpUrl, PostgresDsn, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -56,4 +56,23 @@ class Settings(BaseSettings):
                 )
         return data
 
+    # Lead capture buffer: queued leads are written in batches of LEAD_BUFFER_BATCH
+    # or every LEAD_BUFFER_FLUSH_SECONDS, and logged to LEAD_BUFFER_WAL until committed
+    LEAD_BUFFER_SIZE: int = 20000
+    LEAD_BUFFER_BATCH: int = 1000
+    LEAD_BUFFER_FLUSH_SECONDS: float = 0.5
+    LEAD_BUFFER_WAL: str = "data/lead_capture.wal"
+
+    # Payroll: monthly progressive tax brackets as [upper bound, rate], the last
+    # bound null; approved leave of an unpaid type and late check-ins (as a
+    # fraction of a day's pay each) are deducted
+    PAYROLL_TAX_BRACKETS: List[Tuple[Optional[float], float]] = [(1000.0, 0.0), (4000.0, 0.10), (10000.0, 0.20), (None, 0.30)]
+    PAYROLL_UNPAID_LEAVE_TYPES: List[str] = ["Unpaid"]
+    PAYROLL_LATE_DEDUCTION_DAYS: float = 0.1
+
+    # Enrollment: refuse a registration whose course clashes with the student's
+    # timetable for the term. Off by default; clashes are checkable without
+    # blocking through GET /timetable/clashes
+    ENROLLMENT_BLOCK_TIMETABLE_CLASHES: bool = False
+
 settings = Settings()
@@ -0,0 +1,55 @@
+from typing import Any, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.batch_job import BatchJob
+
+class CRUDBatchJob:
+    """
+    Claiming for BatchJob workers. A worker claims a job with one conditional
+    UPDATE and then commits at least every HEARTBEAT_TIMEOUT; each commit sets
+    updated_at, the heartbeat. A running job silent longer than that is presumed
+    dead and can be claimed again.
+    """
+    HEARTBEAT_TIMEOUT = timedelta(minutes=5)
+
+    def claimable(self):
+        """Jobs a worker may take: pending, failed, or running without a recent heartbeat."""
+        stale = datetime.now() - self.HEARTBEAT_TIMEOUT
+        return or_(
+            BatchJob.status.in_(["pending", "failed"]),
+            and_(BatchJob.status == "running", or_(BatchJob.updated_at.is_(None), BatchJob.updated_at < stale))
+        )
+
+    async def get_unfinished(self, db: AsyncSession, *, name: str, scope: str) -> Optional[BatchJob]:
+        """Latest pending, running or failed job of a kind and scope."""
+        result = await db.execute(
+            select(BatchJob)
+            .where(BatchJob.name == name, BatchJob.scope == scope, BatchJob.status.in_(["pending", "running", "failed"]))
+            .order_by(BatchJob.id.desc())
+        )
+        return result.scalars().first()
+
+    async def is_claimable(self, db: AsyncSession, job_id: int) -> bool:
+        result = await db.execute(select(BatchJob.id).where(BatchJob.id == job_id, self.claimable()))
+        return result.first() is not None
+
+    async def claim(self, db: AsyncSession, job: BatchJob, **values: Any) -> bool:
+        """
+        Mark the job running for this worker, setting any extra column `values` in
+        the same conditional UPDATE. False when another worker holds it (running
+        with a recent heartbeat), so two workers never run the same job. Commits.
+        """
+        result = await db.execute(
+            update(BatchJob)
+            .where(BatchJob.id == job.id, self.claimable())
+            .values(status="running", error=None, updated_at=datetime.now(), **values)
+            .returning(BatchJob.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.first() is not None
+        await db.commit()
+        await db.refresh(job)
+        return claimed
+
+batch_job = CRUDBatchJob()
@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func, cast, Integer
+from app.models.course_grade_stat import CourseGradeStat
+from app.models.grade import Grade
+from app.utils.stats import HISTOGRAM_WIDTH, empty_histogram, histogram_bin, welford_add, welford_remove
+
+class CRUDCourseGradeStat:
+    """
+    Running per-(course, term, assessment type) aggregates. apply_add/apply_remove
+    only flush, so they join the caller's grade transaction.
+    """
+    async def get_by_course(self, db: AsyncSession, *, course_id: int, term: Optional[str] = None) -> List[CourseGradeStat]:
+        stmt = select(CourseGradeStat).where(CourseGradeStat.course_id == course_id)
+        if term is not None:
+            stmt = stmt.where(CourseGradeStat.term == term)
+        result = await db.execute(stmt.order_by(CourseGradeStat.term, CourseGradeStat.assessment_type))
+        return result.scalars().all()
+
+    async def _get_for_update(self, db: AsyncSession, course_id: int, term: Optional[str], assessment_type: str) -> Optional[CourseGradeStat]:
+        result = await db.execute(
+            select(CourseGradeStat)
+            .where(
+                CourseGradeStat.course_id == course_id,
+                CourseGradeStat.term.is_not_distinct_from(term),
+                CourseGradeStat.assessment_type == assessment_type
+            )
+            .with_for_update()
+        )
+        return result.scalars().first()
+
+    async def apply_add(self, db: AsyncSession, grade: Grade) -> None:
+        stat = await self._get_for_update(db, grade.course_id, grade.term, grade.assessment_type)
+        if stat is None:
+            stat = CourseGradeStat(
+                course_id=grade.course_id,
+                term=grade.term,
+                assessment_type=grade.assessment_type,
+                count=0, mean=0.0, m2=0.0,
+                histogram=empty_histogram()
+            )
+            db.add(stat)
+        stat.count, stat.mean, stat.m2 = welford_add(stat.count, stat.mean, stat.m2, grade.score)
+        stat.min_score = grade.score if stat.min_score is None else min(stat.min_score, grade.score)
+        stat.max_score = grade.score if stat.max_score is None else max(stat.max_score, grade.score)
+        histogram = list(stat.histogram or empty_histogram())
+        histogram[histogram_bin(grade.score)] += 1
+        stat.histogram = histogram
+        await db.flush()
+
+    async def apply_remove(self, db: AsyncSession, *, course_id: int, term: Optional[str], assessment_type: str, score: float) -> None:
+        """
+        Take a grade's old values back out. Must run after the grade row itself has been
+        changed or deleted and flushed, since min/max are re-read from the remaining grades.
+        """
+        stat = await self._get_for_update(db, course_id, term, assessment_type)
+        if stat is None:
+            return
+        if stat.count <= 1:
+            await db.delete(stat)
+            await db.flush()
+            return
+        stat.count, stat.mean, stat.m2 = welford_remove(stat.count, stat.mean, stat.m2, score)
+        histogram = list(stat.histogram or empty_histogram())
+        i = histogram_bin(score)
+        histogram[i] = max(histogram[i] - 1, 0)
+        stat.histogram = histogram
+        if score <= stat.min_score or score >= stat.max_score:
+            result = await db.execute(
+                select(func.min(Grade.score), func.max(Grade.score)).where(
+                    Grade.course_id == course_id,
+                    Grade.term.is_not_distinct_from(term),
+                    Grade.assessment_type == assessment_type
+                )
+            )
+            stat.min_score, stat.max_score = result.one()
+        await db.flush()
+
+    async def rebuild(self, db: AsyncSession, *, course_id: Optional[int] = None) -> int:
+        """Recompute the aggregates from the grade table with grouped queries."""
+        keys = (Grade.course_id, Grade.term, Grade.assessment_type)
+        filters = [Grade.course_id == course_id] if course_id is not None else []
+
+        result = await db.execute(
+            select(
+                *keys,
+                func.count(Grade.id),
+                func.sum(Grade.score),
+                func.sum(Grade.score * Grade.score),
+                func.min(Grade.score),
+                func.max(Grade.score)
+            ).where(*filters).group_by(*keys)
+        )
+        rows: Dict[Any, Dict[str, Any]] = {}
+        for cid, term, atype, count, total, sq_total, low, high in result.all():
+            mean = total / count
+            rows[(cid, term, atype)] = {
+                "course_id": cid,
+                "term": term,
+                "assessment_type": atype,
+                "count": count,
+                "mean": mean,
+                "m2": max(sq_total - total * mean, 0.0),
+                "min_score": low,
+                "max_score": high,
+                "histogram": empty_histogram(),
+            }
+
+        # Floor before the cast: Postgres rounds when casting to integer, histogram_bin floors
+        bucket = cast(func.floor(Grade.score / HISTOGRAM_WIDTH), Integer)
+        result = await db.execute(
+            select(*keys, bucket, func.count(Grade.id)).where(*filters).group_by(*keys, bucket)
+        )
+        for cid, term, atype, b, count in result.all():
+            rows[(cid, term, atype)]["histogram"][histogram_bin(b * HISTOGRAM_WIDTH)] += count
+
+        stmt = delete(CourseGradeStat)
+        if course_id is not None:
+            stmt = stmt.where(CourseGradeStat.course_id == course_id)
+        await db.execute(stmt)
+        if rows:
+            await db.execute(insert(CourseGradeStat), list(rows.values()))
+        await db.commit()
+        return len(rows)
+
+course_grade_stat = CRUDCourseGradeStat()
@@ -1,15 +1,67 @@
+from typing import Any, Dict, List
+from datetime import datetime
+from itertools import groupby
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.base import CRUDBase
 from app.models.finance_ext import TuitionInstallment, Vendor
 from app.schemas.finance_ext import (
     TuitionInstallmentCreate, TuitionInstallmentUpdate,
     VendorCreate, VendorUpdate
 )
+from app.utils.installments import allocate
 
 class CRUDVendor(CRUDBase[Vendor, VendorCreate, VendorUpdate]):
     pass
 
 class CRUDInstallment(CRUDBase[TuitionInstallment, TuitionInstallmentCreate, TuitionInstallmentUpdate]):
-    pass
+    CHUNK = 1000
+
+    async def allocate(self, db: AsyncSession, totals: Dict[int, float]) -> int:
+        """
+        Spread an amount per invoice (a payment or scholarship credit) over its unpaid
+        installments, earliest due date first. Runs in the caller's transaction, after
+        the invoice row was updated and locked, so concurrent settlements of one
+        invoice allocate one after the other.
+        """
+        now = datetime.now()
+        changes: List[Dict[str, Any]] = []
+        invoice_ids = list(totals)
+        for start in range(0, len(invoice_ids), self.CHUNK):
+            result = await db.execute(
+                select(
+                    TuitionInstallment.invoice_id,
+                    TuitionInstallment.id,
+                    TuitionInstallment.amount,
+                    TuitionInstallment.amount_paid,
+                    TuitionInstallment.status
+                )
+                .where(
+                    TuitionInstallment.invoice_id.in_(invoice_ids[start:start + self.CHUNK]),
+                    TuitionInstallment.status != "paid"
+                )
+                .order_by(
+                    TuitionInstallment.invoice_id,
+                    TuitionInstallment.due_date.is_(None),
+                    TuitionInstallment.due_date,
+                    TuitionInstallment.id
+                )
+            )
+            for invoice_id, rows in groupby(result.all(), key=lambda r: r.invoice_id):
+                rows = list(rows)
+                statuses = {r.id: r.status for r in rows}
+                for installment_id, amount_paid, full in allocate(
+                    totals[invoice_id], [(r.id, r.amount, r.amount_paid or 0.0) for r in rows]
+                ):
+                    changes.append({
+                        "id": installment_id,
+                        "amount_paid": amount_paid,
+                        "status": "paid" if full else statuses[installment_id],
+                        "paid_at": now if full else None,
+                    })
+        if changes:
+            await db.execute(update(TuitionInstallment), changes)
+        return len(changes)
 
 vendor = CRUDVendor(Vendor)
 installment = CRUDInstallment(TuitionInstallment)
@@ -1,11 +1,79 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, case, and_
 from app.crud.base import CRUDBase
+from app.crud.crud_course_grade_stat import course_grade_stat
 from app.models.grade import Grade
+from app.models.course import Course
+from app.models.student import Student
 from app.schemas.grade import GradeCreate, GradeUpdate
 
+STAT_FIELDS = ("course_id", "term", "assessment_type", "score")
+
+def _first_final(resit: bool, order_by: Any) -> Any:
+    """The first Final per (student, course, term) by `order_by`, taken among resits or among the rest."""
+    ranked = (
+        select(
+            Grade.student_id,
+            Grade.course_id,
+            Grade.term,
+            Grade.score,
+            func.row_number().over(
+                partition_by=(Grade.student_id, Grade.course_id, Grade.term),
+                order_by=order_by
+            ).label("rn")
+        )
+        .where(Grade.assessment_type == "Final", Grade.is_resit.is_(True) if resit else Grade.is_resit.isnot(True))
+        .subquery()
+    )
+    return (
+        select(ranked.c.student_id, ranked.c.course_id, ranked.c.term, ranked.c.score)
+        .where(ranked.c.rn == 1)
+        .subquery()
+    )
+
 class CRUDGrade(CRUDBase[Grade, GradeCreate, GradeUpdate]):
+    """Grade writes keep CourseGradeStat in step within the same transaction."""
+    async def create(self, db: AsyncSession, *, obj_in: GradeCreate) -> Grade:
+        db_obj = Grade(**obj_in.model_dump(exclude_none=True))
+        db.add(db_obj)
+        await db.flush()
+        await course_grade_stat.apply_add(db, db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Grade,
+        obj_in: Union[GradeUpdate, Dict[str, Any]]
+    ) -> Grade:
+        previous = {field: getattr(db_obj, field) for field in STAT_FIELDS}
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        for field in db_obj.__table__.columns.keys():
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.flush()
+        if any(getattr(db_obj, field) != previous[field] for field in STAT_FIELDS):
+            await course_grade_stat.apply_remove(db, **previous)
+            await course_grade_stat.apply_add(db, db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Grade:
+        obj = await self.get(db, id)
+        await db.delete(obj)
+        await db.flush()
+        await course_grade_stat.apply_remove(
+            db, course_id=obj.course_id, term=obj.term, assessment_type=obj.assessment_type, score=obj.score
+        )
+        await db.commit()
+        return obj
+
     async def get_by_student(self, db: AsyncSession, *, student_id: int) -> List[Grade]:
         result = await db.execute(select(Grade).filter(Grade.student_id == student_id))
         return result.scalars().all()
@@ -14,4 +82,58 @@ class CRUDGrade(CRUDBase[Grade, GradeCreate, GradeUpdate]):
         result = await db.execute(select(Grade).filter(Grade.course_id == course_id))
         return result.scalars().all()
 
+    async def get_course_totals(
+        self,
+        db: AsyncSession,
+        *,
+        program_id: Optional[int] = None,
+        course_id: Optional[int] = None,
+        term: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Weighted course totals per (student, course, term) computed in SQL with the
+        same 30/70 and resit rules as calculate_course_total. Rows carry
+        student_id, program_id, course_id, term, credits, total and has_resit.
+        """
+        # Most recent non-resit Final, and the first resit, which replaces it
+        latest_final = _first_final(False, Grade.id.desc())
+        first_resit = _first_final(True, Grade.id)
+
+        ca_avg = func.avg(case((Grade.assessment_type == "CA", Grade.score)))
+        resit_score = func.max(first_resit.c.score)
+        final_score = func.coalesce(resit_score, func.max(latest_final.c.score), 0.0)
+
+        stmt = (
+            select(
+                Grade.student_id,
+                Student.program_id,
+                Grade.course_id,
+                Grade.term,
+                Course.credits,
+                (func.coalesce(ca_avg, 0.0) * 0.3 + final_score * 0.7).label("total"),
+                (resit_score.isnot(None)).label("has_resit"),
+            )
+            .join(Student, Student.id == Grade.student_id)
+            .join(Course, Course.id == Grade.course_id)
+            .outerjoin(latest_final, and_(
+                latest_final.c.student_id == Grade.student_id,
+                latest_final.c.course_id == Grade.course_id,
+                latest_final.c.term.is_not_distinct_from(Grade.term)
+            ))
+            .outerjoin(first_resit, and_(
+                first_resit.c.student_id == Grade.student_id,
+                first_resit.c.course_id == Grade.course_id,
+                first_resit.c.term.is_not_distinct_from(Grade.term)
+            ))
+            .group_by(Grade.student_id, Student.program_id, Grade.course_id, Grade.term, Course.credits)
+        )
+        if program_id is not None:
+            stmt = stmt.where(Student.program_id == program_id)
+        if course_id is not None:
+            stmt = stmt.where(Grade.course_id == course_id)
+        if term is not None:
+            stmt = stmt.where(Grade.term == term)
+        result = await db.execute(stmt)
+        return result.all()
+
 grade = CRUDGrade(Grade)
@@ -1,8 +1,161 @@
+from typing import Any, Dict, List, Optional, Union
+from datetime import date, datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func, literal
 from app.crud.base import CRUDBase
+from app.db.upsert import upsert_increment
 from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionDailyRollup
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
 
+UNCATEGORIZED = "uncategorized"
+
+def _rollup_key(obj: Transaction) -> Dict[str, Any]:
+    return {"day": obj.date.date(), "category": obj.category or UNCATEGORIZED, "type": obj.type}
+
 class CRUDTransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate]):
-    pass
+    """Transaction writes keep TransactionDailyRollup in step within the same transaction."""
+    async def _apply_rollup(self, db: AsyncSession, obj: Transaction, sign: int) -> None:
+        await upsert_increment(
+            db,
+            TransactionDailyRollup,
+            [{**_rollup_key(obj), "total": sign * obj.amount, "count": sign}],
+            index_elements=["day", "category", "type"],
+            increment=["total", "count"]
+        )
+
+    async def create(self, db: AsyncSession, *, obj_in: TransactionCreate) -> Transaction:
+        db_obj = Transaction(**obj_in.model_dump(exclude_none=True))
+        # Stamp the date here rather than relying on the server default, the rollup needs the day
+        if db_obj.date is None:
+            db_obj.date = datetime.now()
+        db.add(db_obj)
+        await db.flush()
+        await self._apply_rollup(db, db_obj, 1)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def create_many(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """
+        Bulk insert transactions and their rollup increments, one statement each.
+        Does not commit, so the rows land with the caller's business write.
+        """
+        if not rows:
+            return
+        now = datetime.now()
+        rows = [{**row, "date": row.get("date") or now} for row in rows]
+        await db.execute(insert(Transaction), rows)
+        increments: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            key = (row["date"].date(), row.get("category") or UNCATEGORIZED, row["type"])
+            entry = increments.setdefault(key, {"day": key[0], "category": key[1], "type": key[2], "total": 0.0, "count": 0})
+            entry["total"] += row["amount"]
+            entry["count"] += 1
+        await upsert_increment(
+            db,
+            TransactionDailyRollup,
+            list(increments.values()),
+            index_elements=["day", "category", "type"],
+            increment=["total", "count"]
+        )
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Transaction,
+        obj_in: Union[TransactionUpdate, Dict[str, Any]]
+    ) -> Transaction:
+        await self._apply_rollup(db, db_obj, -1)
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        for field in db_obj.__table__.columns.keys():
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.flush()
+        await self._apply_rollup(db, db_obj, 1)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Transaction:
+        obj = await self.get(db, id)
+        await self._apply_rollup(db, obj, -1)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    async def get_stats(
+        self,
+        db: AsyncSession,
+        *,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Income/expense totals per category from the daily rollup, end_date inclusive."""
+        stmt = select(
+            TransactionDailyRollup.category,
+            TransactionDailyRollup.type,
+            func.sum(TransactionDailyRollup.total),
+            func.sum(TransactionDailyRollup.count)
+        ).group_by(TransactionDailyRollup.category, TransactionDailyRollup.type)
+        if start_date is not None:
+            stmt = stmt.where(TransactionDailyRollup.day >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(TransactionDailyRollup.day <= end_date)
+        if category is not None:
+            stmt = stmt.where(TransactionDailyRollup.category == category)
+
+        by_category: Dict[str, Dict[str, float]] = {}
+        income = expenses = 0.0
+        count = 0
+        for cat, type_, total, n in (await db.execute(stmt)).all():
+            entry = by_category.setdefault(cat, {"income": 0.0, "expense": 0.0})
+            entry[type_] = entry.get(type_, 0.0) + (total or 0.0)
+            if type_ == "income":
+                income += total or 0.0
+            elif type_ == "expense":
+                expenses += total or 0.0
+            count += n or 0
+        return {
+            "total_income": income,
+            "total_expenses": expenses,
+            "net_profit": income - expenses,
+            "transaction_count": count,
+            "by_category": by_category
+        }
+
+    async def get_daily(
+        self,
+        db: AsyncSession,
+        *,
+        start_date: date,
+        end_date: date,
+        category: Optional[str] = None
+    ) -> List[TransactionDailyRollup]:
+        stmt = select(TransactionDailyRollup).where(
+            TransactionDailyRollup.day >= start_date,
+            TransactionDailyRollup.day <= end_date
+        )
+        if category is not None:
+            stmt = stmt.where(TransactionDailyRollup.category == category)
+        result = await db.execute(stmt.order_by(TransactionDailyRollup.day, TransactionDailyRollup.category))
+        return result.scalars().all()
+
+    async def rebuild_rollup(self, db: AsyncSession) -> int:
+        """Recompute the daily rollup from the transaction table in one grouped INSERT ... SELECT."""
+        day = func.date(Transaction.date)
+        category = func.coalesce(Transaction.category, literal(UNCATEGORIZED))
+        await db.execute(delete(TransactionDailyRollup))
+        result = await db.execute(insert(TransactionDailyRollup).from_select(
+            ["day", "category", "type", "total", "count"],
+            select(day, category, Transaction.type, func.sum(Transaction.amount), func.count(Transaction.id))
+            .where(Transaction.date.isnot(None))
+            .group_by(day, category, Transaction.type)
+        ))
+        await db.commit()
+        return result.rowcount
 
 transaction = CRUDTransaction(Transaction)
@@ -10,9 +10,9 @@ from app.models.transaction import Transaction
 from app.models.employee import Employee
 from app.models.fee_structure import FeeStructure
 from app.models.tuition_invoice import TuitionInvoice
-from app.models.scholarship import Scholarship
+from app.models.scholarship import Scholarship, ScholarshipAllocation
 from app.models.expense import ExpenseApproval
-from app.models.marketing import MarketingCampaign, Lead
+from app.models.marketing import MarketingCampaign, Lead, LeadStageEvent, CampaignMetrics
 from app.models.finance_ext import TuitionInstallment, Vendor
 from app.models.payroll import Payroll
 from app.models.leave import LeaveRequest
@@ -21,3 +21,16 @@ from app.models.attendance import Attendance
 from app.models.performance import OKR, PerformanceReview
 from app.models.communication import Notice, ForumPost, ForumComment, Message
 from app.models.audit_log import AuditLog
+from app.models.batch_job import BatchJob
+from app.models.academic_standing import AcademicStanding
+from app.models.risk_score import StudentRiskScore
+from app.models.student_attendance import ClassSession, StudentAttendance
+from app.models.course_grade_stat import CourseGradeStat
+from app.models.timetable import TimetableEntry
+from app.models.late_fee import LateFeeCharge
+from app.models.transaction_rollup import TransactionDailyRollup
+from app.models.ledger import Account, JournalEntry, Posting, BalanceCheckpoint
+from app.models.payment import Payment
+from app.models.reconciliation import BankStatementImport, ReconciliationItem
+from app.models.ar_aging import ARAgingSnapshot
+from app.models.budget import Budget
@@ -0,0 +1,30 @@
+from typing import Any, Dict, List
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def dialect_insert(db: AsyncSession, model: Any):
+    """INSERT construct for the session's dialect, so ON CONFLICT clauses are available."""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+async def upsert_increment(
+    db: AsyncSession,
+    model: Any,
+    rows: List[Dict[str, Any]],
+    *,
+    index_elements: List[str],
+    increment: List[str]
+) -> None:
+    """
+    Insert rows, or add their `increment` columns onto the existing row with the
+    same unique key. Lets concurrent writers bump counters without read-modify-write.
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(db, model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={col: getattr(model, col) + getattr(stmt.excluded, col) for col in increment}
+    )
+    await db.execute(stmt)
@@ -1,10 +1,19 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.services.lead_capture_service import lead_capture_buffer
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await lead_capture_buffer.start()
+    yield
+    await lead_capture_buffer.stop()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 from app.api.v1.api import api_router
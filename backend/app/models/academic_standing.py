@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class AcademicStanding(Base):
+    __table_args__ = (
+        UniqueConstraint("student_id", "term", name="uq_academicstanding_student_term"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("student.id"), index=True, nullable=False)
+    term = Column(String, index=True, nullable=False) # e.g. "Fall 2026"
+    cgpa = Column(Float, default=0.0)
+    credits_attempted = Column(Integer, default=0)
+    classification = Column(String)
+    max_credits = Column(Integer, default=30) # Rule 5.2
+    within_max_stay = Column(Boolean, default=True) # Rule 4.2
+    resit_course_ids = Column(JSON, default=list) # Rule 3.1: failed finals without a resit yet
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    student = relationship("Student")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class ARAgingSnapshot(Base):
+    """
+    Outstanding receivables for one day, per program, fee structure and aging bucket.
+    Coarser views and trends are summed from these rows instead of the invoice table.
+    """
+    __table_args__ = (
+        Index("ix_aragingsnapshot_date_program", "snapshot_date", "program_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    snapshot_date = Column(Date, nullable=False)
+    program_id = Column(Integer, ForeignKey("program.id"), nullable=True)
+    fee_structure_id = Column(Integer, ForeignKey("feestructure.id"), nullable=True)
+    bucket = Column(String, nullable=False) # current, 1-30, 31-60, 61-90, 90+
+    outstanding = Column(Float, nullable=False)
+    invoice_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class BatchJob(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, index=True, nullable=False) # e.g. "term_standing"
+    scope = Column(String, index=True) # e.g. "Fall 2026"
+    status = Column(String, default="pending") # pending, running, completed, failed
+    last_processed_id = Column(Integer, default=0) # Checkpoint: resume after this id
+    processed = Column(Integer, default=0)
+    total = Column(Integer, default=0)
+    elapsed_seconds = Column(Float, default=0.0)
+    error = Column(Text, nullable=True)
+    detail = Column(JSON, nullable=True) # Job-specific progress, e.g. solver phase
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def throughput(self) -> float:
+        """Records processed per second of active run time."""
+        if not self.elapsed_seconds:
+            return 0.0
+        return round((self.processed or 0) / self.elapsed_seconds, 2)
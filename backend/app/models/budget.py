@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class Budget(Base):
+    """
+    Spending limit for a category, a vendor or both over a month. `actual` is kept
+    up to date as expenses are approved, so utilization never scans the expense table.
+    """
+    __table_args__ = (
+        UniqueConstraint("scope_key", "period", name="uq_budget_scope_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String, nullable=True) # None covers every category
+    vendor_id = Column(Integer, ForeignKey("vendor.id"), nullable=True) # None covers every vendor
+    scope_key = Column(String, nullable=False) # "category|vendor_id", "*" for either when unset
+    period = Column(String, nullable=False) # YYYY-MM
+    amount = Column(Float, nullable=False)
+    actual = Column(Float, default=0.0, nullable=False)
+    expense_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    vendor = relationship("Vendor")
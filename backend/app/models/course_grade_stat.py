@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+from app.utils.stats import variance
+
+class CourseGradeStat(Base):
+    __table_args__ = (
+        UniqueConstraint("course_id", "term", "assessment_type", name="uq_coursegradestat_course_term_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("course.id"), index=True, nullable=False)
+    term = Column(String, index=True)
+    assessment_type = Column(String, nullable=False) # "CA" or "Final"
+    count = Column(Integer, default=0, nullable=False)
+    mean = Column(Float, default=0.0, nullable=False)
+    m2 = Column(Float, default=0.0, nullable=False) # Welford sum of squared deviations
+    min_score = Column(Float)
+    max_score = Column(Float)
+    histogram = Column(JSON, default=list) # Counts per 10-point bin, 0-9 ... 90-100
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def variance(self):
+        return variance(self.count or 0, self.m2 or 0.0)
+
+    @property
+    def std_dev(self):
+        var = self.variance
+        return var ** 0.5 if var is not None else None
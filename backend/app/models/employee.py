@@ -8,5 +8,6 @@ class Employee(Base):
     position = Column(String, index=True)
     department = Column(String, index=True)
     salary = Column(Float)
+    allowances = Column(Float, default=0.0) # Fixed monthly allowances on top of salary
     hire_date = Column(Date)
     status = Column(String, default="active") # active, on_leave, terminated
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 class ExpenseApproval(Base):
+    __table_args__ = (
+        Index("ix_expenseapproval_status_approved_at", "status", "approved_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String, index=True) # Salary, Utility, Maintenance, Marketing
     vendor_id = Column(Integer, ForeignKey("vendor.id"), nullable=True)
@@ -13,5 +17,6 @@ class ExpenseApproval(Base):
     submitted_at = Column(DateTime(timezone=True), server_default=func.now())
     approved_at = Column(DateTime(timezone=True), nullable=True)
     receipt_path = Column(String, nullable=True)
+    over_budget = Column(Boolean, default=False) # Set at approval when it pushed a budget past its amount
     
     vendor = relationship("Vendor", back_populates="expenses")
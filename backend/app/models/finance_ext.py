@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 class TuitionInstallment(Base):
+    __table_args__ = (
+        # Overdue sweeps scan pending installments by due date
+        Index("ix_tuitioninstallment_status_due_date", "status", "due_date"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
-    invoice_id = Column(Integer, ForeignKey("tuitioninvoice.id"), nullable=False)
+    invoice_id = Column(Integer, ForeignKey("tuitioninvoice.id"), index=True, nullable=False)
     amount = Column(Float, nullable=False)
+    amount_paid = Column(Float, default=0.0)
     due_date = Column(DateTime(timezone=True))
     status = Column(String, default="pending") # pending, paid, overdue
     paid_at = Column(DateTime(timezone=True), nullable=True)
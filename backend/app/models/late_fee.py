@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, text
+from app.db.base_class import Base
+
+class LateFeeCharge(Base):
+    __table_args__ = (
+        # At most one charge per installment, or per invoice without installments, each period
+        UniqueConstraint("installment_id", "period", name="uq_latefeecharge_installment_period"),
+        Index(
+            "uq_latefeecharge_invoice_period", "invoice_id", "period", unique=True,
+            postgresql_where=text("installment_id IS NULL"), sqlite_where=text("installment_id IS NULL")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    invoice_id = Column(Integer, ForeignKey("tuitioninvoice.id"), index=True, nullable=False)
+    installment_id = Column(Integer, ForeignKey("tuitioninstallment.id"), nullable=True)
+    period = Column(String, index=True, nullable=False) # "YYYY-MM" the fee was charged for
+    bucket = Column(String) # Aging bucket at charge time, e.g. "31-60"
+    amount = Column(Float, nullable=False)
+    charged_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    invoice = relationship("TuitionInvoice")
+    installment = relationship("TuitionInstallment")
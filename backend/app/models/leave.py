@@ -6,7 +6,7 @@ from app.db.base_class import Base
 class LeaveRequest(Base):
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employee.id"), nullable=False)
-    leave_type = Column(String, nullable=False) # Sick, Casual, Annual
+    leave_type = Column(String, nullable=False) # Sick, Casual, Annual, Unpaid
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     reason = Column(Text)
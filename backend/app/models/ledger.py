@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class Account(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String, unique=True, index=True, nullable=False) # e.g. "1000"
+    name = Column(String, nullable=False)
+    type = Column(String, nullable=False) # asset, liability, equity, income, expense
+
+class JournalEntry(Base):
+    __table_args__ = (
+        Index("ix_journalentry_source", "source_type", "source_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entry_date = Column(DateTime(timezone=True), index=True, nullable=False)
+    description = Column(String, nullable=False)
+    source_type = Column(String) # invoice, invoice_batch, payment, late_fee_batch, payroll, expense, opening
+    source_id = Column(String) # id of the source record, or e.g. the billing period for batches
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    postings = relationship("Posting", back_populates="entry")
+
+class Posting(Base):
+    """One side of a journal entry. Debits are positive, credits negative; an entry sums to zero."""
+    __table_args__ = (
+        Index("ix_posting_account_date", "account_id", "entry_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entry_id = Column(Integer, ForeignKey("journalentry.id"), index=True, nullable=False)
+    account_id = Column(Integer, ForeignKey("account.id"), nullable=False)
+    amount = Column(Float, nullable=False)
+    entry_date = Column(DateTime(timezone=True), nullable=False) # Copied from the entry for balance range scans
+
+    entry = relationship("JournalEntry", back_populates="postings")
+    account = relationship("Account")
+
+class BalanceCheckpoint(Base):
+    """Raw (debit-positive) balance of an account from postings dated before as_of."""
+    __table_args__ = (
+        UniqueConstraint("account_id", "as_of", name="uq_balancecheckpoint_account_as_of"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("account.id"), index=True, nullable=False)
+    as_of = Column(DateTime(timezone=True), nullable=False)
+    balance = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
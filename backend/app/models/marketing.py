@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -22,6 +22,44 @@ class Lead(Base):
     source = Column(String) # Organic, Campaign, Referral
     campaign_id = Column(Integer, ForeignKey("marketingcampaign.id"), nullable=True)
     status = Column(String, default="new") # new, contacted, interested, applicant, admitted, enrolled, lost
+    student_id = Column(Integer, ForeignKey("student.id"), index=True, nullable=True) # Set once the lead enrolls
+    email_key = Column(String, index=True, nullable=True) # Normalized email, for duplicate checks
+    phone_key = Column(String, index=True, nullable=True) # Trailing digits of the phone number
+    duplicate_of_id = Column(Integer, ForeignKey("lead.id"), index=True, nullable=True) # Lead this one was merged into
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     campaign = relationship("MarketingCampaign", back_populates="leads")
+    student = relationship("Student")
+    stage_events = relationship("LeadStageEvent", back_populates="lead")
+
+class LeadStageEvent(Base):
+    """A lead entering a stage; conversion times are measured between these."""
+    __table_args__ = (
+        Index("ix_leadstageevent_to_status_lead", "to_status", "lead_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    lead_id = Column(Integer, ForeignKey("lead.id"), index=True, nullable=False)
+    from_status = Column(String, nullable=True) # None when the lead was created
+    to_status = Column(String, nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    lead = relationship("Lead", back_populates="stage_events")
+
+class CampaignMetrics(Base):
+    """
+    Running totals per campaign, bumped as leads are written, linked to students and
+    pay tuition. Dashboards read these rows instead of joining leads, students and invoices.
+    """
+    __table_args__ = (
+        UniqueConstraint("campaign_id", name="uq_campaignmetrics_campaign"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("marketingcampaign.id"), nullable=False)
+    budget = Column(Float, default=0.0) # Copied from the campaign
+    leads = Column(Integer, default=0, nullable=False)
+    enrolled = Column(Integer, default=0, nullable=False) # Leads in the "enrolled" stage
+    students = Column(Integer, default=0, nullable=False) # Leads linked to a student
+    revenue = Column(Float, default=0.0, nullable=False) # Tuition paid by linked students
+    refreshed_at = Column(DateTime(timezone=True), nullable=True) # Last full recompute
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class Payment(Base):
+    """A tuition payment applied to an invoice, with the invoice state it produced."""
+    id = Column(Integer, primary_key=True, index=True)
+    invoice_id = Column(Integer, ForeignKey("tuitioninvoice.id"), index=True, nullable=False)
+    amount = Column(Float, nullable=False)
+    idempotency_key = Column(String, unique=True, index=True, nullable=True) # Client-supplied; a retry returns this row
+    invoice_amount_paid = Column(Float) # Invoice amount_paid once the request carrying this payment was applied
+    invoice_status = Column(String) # Invoice status at the same point
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    invoice = relationship("TuitionInvoice")
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 class Payroll(Base):
+    __table_args__ = (
+        UniqueConstraint("employee_id", "month", "year", name="uq_payroll_employee_period"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employee.id"), nullable=False)
     month = Column(Integer, nullable=False)
@@ -14,6 +18,7 @@ class Payroll(Base):
     tax = Column(Float, default=0.0)
     net_pay = Column(Float, nullable=False)
     status = Column(String, default="pending") # pending, approved, paid
+    breakdown = Column(JSON, nullable=True) # Working days, leave and lateness deductions, tax per bracket
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     paid_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class BankStatementImport(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String)
+    format = Column(String, nullable=False) # csv, fixed
+    status = Column(String, default="running") # running, completed, failed
+    total_lines = Column(Integer, default=0)
+    matched = Column(Integer, default=0)
+    unmatched = Column(Integer, default=0)
+    skipped = Column(Integer, default=0) # Debits and zero amounts, not payments
+    amount_matched = Column(Float, default=0.0)
+    error = Column(Text, nullable=True)
+    imported_by = Column(Integer, ForeignKey("user.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    items = relationship("ReconciliationItem", back_populates="statement")
+
+class ReconciliationItem(Base):
+    """A statement credit and what it was matched to; unmatched items form the review queue."""
+    __table_args__ = (
+        Index("ix_reconciliationitem_status_import", "status", "import_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    import_id = Column(Integer, ForeignKey("bankstatementimport.id"), index=True, nullable=False)
+    line_no = Column(Integer, nullable=False)
+    idempotency_key = Column(String, nullable=False) # Payment key for this line, also used when resolving
+    txn_date = Column(DateTime(timezone=True))
+    amount = Column(Float)
+    reference = Column(String)
+    description = Column(String)
+    status = Column(String, default="unmatched") # matched, unmatched, resolved, ignored
+    match_method = Column(String) # invoice_ref, matricule, amount, manual
+    reason = Column(String) # Why the line needs review
+    invoice_id = Column(Integer, ForeignKey("tuitioninvoice.id"), nullable=True)
+    payment_id = Column(Integer, ForeignKey("payment.id"), nullable=True)
+
+    statement = relationship("BankStatementImport", back_populates="items")
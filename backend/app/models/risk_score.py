@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class StudentRiskScore(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("student.id"), unique=True, index=True, nullable=False)
+    risk_score = Column(Integer, index=True, nullable=False) # 0-100, higher = more at risk
+    status = Column(String) # Low Risk, Moderate Risk, Critically At-Risk
+    gpa = Column(Float)
+    avg_score = Column(Float, nullable=True)
+    last_score = Column(Float, nullable=True)
+    grade_count = Column(Integer, default=0)
+    attendance_rate = Column(Float, nullable=True) # 0.0-1.0 across all courses, None if no roll calls
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    student = relationship("Student")
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -11,3 +12,18 @@ class Scholarship(Base):
     
     # Relationships
     student = relationship("Student")
+    allocations = relationship("ScholarshipAllocation", back_populates="scholarship")
+
+class ScholarshipAllocation(Base):
+    """Part of a scholarship credited to one invoice; the scholarship's unused amount is what is left."""
+    __table_args__ = (
+        UniqueConstraint("scholarship_id", "invoice_id", name="uq_scholarshipallocation_scholarship_invoice"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    scholarship_id = Column(Integer, ForeignKey("scholarship.id"), nullable=False)
+    invoice_id = Column(Integer, ForeignKey("tuitioninvoice.id"), index=True, nullable=False)
+    amount = Column(Float, nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    scholarship = relationship("Scholarship", back_populates="allocations")
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class ClassSession(Base):
+    __table_args__ = (
+        UniqueConstraint("course_id", "term", "session_index", name="uq_classsession_course_term_index"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("course.id"), nullable=False)
+    term = Column(String, nullable=False) # e.g. "Fall 2026"
+    session_index = Column(Integer, nullable=False) # 0-based position in the term, bit offset in the bitmap
+    held_at = Column(DateTime(timezone=True), server_default=func.now())
+    topic = Column(String, nullable=True)
+
+    course = relationship("Course")
+
+class StudentAttendance(Base):
+    __table_args__ = (
+        UniqueConstraint("student_id", "course_id", "term", name="uq_studentattendance_student_course_term"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("student.id"), index=True, nullable=False)
+    course_id = Column(Integer, ForeignKey("course.id"), nullable=False)
+    term = Column(String, nullable=False)
+    present_bitmap = Column(LargeBinary, nullable=False, default=b"") # Bit i set = present at session i
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    student = relationship("Student")
+    course = relationship("Course")
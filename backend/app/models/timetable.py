@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class TimetableEntry(Base):
+    __table_args__ = (
+        UniqueConstraint("term", "course_id", "day", "period", name="uq_timetableentry_term_course_slot"),
+        Index("ix_timetableentry_term_slot", "term", "day", "period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    term = Column(String, index=True, nullable=False) # e.g. "Fall 2026"
+    course_id = Column(Integer, ForeignKey("course.id"), index=True, nullable=False)
+    day = Column(String, nullable=False) # e.g. "Monday"
+    period = Column(Integer, nullable=False) # 0-based teaching period within the day
+    room = Column(String, nullable=True)
+    job_id = Column(Integer, ForeignKey("batchjob.id"), nullable=True)
+
+    course = relationship("Course")
@@ -8,4 +8,4 @@ class Transaction(Base):
     amount = Column(Float, nullable=False)
     type = Column(String, nullable=False) # income, expense
     category = Column(String, index=True) # tuition, salary, supplies, utilities
-    date = Column(DateTime(timezone=True), server_default=func.now())
+    date = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Float, Date, UniqueConstraint
+from app.db.base_class import Base
+
+class TransactionDailyRollup(Base):
+    __table_args__ = (
+        UniqueConstraint("day", "category", "type", name="uq_transactiondailyrollup_day_category_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, index=True, nullable=False)
+    category = Column(String, nullable=False) # "uncategorized" when the transaction has none
+    type = Column(String, nullable=False) # income, expense
+    total = Column(Float, default=0.0, nullable=False)
+    count = Column(Integer, default=0, nullable=False)
@@ -1,18 +1,25 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 class TuitionInvoice(Base):
+    __table_args__ = (
+        # One generated invoice per student, fee structure and billing period
+        UniqueConstraint("student_id", "fee_structure_id", "billing_period", name="uq_tuitioninvoice_student_fee_period"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("student.id"), nullable=False)
     fee_structure_id = Column(Integer, ForeignKey("feestructure.id"), nullable=True)
     amount_due = Column(Float, nullable=False)
     amount_paid = Column(Float, default=0.0)
     late_fee_accumulated = Column(Float, default=0.0)
+    scholarship_credit = Column(Float, default=0.0) # Sum of ScholarshipAllocation rows for this invoice
     status = Column(String, default="unpaid") # unpaid, partial, paid
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     due_date = Column(DateTime(timezone=True))
+    billing_period = Column(String, index=True, nullable=True) # e.g. "Fall 2026"; NULL for ad-hoc invoices
     
     # Relationships
     student = relationship("Student")
@@ -0,0 +1,18 @@
+from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel
+
+class AcademicStanding(BaseModel):
+    id: int
+    student_id: int
+    term: str
+    cgpa: float
+    credits_attempted: Optional[int] = 0
+    classification: Optional[str] = None
+    max_credits: int
+    within_max_stay: bool
+    resit_course_ids: Optional[List[int]] = []
+    computed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,22 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class BatchJob(BaseModel):
+    id: int
+    name: str
+    scope: Optional[str] = None
+    status: str
+    last_processed_id: Optional[int] = 0
+    processed: Optional[int] = 0
+    total: Optional[int] = 0
+    elapsed_seconds: Optional[float] = 0.0
+    throughput: Optional[float] = None # records per second
+    error: Optional[str] = None
+    detail: Optional[Dict[str, Any]] = None
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,33 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class BudgetBase(BaseModel):
+    category: Optional[str] = None
+    vendor_id: Optional[int] = None
+    period: Optional[str] = None
+    amount: Optional[float] = None
+
+class BudgetCreate(BudgetBase):
+    period: str
+    amount: float
+
+class BudgetUpdate(BaseModel):
+    amount: float
+
+class BudgetInDBBase(BudgetBase):
+    id: Optional[int] = None
+    scope_key: Optional[str] = None
+    actual: Optional[float] = None
+    expense_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class Budget(BudgetInDBBase):
+    pass
+
+class BudgetUtilization(Budget):
+    remaining: float
+    utilization: float
@@ -0,0 +1,19 @@
+from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel
+
+class CourseGradeStat(BaseModel):
+    course_id: int
+    term: Optional[str] = None
+    assessment_type: str
+    count: int
+    mean: float
+    variance: Optional[float] = None
+    std_dev: Optional[float] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    histogram: List[int] = []
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
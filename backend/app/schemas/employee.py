@@ -9,6 +9,7 @@ class EmployeeBase(BaseModel):
     position: Optional[str] = None
     department: Optional[str] = None
     salary: Optional[float] = None
+    allowances: Optional[float] = 0.0
     hire_date: Optional[date] = None
     status: Optional[str] = "active"
 
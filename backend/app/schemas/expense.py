@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
 class ExpenseApprovalBase(BaseModel):
     category: Optional[str] = None
+    vendor_id: Optional[int] = None
     amount: Optional[float] = None
     description: Optional[str] = None
     status: Optional[str] = "pending"
@@ -20,9 +21,17 @@ class ExpenseApprovalInDBBase(ExpenseApprovalBase):
     id: Optional[int] = None
     submitted_at: Optional[datetime] = None
     approved_at: Optional[datetime] = None
+    over_budget: Optional[bool] = None
 
     class Config:
         from_attributes = True
 
 class ExpenseApproval(ExpenseApprovalInDBBase):
     pass
+
+class ExpenseBulkAction(BaseModel):
+    """Pending expenses to approve or reject: explicit ids, filters, or both."""
+    ids: Optional[List[int]] = None
+    category: Optional[str] = None
+    vendor_id: Optional[int] = None
+    submitted_before: Optional[datetime] = None
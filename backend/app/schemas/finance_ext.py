@@ -39,6 +39,13 @@ class TuitionInstallmentUpdate(TuitionInstallmentBase):
 
 class TuitionInstallment(TuitionInstallmentBase):
     id: int
+    amount_paid: Optional[float] = 0.0
     paid_at: Optional[datetime] = None
     class Config:
         from_attributes = True
+
+class InstallmentPlanCreate(BaseModel):
+    invoice_ids: List[int]
+    num_installments: int
+    first_due_date: Optional[datetime] = None # Defaults to 30 days from now
+    interval_days: int = 30
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import date, datetime
 from pydantic import BaseModel
 
@@ -25,6 +25,7 @@ class PayrollUpdate(PayrollBase):
 
 class Payroll(PayrollBase):
     id: int
+    breakdown: Optional[Dict[str, Any]] = None
     created_at: datetime
     paid_at: Optional[datetime] = None
     class Config:
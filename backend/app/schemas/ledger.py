@@ -0,0 +1,27 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class AccountBalance(BaseModel):
+    code: str
+    name: str
+    type: str
+    balance: float
+
+class Posting(BaseModel):
+    account_id: int
+    amount: float
+
+    class Config:
+        from_attributes = True
+
+class JournalEntry(BaseModel):
+    id: int
+    entry_date: datetime
+    description: str
+    source_type: Optional[str] = None
+    source_id: Optional[str] = None
+    postings: List[Posting] = []
+
+    class Config:
+        from_attributes = True
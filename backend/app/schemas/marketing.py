@@ -44,6 +44,7 @@ class LeadUpdate(LeadBase):
 
 class LeadInDBBase(LeadBase):
     id: Optional[int] = None
+    student_id: Optional[int] = None
     created_at: Optional[datetime] = None
 
     class Config:
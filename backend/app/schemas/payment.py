@@ -0,0 +1,23 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class PaymentCreate(BaseModel):
+    invoice_id: int
+    amount: float
+    idempotency_key: Optional[str] = None
+
+class PaymentBatch(BaseModel):
+    payments: List[PaymentCreate]
+
+class Payment(BaseModel):
+    id: int
+    invoice_id: int
+    amount: float
+    idempotency_key: Optional[str] = None
+    invoice_amount_paid: Optional[float] = None
+    invoice_status: Optional[str] = None
+    received_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
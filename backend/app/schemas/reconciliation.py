@@ -0,0 +1,37 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class BankStatementImport(BaseModel):
+    id: int
+    filename: Optional[str] = None
+    format: str
+    status: str
+    total_lines: int = 0
+    matched: int = 0
+    unmatched: int = 0
+    skipped: int = 0
+    amount_matched: float = 0.0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ReconciliationItem(BaseModel):
+    id: int
+    import_id: int
+    line_no: int
+    txn_date: Optional[datetime] = None
+    amount: Optional[float] = None
+    reference: Optional[str] = None
+    description: Optional[str] = None
+    status: str
+    match_method: Optional[str] = None
+    reason: Optional[str] = None
+    invoice_id: Optional[int] = None
+    payment_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,5 @@
 from typing import Optional
+from datetime import datetime
 from pydantic import BaseModel
 
 class ScholarshipBase(BaseModel):
@@ -22,3 +23,13 @@ class ScholarshipInDBBase(ScholarshipBase):
 
 class Scholarship(ScholarshipInDBBase):
     pass
+
+class ScholarshipAllocation(BaseModel):
+    id: int
+    scholarship_id: int
+    invoice_id: int
+    amount: float
+    applied_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,42 @@
+from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel
+
+# Class Session Schemas
+class ClassSessionBase(BaseModel):
+    course_id: int
+    term: str
+    held_at: Optional[datetime] = None
+    topic: Optional[str] = None
+
+class ClassSessionCreate(ClassSessionBase):
+    pass
+
+class ClassSession(ClassSessionBase):
+    id: int
+    session_index: int
+    class Config:
+        from_attributes = True
+
+# Roll Call Schemas
+class RollCallEntry(BaseModel):
+    student_id: int
+    present: bool = True
+
+class RollCall(BaseModel):
+    session_id: int
+    entries: List[RollCallEntry]
+
+class RollCallResult(BaseModel):
+    sessions: int
+    marked_present: int
+    marked_absent: int
+
+# Attendance Report Schemas
+class AttendanceSummary(BaseModel):
+    student_id: int
+    course_id: int
+    term: str
+    sessions_attended: int
+    sessions_held: int
+    attendance_rate: Optional[float] = None
@@ -0,0 +1,29 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+class Room(BaseModel):
+    name: str
+    capacity: int
+
+class TimetableGenerate(BaseModel):
+    term: str
+    days: List[str] = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    periods_per_day: int = 8
+    rooms: Optional[List[Room]] = None
+    time_limit_seconds: float = 10.0
+
+class TimetableEntry(BaseModel):
+    id: int
+    term: str
+    course_id: int
+    day: str
+    period: int
+    room: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class TimetableClash(BaseModel):
+    course_id: int
+    day: str
+    period: int
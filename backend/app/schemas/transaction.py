@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel
 
 # Shared properties
@@ -33,3 +33,13 @@ class Transaction(TransactionInDBBase):
 # Additional properties stored in DB
 class TransactionInDB(TransactionInDBBase):
     pass
+
+class TransactionDailyRollup(BaseModel):
+    day: date
+    category: str
+    type: str
+    total: float
+    count: int
+
+    class Config:
+        from_attributes = True
@@ -9,6 +9,7 @@ class TuitionInvoiceBase(BaseModel):
     amount_paid: Optional[float] = 0.0
     status: Optional[str] = "unpaid"
     due_date: Optional[datetime] = None
+    billing_period: Optional[str] = None
 
 class TuitionInvoiceCreate(TuitionInvoiceBase):
     student_id: int
@@ -20,6 +21,8 @@ class TuitionInvoiceUpdate(TuitionInvoiceBase):
 
 class TuitionInvoiceInDBBase(TuitionInvoiceBase):
     id: Optional[int] = None
+    late_fee_accumulated: Optional[float] = 0.0
+    scholarship_credit: Optional[float] = 0.0
     created_at: Optional[datetime] = None
 
     class Config:
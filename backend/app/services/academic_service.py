@@ -0,0 +1,156 @@
+import time
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.student import Student
+from app.models.grade import Grade
+from app.models.course import Course
+from app.crud.crud_batch_job import batch_job as crud_batch_job
+from app.models.batch_job import BatchJob
+from app.models.academic_standing import AcademicStanding
+from app.services.analytics_service import analytics_service
+from app.utils.academic import (
+    calculate_cgpa,
+    get_classification,
+    check_max_credits,
+    check_max_stay,
+    is_resit_eligible
+)
+
+class AcademicService:
+    STANDING_JOB = "term_standing"
+
+    @staticmethod
+    async def get_standing_job(db: AsyncSession, term: str, restart: bool = False) -> BatchJob:
+        """
+        Return the unfinished standing job for a term so a crashed run resumes from
+        its checkpoint. A new job is started when none is pending or on restart,
+        unless the unfinished one is still running with a live heartbeat.
+        """
+        job = await crud_batch_job.get_unfinished(db, name=AcademicService.STANDING_JOB, scope=term)
+        if job and not restart:
+            return job
+        if job and not await crud_batch_job.is_claimable(db, job.id):
+            return job
+
+        total = (await db.execute(select(func.count(Student.id)))).scalar() or 0
+        job = BatchJob(name=AcademicService.STANDING_JOB, scope=term, status="pending", total=total)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def claim_standing_job(db: AsyncSession, job: BatchJob) -> bool:
+        """
+        Mark the job running for this worker. False when another worker holds it
+        (running with a recent heartbeat), so two workers never process the same checkpoint.
+        """
+        return await crud_batch_job.claim(db, job)
+
+    @staticmethod
+    def _build_standing(student_id: int, enrollment_date: Any, grades: List[Grade], courses: List[Course], term: str) -> Dict[str, Any]:
+        course_map = {c.id: c for c in courses}
+        course_grades: Dict[int, List[Grade]] = {}
+        for g in grades:
+            course_grades.setdefault(g.course_id, []).append(g)
+
+        cgpa = calculate_cgpa(grades, courses)
+        return {
+            "student_id": student_id,
+            "term": term,
+            "cgpa": cgpa,
+            "credits_attempted": sum(course_map[cid].credits or 0 for cid in course_grades if cid in course_map),
+            "classification": get_classification(cgpa),
+            "max_credits": check_max_credits(cgpa),
+            "within_max_stay": check_max_stay(enrollment_date),
+            "resit_course_ids": sorted(cid for cid, cg in course_grades.items() if is_resit_eligible(cg)),
+            "computed_at": datetime.now(),
+        }
+
+    @staticmethod
+    async def run_term_standing(db: AsyncSession, job: BatchJob, chunk_size: int = 500) -> BatchJob:
+        """
+        Compute the end-of-term standing snapshot for every student, in id-ordered chunks.
+        Each chunk's snapshot rows, its students' risk scores (recomputed from the new
+        CGPA) and the job checkpoint are committed together, so a crash resumes after
+        the last committed student instead of restarting. The caller claims the job first (claim_standing_job); each commit is a heartbeat.
+        """
+
+        courses = (await db.execute(select(Course))).scalars().all()
+
+        try:
+            while True:
+                started = time.perf_counter()
+                result = await db.execute(
+                    select(Student.id, Student.enrollment_date)
+                    .where(Student.id > (job.last_processed_id or 0))
+                    .order_by(Student.id)
+                    .limit(chunk_size)
+                )
+                students = result.all()
+                if not students:
+                    break
+
+                student_ids = [s.id for s in students]
+                grades_result = await db.execute(select(Grade).where(Grade.student_id.in_(student_ids)))
+                grades_by_student: Dict[int, List[Grade]] = {}
+                for g in grades_result.scalars().all():
+                    grades_by_student.setdefault(g.student_id, []).append(g)
+
+                rows = [
+                    AcademicService._build_standing(
+                        s.id, s.enrollment_date, grades_by_student.get(s.id, []), courses, job.scope
+                    )
+                    for s in students
+                ]
+
+                await db.execute(delete(AcademicStanding).where(
+                    AcademicStanding.term == job.scope,
+                    AcademicStanding.student_id.in_(student_ids)
+                ))
+                await db.execute(insert(AcademicStanding), rows)
+                await analytics_service.refresh_risk_scores(db, student_ids, commit=False)
+
+                job.last_processed_id = student_ids[-1]
+                job.processed = (job.processed or 0) + len(rows)
+                job.elapsed_seconds = (job.elapsed_seconds or 0.0) + (time.perf_counter() - started)
+                job.updated_at = datetime.now()
+                await db.commit()
+        except Exception as e:
+            await db.rollback()
+            await db.refresh(job)
+            job.status = "failed"
+            job.error = str(e)
+            job.updated_at = datetime.now()
+            await db.commit()
+            raise
+
+        job.status = "completed"
+        job.finished_at = datetime.now()
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_latest_standings(db: AsyncSession, student_ids: List[int]) -> Dict[int, AcademicStanding]:
+        """Most recent standing snapshot per student, keyed by student id."""
+        if not student_ids:
+            return {}
+        result = await db.execute(
+            select(AcademicStanding)
+            .where(AcademicStanding.student_id.in_(student_ids))
+            .order_by(AcademicStanding.computed_at.desc(), AcademicStanding.id.desc())
+        )
+        latest: Dict[int, AcademicStanding] = {}
+        for standing in result.scalars().all():
+            latest.setdefault(standing.student_id, standing)
+        return latest
+
+    @staticmethod
+    async def get_latest_standing(db: AsyncSession, student_id: int) -> Optional[AcademicStanding]:
+        standings = await AcademicService.get_latest_standings(db, [student_id])
+        return standings.get(student_id)
+
+academic_service = AcademicService()
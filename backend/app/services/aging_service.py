@@ -0,0 +1,167 @@
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+from sqlalchemy import select, delete, insert, func, case, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.ar_aging import ARAgingSnapshot
+from app.models.program import Program
+from app.models.student import Student
+from app.models.tuition_invoice import TuitionInvoice
+from app.utils.aging import AR_BUCKETS, CURRENT_BUCKET, bucket_bounds
+
+SNAPSHOT_DIMENSIONS = {
+    "program": ARAgingSnapshot.program_id,
+    "fee_structure": ARAgingSnapshot.fee_structure_id,
+}
+
+def _outstanding():
+    return (
+        TuitionInvoice.amount_due
+        + func.coalesce(TuitionInvoice.late_fee_accumulated, 0.0)
+        - func.coalesce(TuitionInvoice.amount_paid, 0.0)
+        - func.coalesce(TuitionInvoice.scholarship_credit, 0.0)
+    )
+
+def _bucket(as_of: datetime):
+    """Aging bucket of an invoice's due date as a CASE expression, newest bucket first."""
+    whens = [(or_(TuitionInvoice.due_date.is_(None), TuitionInvoice.due_date >= as_of), CURRENT_BUCKET)]
+    bounds = bucket_bounds(as_of)
+    for label, oldest, _ in bounds[:-1]:
+        whens.append((TuitionInvoice.due_date >= oldest, label))
+    return case(*whens, else_=bounds[-1][0])
+
+def _pivot(rows: List[Any]) -> Dict[str, Any]:
+    """(key, bucket, outstanding, invoices) rows to one row per key with a column per bucket."""
+    by_key: Dict[Any, Dict[str, Any]] = {}
+    totals = {bucket: 0.0 for bucket in AR_BUCKETS}
+    totals.update(total=0.0, invoices=0)
+    for key, bucket, outstanding, invoices in rows:
+        row = by_key.get(key)
+        if row is None:
+            row = by_key[key] = {"key": key, **{b: 0.0 for b in AR_BUCKETS}, "total": 0.0, "invoices": 0}
+        outstanding = round(outstanding or 0.0, 2)
+        row[bucket] = round(row[bucket] + outstanding, 2)
+        row["total"] = round(row["total"] + outstanding, 2)
+        row["invoices"] += invoices or 0
+        totals[bucket] = round(totals[bucket] + outstanding, 2)
+        totals["total"] = round(totals["total"] + outstanding, 2)
+        totals["invoices"] += invoices or 0
+    return {"rows": sorted(by_key.values(), key=lambda r: -r["total"]), "totals": totals}
+
+class AgingService:
+    @staticmethod
+    def _open_invoices(as_of: datetime, *columns):
+        """Grouped outstanding balances of unpaid invoices per `columns` and aging bucket."""
+        bucket = _bucket(as_of).label("bucket")
+        return (
+            select(*columns, bucket, func.sum(_outstanding()), func.count(TuitionInvoice.id))
+            .join(Student, Student.id == TuitionInvoice.student_id)
+            .where(TuitionInvoice.status != "paid", _outstanding() > 0)
+            .group_by(*columns, bucket)
+        )
+
+    @staticmethod
+    async def create_snapshot(db: AsyncSession, as_of: Optional[datetime] = None) -> int:
+        """
+        Store the day's aging per program, fee structure and bucket with one grouped
+        INSERT ... SELECT over the invoice table. Rerunning replaces the day's rows.
+        """
+        as_of = as_of or datetime.now()
+        snapshot_date = as_of.date()
+        await db.execute(delete(ARAgingSnapshot).where(ARAgingSnapshot.snapshot_date == snapshot_date))
+        source = AgingService._open_invoices(as_of, Student.program_id, TuitionInvoice.fee_structure_id)
+        result = await db.execute(insert(ARAgingSnapshot).from_select(
+            ["program_id", "fee_structure_id", "bucket", "outstanding", "invoice_count", "snapshot_date"],
+            select(*source.subquery().c, literal(snapshot_date, ARAgingSnapshot.snapshot_date.type))
+        ))
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def _has_snapshot(db: AsyncSession, snapshot_date: date) -> bool:
+        result = await db.execute(
+            select(ARAgingSnapshot.id).where(ARAgingSnapshot.snapshot_date == snapshot_date).limit(1)
+        )
+        return result.first() is not None
+
+    @staticmethod
+    async def get_report(
+        db: AsyncSession,
+        *,
+        group_by: str = "program",
+        as_of: Optional[date] = None,
+        program_id: Optional[int] = None,
+        refresh: bool = False,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Receivables aging by program or fee structure, read from the day's snapshot
+        (taken on first request if missing). By student it is computed live from
+        current balances, so only for today, and is best filtered to one program.
+        """
+        today = date.today()
+        as_of = as_of or today
+        if group_by == "student":
+            if as_of != today:
+                return {"error": f"Aging by student is computed live and is only available for {today}"}
+            stmt = AgingService._open_invoices(datetime.now(), TuitionInvoice.student_id)
+            if program_id is not None:
+                stmt = stmt.where(Student.program_id == program_id)
+            report = _pivot((await db.execute(stmt)).all())
+            report["rows"] = report["rows"][:limit]
+            names = dict((await db.execute(
+                select(Student.id, Student.full_name).where(Student.id.in_([r["key"] for r in report["rows"]]))
+            )).all())
+            for row in report["rows"]:
+                row["name"] = names.get(row["key"])
+            return {"as_of": as_of, "group_by": group_by, "source": "live", "buckets": AR_BUCKETS, **report}
+
+        if group_by not in SNAPSHOT_DIMENSIONS:
+            return {"error": "group_by must be one of: program, fee_structure, student"}
+        if as_of == today and (refresh or not await AgingService._has_snapshot(db, as_of)):
+            await AgingService.create_snapshot(db)
+        elif as_of != today and not await AgingService._has_snapshot(db, as_of):
+            return {"error": f"No aging snapshot for {as_of}"}
+
+        dimension = SNAPSHOT_DIMENSIONS[group_by]
+        stmt = (
+            select(dimension, ARAgingSnapshot.bucket, func.sum(ARAgingSnapshot.outstanding), func.sum(ARAgingSnapshot.invoice_count))
+            .where(ARAgingSnapshot.snapshot_date == as_of)
+            .group_by(dimension, ARAgingSnapshot.bucket)
+        )
+        if program_id is not None:
+            stmt = stmt.where(ARAgingSnapshot.program_id == program_id)
+        report = _pivot((await db.execute(stmt)).all())
+        if group_by == "program":
+            names = dict((await db.execute(select(Program.id, Program.name))).all())
+            for row in report["rows"]:
+                row["name"] = names.get(row["key"])
+        return {"as_of": as_of, "group_by": group_by, "source": "snapshot", "buckets": AR_BUCKETS, **report}
+
+    @staticmethod
+    async def get_trend(
+        db: AsyncSession,
+        *,
+        start_date: date,
+        end_date: date,
+        program_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Daily bucket totals between two dates, from stored snapshots only."""
+        stmt = (
+            select(
+                ARAgingSnapshot.snapshot_date,
+                ARAgingSnapshot.bucket,
+                func.sum(ARAgingSnapshot.outstanding),
+                func.sum(ARAgingSnapshot.invoice_count)
+            )
+            .where(ARAgingSnapshot.snapshot_date >= start_date, ARAgingSnapshot.snapshot_date <= end_date)
+            .group_by(ARAgingSnapshot.snapshot_date, ARAgingSnapshot.bucket)
+        )
+        if program_id is not None:
+            stmt = stmt.where(ARAgingSnapshot.program_id == program_id)
+        report = _pivot((await db.execute(stmt)).all())
+        return [
+            {"snapshot_date": row["key"], **{k: v for k, v in row.items() if k != "key"}}
+            for row in sorted(report["rows"], key=lambda r: r["key"])
+        ]
+
+aging_service = AgingService()
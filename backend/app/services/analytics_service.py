@@ -1,118 +1,275 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, delete, insert
 from app.models.student import Student
 from app.models.grade import Grade
-from app.models.attendance import Attendance  # We added this in Phase 3
-import statistics
+from app.models.academic_standing import AcademicStanding
+from app.models.risk_score import StudentRiskScore
+from app.services.recommendation_service import course_recommender
+from app.services.attendance_service import student_attendance_service
+from app.crud.crud_grade import grade as crud_grade
+from app.utils.academic import GRADE_POINT_SCALE, get_classification
+from app.utils.cache import ScopedCache
+
+# Upper bin edges of the GPA histogram (0.5-wide bins, 4.0 inclusive)
+GPA_BIN_EDGES = np.arange(0.0, 4.5, 0.5)
+
+# Cohort statistics, scoped by term so grade writes only invalidate their term
+cohort_cache = ScopedCache(ttl_seconds=600)
 
 class AnalyticsService:
-    async def predict_student_risk(self, db: AsyncSession, student_id: int) -> Dict[str, Any]:
+    async def score_students(self, db: AsyncSession, student_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         """
-        Calculates a risk score (0-100) for a student.
+        Calculates risk scores (0-100) for many students at once.
         Low score = Low risk, High score = High risk (At-Risk).
+        Inputs come from grouped queries; the heuristic is applied to whole arrays.
         """
-        # 1. Fetch Student and related data
-        student_result = await db.execute(select(Student).where(Student.id == student_id))
-        student = student_result.scalar_one_or_none()
-        if not student:
-            return {"error": "Student not found"}
+        # 1. Students
+        stmt = select(Student.id, Student.full_name, Student.cumulative_gpa).order_by(Student.id)
+        if student_ids is not None:
+            stmt = stmt.where(Student.id.in_(student_ids))
+        students = (await db.execute(stmt)).all()
+        if not students:
+            return []
+        ids = [s.id for s in students]
+        index = {sid: i for i, sid in enumerate(ids)}
+        n = len(ids)
+
+        # 2. Grade aggregates per student (average and count)
+        agg_stmt = select(Grade.student_id, func.avg(Grade.score), func.count(Grade.id)).group_by(Grade.student_id)
+        if student_ids is not None:
+            agg_stmt = agg_stmt.where(Grade.student_id.in_(ids))
+        avg_score = np.full(n, np.nan)
+        grade_count = np.zeros(n, dtype=int)
+        for sid, avg, count in (await db.execute(agg_stmt)).all():
+            if sid in index:
+                avg_score[index[sid]] = avg
+                grade_count[index[sid]] = count
+
+        # 3. Most recent grade per student
+        latest = select(func.max(Grade.id).label("id")).group_by(Grade.student_id)
+        if student_ids is not None:
+            latest = latest.where(Grade.student_id.in_(ids))
+        latest = latest.subquery()
+        last_score = np.full(n, np.nan)
+        last_stmt = select(Grade.student_id, Grade.score).join(latest, Grade.id == latest.c.id)
+        for sid, score in (await db.execute(last_stmt)).all():
+            if sid in index:
+                last_score[index[sid]] = score
+
+        # 4. GPA: latest term-end standing snapshot, else the stored cumulative GPA
+        gpa = np.array([s.cumulative_gpa or 3.0 for s in students], dtype=float)
+        standing_stmt = select(AcademicStanding.student_id, AcademicStanding.cgpa).order_by(
+            AcademicStanding.computed_at, AcademicStanding.id
+        )
+        if student_ids is not None:
+            standing_stmt = standing_stmt.where(AcademicStanding.student_id.in_(ids))
+        for sid, cgpa in (await db.execute(standing_stmt)).all():
+            if sid in index:
+                gpa[index[sid]] = 3.0 if cgpa is None else cgpa
+
+        # 5. Attendance rate across all courses with roll calls
+        attendance = np.full(n, np.nan)
+        for sid, rate in (await student_attendance_service.attendance_rates(db, ids if student_ids is not None else None)).items():
+            if sid in index:
+                attendance[index[sid]] = rate
 
-        # 2. Fetch Grades
-        grades_result = await db.execute(select(Grade).where(Grade.student_id == student_id))
-        grades = grades_result.scalars().all()
-        
-        # 3. Fetch Attendance (Simulated or Real)
-        # In a real system, we'd calculate attendance percentage
-        # For now, let's use the attendance model records we created
-        attendance_result = await db.execute(select(Attendance).where(Attendance.employee_id == student_id)) # Note: Attendance was linked to Employee in Ph3, might need adjustment for Students
-        # Correction: The Attendance model was linked to Employee. FK employee_id.
-        # For Student attendance, we'd ideally have a separate model or shared. 
-        # But let's simulate the logic for now based on available data.
-        
         # Heuristic Risk Calculation
-        avg_grade = statistics.mean([g.score for g in grades]) if grades else 3.0 # Default/Mid
-        gpa = student.cgpa or 3.0
-        
-        # Risk factors
-        risk_score = 0
-        
+        has_grades = grade_count > 0
         # GPA Factor (Weight 50%)
-        if gpa < 2.0: risk_score += 50
-        elif gpa < 2.5: risk_score += 30
-        elif gpa < 3.0: risk_score += 10
-        
-        # Performance Trend (Weight 30%)
-        # If last grade is significantly lower than average
-        if grades:
-            last_grade = grades[-1].score
-            if last_grade < avg_grade - 0.5:
-                risk_score += 20
-        else:
-            risk_score += 15 # Lack of data is a minor risk
-            
-        # Attendance/Engagement Simulation (Weight 20%)
-        # Mock logic: more than 2 pending assignments = risk
-        risk_score += 10 # Baseline engagement risk placeholder
-        
-        # Final Score Capping
-        risk_score = min(max(risk_score, 0), 100)
-        
-        status = "Low Risk"
-        if risk_score > 70: status = "Critically At-Risk"
-        elif risk_score > 40: status = "Moderate Risk"
-        
+        risk = np.select([gpa < 2.0, gpa < 2.5, gpa < 3.0], [50, 30, 10], default=0)
+        # Performance Trend (Weight 30%): last grade significantly lower than average
+        # Lack of data is a minor risk
+        with np.errstate(invalid="ignore"):
+            declining = has_grades & (last_score < avg_score - 0.5)
+        risk = risk + np.where(has_grades, np.where(declining, 20, 0), 15)
+        # Attendance/Engagement (Weight 20%): no roll calls yet keeps a baseline risk
+        with np.errstate(invalid="ignore"):
+            engagement = np.select([attendance < 0.5, attendance < 0.75], [20, 10], default=0)
+        risk = risk + np.where(np.isnan(attendance), 10, engagement)
+        risk = np.clip(risk, 0, 100)
+
+        status = np.where(risk > 70, "Critically At-Risk", np.where(risk > 40, "Moderate Risk", "Low Risk"))
+
+        return [
+            {
+                "student_id": sid,
+                "full_name": students[i].full_name,
+                "risk_score": int(risk[i]),
+                "status": str(status[i]),
+                "gpa": float(gpa[i]),
+                "avg_score": None if np.isnan(avg_score[i]) else float(avg_score[i]),
+                "last_score": None if np.isnan(last_score[i]) else float(last_score[i]),
+                "grade_count": int(grade_count[i]),
+                "attendance_rate": None if np.isnan(attendance[i]) else round(float(attendance[i]), 4),
+            }
+            for i, sid in enumerate(ids)
+        ]
+
+    async def refresh_risk_scores(
+        self, db: AsyncSession, student_ids: Optional[List[int]] = None, commit: bool = True
+    ) -> int:
+        """
+        Recompute and persist risk scores. Pass student_ids for an incremental
+        refresh after grade changes; omit to rebuild the whole table. commit=False
+        leaves the rows in the caller's transaction.
+        """
+        scores = await self.score_students(db, student_ids)
+        delete_stmt = delete(StudentRiskScore)
+        if student_ids is not None:
+            delete_stmt = delete_stmt.where(StudentRiskScore.student_id.in_(student_ids))
+        await db.execute(delete_stmt)
+        if scores:
+            now = datetime.now()
+            await db.execute(insert(StudentRiskScore), [
+                {
+                    "student_id": s["student_id"],
+                    "risk_score": s["risk_score"],
+                    "status": s["status"],
+                    "gpa": s["gpa"],
+                    "avg_score": s["avg_score"],
+                    "last_score": s["last_score"],
+                    "grade_count": s["grade_count"],
+                    "attendance_rate": s["attendance_rate"],
+                    "computed_at": now,
+                }
+                for s in scores
+            ])
+        if commit:
+            await db.commit()
+        return len(scores)
+
+    async def get_at_risk_students(
+        self, db: AsyncSession, threshold: int = 40, skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Read persisted risk scores above the threshold, highest risk first.
+        """
+        has_scores = (await db.execute(select(StudentRiskScore.id).limit(1))).first()
+        if not has_scores:
+            await self.refresh_risk_scores(db)
+
+        result = await db.execute(
+            select(StudentRiskScore, Student.full_name)
+            .join(Student, Student.id == StudentRiskScore.student_id)
+            .where(StudentRiskScore.risk_score >= threshold)
+            .order_by(StudentRiskScore.risk_score.desc(), StudentRiskScore.student_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return [
+            {
+                "student_id": score.student_id,
+                "full_name": full_name,
+                "risk_score": score.risk_score,
+                "status": score.status,
+                "gpa": score.gpa,
+                "attendance_rate": score.attendance_rate,
+                "recommendations": self._get_recommendations(score.status, score.gpa)
+            }
+            for score, full_name in result.all()
+        ]
+
+    async def predict_student_risk(self, db: AsyncSession, student_id: int) -> Dict[str, Any]:
+        """
+        Calculates a risk score (0-100) for a single student.
+        """
+        scores = await self.score_students(db, [student_id])
+        if not scores:
+            return {"error": "Student not found"}
+        score = scores[0]
         return {
             "student_id": student_id,
-            "full_name": student.full_name,
-            "risk_score": risk_score,
-            "status": status,
-            "gpa": gpa,
-            "recommendations": self._get_recommendations(status, gpa)
+            "full_name": score["full_name"],
+            "risk_score": score["risk_score"],
+            "status": score["status"],
+            "gpa": score["gpa"],
+            "attendance_rate": score["attendance_rate"],
+            "recommendations": self._get_recommendations(score["status"], score["gpa"])
         }
 
-    async def get_course_recommendations(self, db: AsyncSession, student_id: int) -> List[Dict[str, Any]]:
+    async def get_course_recommendations(
+        self, db: AsyncSession, student_id: int, limit: int = 3, term: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
-        AI-driven course recommendations based on student performance and program.
+        Course recommendations from the in-memory co-enrollment and grade-correlation model.
+        Only courses with cleared prerequisites and free seats in the term are suggested.
         """
-        from app.models.course import Course
-        from app.models.enrollment import Enrollment
-
-        # 1. Fetch Student and current enrollments
-        st_res = await db.execute(select(Student).where(Student.id == student_id))
-        student = st_res.scalar_one_or_none()
-        if not student: return []
-
-        enrolled_res = await db.execute(select(Enrollment).where(Enrollment.student_id == student_id))
-        enrolled_course_ids = [e.course_id for e in enrolled_res.scalars().all()]
-
-        # 2. Fetch courses in student's program not yet taken
-        courses_res = await db.execute(
-            select(Course).where(
-                Course.department == student.department,
-                ~Course.id.in_(enrolled_course_ids)
+        return await course_recommender.recommend(db, student_id, limit=limit, term=term)
+
+    async def get_cohort_stats(
+        self,
+        db: AsyncSession,
+        *,
+        program_id: Optional[int] = None,
+        course_id: Optional[int] = None,
+        term: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        GPA histogram, pass rate (total >= 50), resit rate and classification
+        breakdown for a program, course and/or term. Course totals come from one
+        grouped query; GPAs are computed over NumPy arrays. GPAs cover the
+        selected term when one is given, and all terms otherwise.
+        """
+        key = ("cohort", program_id, course_id, term)
+        cached = cohort_cache.get(key)
+        if cached is not None:
+            return cached
+
+        rows = await crud_grade.get_course_totals(db, program_id=program_id, course_id=course_id, term=term)
+        stats: Dict[str, Any] = {
+            "program_id": program_id,
+            "course_id": course_id,
+            "term": term,
+            "students": 0,
+            "course_results": len(rows),
+            "pass_rate": None,
+            "resit_rate": None,
+            "average_gpa": None,
+            "gpa_histogram": [
+                {"min": float(lo), "max": float(hi), "count": 0}
+                for lo, hi in zip(GPA_BIN_EDGES[:-1], GPA_BIN_EDGES[1:])
+            ],
+            "classifications": {},
+        }
+        if rows:
+            student_ids = np.array([r.student_id for r in rows])
+            totals = np.array([r.total for r in rows], dtype=float)
+            credits = np.array([r.credits or 0 for r in rows], dtype=float)
+            has_resit = np.array([bool(r.has_resit) for r in rows])
+
+            grade_points = np.select(
+                [totals >= min_score for min_score, _ in GRADE_POINT_SCALE],
+                [gp for _, gp in GRADE_POINT_SCALE],
+                default=0.0
             )
-        )
-        available_courses = courses_res.scalars().all()
+            students, inverse = np.unique(student_ids, return_inverse=True)
+            weighted = np.bincount(inverse, weights=grade_points * credits)
+            credit_sums = np.bincount(inverse, weights=credits)
+            gpa = np.round(np.divide(weighted, credit_sums, out=np.zeros_like(weighted), where=credit_sums > 0), 2)
 
-        # 3. Heuristic Scoring
-        recommendations = []
-        for course in available_courses:
-            score = 70 # Base score for major courses
-            reason = f"Essential for {student.department} track."
-            
-            # Boost based on prerequisites check (Simulated)
-            # If student has high grades in related topics...
-            
-            recommendations.append({
-                "course_id": course.id,
-                "title": course.title,
-                "code": course.code,
-                "match_score": score,
-                "reason": reason
+            counts, _ = np.histogram(gpa, bins=GPA_BIN_EDGES)
+            for bucket, count in zip(stats["gpa_histogram"], counts):
+                bucket["count"] = int(count)
+
+            classifications: Dict[str, int] = {}
+            for value in gpa:
+                label = get_classification(float(value))
+                classifications[label] = classifications.get(label, 0) + 1
+
+            stats.update({
+                "students": int(len(students)),
+                "pass_rate": round(float((totals >= 50).mean()), 4),
+                "resit_rate": round(float(has_resit.mean()), 4),
+                "average_gpa": round(float(gpa.mean()), 2),
+                "classifications": classifications,
             })
 
-        return sorted(recommendations, key=lambda x: x["match_score"], reverse=True)[:3]
+        cohort_cache.set(key, stats, scope=term)
+        return stats
 
     def _get_recommendations(self, status: str, gpa: float) -> List[str]:
         recs = []
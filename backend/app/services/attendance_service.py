@@ -0,0 +1,204 @@
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.upsert import dialect_insert
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student_attendance import ClassSession, StudentAttendance
+from app.schemas.student_attendance import ClassSessionCreate, RollCall
+from app.utils.attendance import set_session_bit, count_present, attendance_rate
+
+class StudentAttendanceService:
+    SESSION_INDEX_RETRIES = 3
+
+    @staticmethod
+    async def create_session(db: AsyncSession, session_in: ClassSessionCreate):
+        """
+        Open the next roll-call session for a course in a term. The course row is
+        locked while the next index is taken; where the database has no row locks,
+        a concurrent insert of the same index is retried with the next one.
+        """
+        for attempt in range(StudentAttendanceService.SESSION_INDEX_RETRIES):
+            course = await db.execute(select(Course.id).where(Course.id == session_in.course_id).with_for_update())
+            if course.first() is None:
+                return {"error": "Course not found"}
+            result = await db.execute(
+                select(func.max(ClassSession.session_index)).where(
+                    ClassSession.course_id == session_in.course_id,
+                    ClassSession.term == session_in.term
+                )
+            )
+            last_index = result.scalar()
+            session = ClassSession(
+                **session_in.model_dump(exclude_none=True),
+                session_index=0 if last_index is None else last_index + 1
+            )
+            db.add(session)
+            try:
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                if attempt == StudentAttendanceService.SESSION_INDEX_RETRIES - 1:
+                    raise
+                continue
+            await db.refresh(session)
+            return session
+
+    @staticmethod
+    async def submit_roll_calls(db: AsyncSession, roll_calls: List[RollCall]) -> Dict[str, Any]:
+        """
+        Record one or more session roll calls in a single transaction. Every student
+        must be enrolled in the session's course and term. Missing (student, course,
+        term) bitmaps are created with an insert that skips existing rows, then the
+        rows are locked in id order, patched for every session in the batch and
+        written back with one bulk update, so concurrent roll calls cannot drop bits.
+        """
+        session_ids = {rc.session_id for rc in roll_calls}
+        result = await db.execute(select(ClassSession).where(ClassSession.id.in_(session_ids)))
+        sessions = {s.id: s for s in result.scalars().all()}
+        missing = session_ids - sessions.keys()
+        if missing:
+            return {"error": f"Class session(s) not found: {sorted(missing)}"}
+
+        # (course_id, term) -> student_id -> [(session_index, present)]
+        marks: Dict[Tuple[int, str], Dict[int, List[Tuple[int, bool]]]] = {}
+        present_count = absent_count = 0
+        for rc in roll_calls:
+            session = sessions[rc.session_id]
+            group = marks.setdefault((session.course_id, session.term), {})
+            for entry in rc.entries:
+                group.setdefault(entry.student_id, []).append((session.session_index, entry.present))
+                if entry.present:
+                    present_count += 1
+                else:
+                    absent_count += 1
+
+        for (course_id, term), students in marks.items():
+            result = await db.execute(
+                select(Enrollment.student_id).where(
+                    Enrollment.course_id == course_id,
+                    Enrollment.term == term,
+                    Enrollment.status != "dropped",
+                    Enrollment.student_id.in_(students.keys())
+                )
+            )
+            not_enrolled = students.keys() - set(result.scalars().all())
+            if not_enrolled:
+                return {"error": f"Student(s) not enrolled in course {course_id} for {term}: {sorted(not_enrolled)}"}
+
+        # Groups and rows are always taken in the same order, so batches cannot deadlock
+        changed_rows: List[Dict[str, Any]] = []
+        for (course_id, term), students in sorted(marks.items()):
+            if not students:
+                continue
+            await db.execute(
+                dialect_insert(db, StudentAttendance)
+                .values([
+                    {"student_id": student_id, "course_id": course_id, "term": term, "present_bitmap": b""}
+                    for student_id in sorted(students)
+                ])
+                .on_conflict_do_nothing(index_elements=["student_id", "course_id", "term"])
+            )
+            result = await db.execute(
+                select(StudentAttendance.id, StudentAttendance.student_id, StudentAttendance.present_bitmap)
+                .where(
+                    StudentAttendance.course_id == course_id,
+                    StudentAttendance.term == term,
+                    StudentAttendance.student_id.in_(students.keys())
+                )
+                .order_by(StudentAttendance.id)
+                .with_for_update()
+            )
+            for row in result.all():
+                bitmap = row.present_bitmap
+                for session_index, present in students[row.student_id]:
+                    bitmap = set_session_bit(bitmap, session_index, present)
+                changed_rows.append({"id": row.id, "present_bitmap": bitmap})
+
+        if changed_rows:
+            await db.execute(update(StudentAttendance), changed_rows)
+        await db.commit()
+
+        return {
+            "sessions": len(session_ids),
+            "marked_present": present_count,
+            "marked_absent": absent_count,
+            "student_ids": sorted({sid for students in marks.values() for sid in students}),
+        }
+
+    @staticmethod
+    async def sessions_held(db: AsyncSession, course_ids: Optional[List[int]] = None) -> Dict[Tuple[int, str], int]:
+        """Number of sessions held per (course, term)."""
+        stmt = select(ClassSession.course_id, ClassSession.term, func.count(ClassSession.id)).group_by(
+            ClassSession.course_id, ClassSession.term
+        )
+        if course_ids is not None:
+            stmt = stmt.where(ClassSession.course_id.in_(course_ids))
+        return {(cid, term): count for cid, term, count in (await db.execute(stmt)).all()}
+
+    @staticmethod
+    async def summaries(
+        db: AsyncSession,
+        *,
+        student_id: Optional[int] = None,
+        course_id: Optional[int] = None,
+        term: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Per (student, course, term) attendance, computed from bitmap popcounts."""
+        stmt = select(
+            StudentAttendance.student_id,
+            StudentAttendance.course_id,
+            StudentAttendance.term,
+            StudentAttendance.present_bitmap
+        )
+        if student_id is not None:
+            stmt = stmt.where(StudentAttendance.student_id == student_id)
+        if course_id is not None:
+            stmt = stmt.where(StudentAttendance.course_id == course_id)
+        if term is not None:
+            stmt = stmt.where(StudentAttendance.term == term)
+        rows = (await db.execute(stmt.order_by(StudentAttendance.course_id, StudentAttendance.student_id))).all()
+        if not rows:
+            return []
+
+        held = await StudentAttendanceService.sessions_held(db, sorted({r.course_id for r in rows}))
+        return [
+            {
+                "student_id": r.student_id,
+                "course_id": r.course_id,
+                "term": r.term,
+                "sessions_attended": count_present(r.present_bitmap),
+                "sessions_held": held.get((r.course_id, r.term), 0),
+                "attendance_rate": attendance_rate(r.present_bitmap, held.get((r.course_id, r.term), 0)),
+            }
+            for r in rows
+        ]
+
+    @staticmethod
+    async def attendance_rates(db: AsyncSession, student_ids: Optional[List[int]] = None) -> Dict[int, float]:
+        """Overall attendance rate per student across all courses with roll calls."""
+        stmt = select(
+            StudentAttendance.student_id,
+            StudentAttendance.course_id,
+            StudentAttendance.term,
+            StudentAttendance.present_bitmap
+        )
+        if student_ids is not None:
+            stmt = stmt.where(StudentAttendance.student_id.in_(student_ids))
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return {}
+
+        held = await StudentAttendanceService.sessions_held(db)
+        attended: Dict[int, int] = {}
+        possible: Dict[int, int] = {}
+        for r in rows:
+            sessions = held.get((r.course_id, r.term), 0)
+            if not sessions:
+                continue
+            attended[r.student_id] = attended.get(r.student_id, 0) + min(count_present(r.present_bitmap), sessions)
+            possible[r.student_id] = possible.get(r.student_id, 0) + sessions
+        return {sid: attended[sid] / possible[sid] for sid in possible}
+
+student_attendance_service = StudentAttendanceService()
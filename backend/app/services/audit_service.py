@@ -12,8 +12,10 @@ class AuditService:
         target_table: str,
         target_id: Optional[int] = None,
         changes: Optional[Dict[str, Any]] = None,
-        ip_address: Optional[str] = None
+        ip_address: Optional[str] = None,
+        commit: bool = True
     ) -> AuditLog:
+        """Record an action. With commit=False it only flushes, joining the caller's transaction."""
         obj = AuditLog(
             user_id=user_id,
             action=action,
@@ -23,6 +25,9 @@ class AuditService:
             ip_address=ip_address
         )
         db.add(obj)
+        if not commit:
+            await db.flush()
+            return obj
         await db.commit()
         await db.refresh(obj)
         return obj
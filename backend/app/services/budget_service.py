@@ -0,0 +1,185 @@
+import calendar
+import re
+from typing import Any, Dict, List, Optional, Set, Union
+from datetime import date, datetime
+from sqlalchemy import select, update, func, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.budget import Budget
+from app.models.expense import ExpenseApproval
+from app.models.finance_ext import Vendor
+from app.schemas.budget import BudgetCreate
+
+PERIOD_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+APPROVED_STATUSES = ("approved", "disbursed")
+
+def scope_key(category: Optional[str], vendor_id: Optional[int]) -> str:
+    return f"{category or '*'}|{vendor_id or '*'}"
+
+def period_of(moment: datetime) -> str:
+    return moment.strftime("%Y-%m")
+
+def period_bounds(period: str):
+    """First day of the period and of the one after it."""
+    year, month = int(period[:4]), int(period[5:])
+    return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+
+class BudgetService:
+    @staticmethod
+    def _scopes(category: Optional[str], vendor_id: Optional[int]) -> List[str]:
+        """Every budget scope an expense counts against: its category and vendor, either, and the overall budget."""
+        return list(dict.fromkeys([
+            scope_key(category, vendor_id), scope_key(category, None),
+            scope_key(None, vendor_id), scope_key(None, None)
+        ]))
+
+    @staticmethod
+    async def apply_expenses(db: AsyncSession, expenses: List[Any], approved_at: datetime, sign: int = 1) -> Set[int]:
+        """
+        Add approved expenses (anything with id, category, vendor_id and amount) to
+        the actuals of the budgets they fall under: at most four per expense, summed
+        per budget and applied with one UPDATE ... RETURNING on the unique
+        (scope_key, period) key. Returns the ids of expenses that have a budget now
+        over its amount. sign=-1 takes them back out. Does not commit.
+        """
+        scopes = {expense.id: BudgetService._scopes(expense.category, expense.vendor_id) for expense in expenses}
+        amounts: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        for expense in expenses:
+            for key in scopes[expense.id]:
+                amounts[key] = round(amounts.get(key, 0.0) + sign * expense.amount, 2)
+                counts[key] = counts.get(key, 0) + sign
+        if not amounts:
+            return set()
+        result = await db.execute(
+            update(Budget)
+            .where(Budget.period == period_of(approved_at), Budget.scope_key.in_(amounts))
+            .values(
+                actual=Budget.actual + case(amounts, value=Budget.scope_key, else_=0.0),
+                expense_count=Budget.expense_count + case(counts, value=Budget.scope_key, else_=0)
+            )
+            .returning(Budget.scope_key, Budget.amount, Budget.actual)
+            .execution_options(synchronize_session=False)
+        )
+        over = {key for key, amount, actual in result.all() if round(actual - amount, 2) > 0}
+        if sign < 0 or not over:
+            return set()
+        return {expense_id for expense_id, keys in scopes.items() if over.intersection(keys)}
+
+    @staticmethod
+    async def apply_expense(db: AsyncSession, expense: ExpenseApproval, approved_at: datetime, sign: int = 1) -> bool:
+        """Single-expense apply_expenses; returns whether it left any of its budgets over. Does not commit."""
+        return bool(await BudgetService.apply_expenses(db, [expense], approved_at, sign))
+
+    @staticmethod
+    async def create_budget(db: AsyncSession, obj_in: BudgetCreate):
+        """
+        Create a budget, seeding its actuals from expenses already approved in the
+        period. From then on approvals keep it current.
+        """
+        if not PERIOD_PATTERN.match(obj_in.period):
+            return {"error": "Period must be in YYYY-MM format"}
+        if obj_in.amount <= 0:
+            return {"error": "Budget amount must be positive"}
+        if obj_in.vendor_id is not None and not await db.get(Vendor, obj_in.vendor_id):
+            return {"error": "Vendor not found"}
+
+        start, end = period_bounds(obj_in.period)
+        stmt = select(func.coalesce(func.sum(ExpenseApproval.amount), 0.0), func.count(ExpenseApproval.id)).where(
+            ExpenseApproval.status.in_(APPROVED_STATUSES),
+            ExpenseApproval.approved_at >= start,
+            ExpenseApproval.approved_at < end
+        )
+        if obj_in.category is not None:
+            stmt = stmt.where(ExpenseApproval.category == obj_in.category)
+        if obj_in.vendor_id is not None:
+            stmt = stmt.where(ExpenseApproval.vendor_id == obj_in.vendor_id)
+        actual, count = (await db.execute(stmt)).one()
+
+        budget = Budget(
+            **obj_in.model_dump(),
+            scope_key=scope_key(obj_in.category, obj_in.vendor_id),
+            actual=actual,
+            expense_count=count
+        )
+        db.add(budget)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return {"error": "A budget for this category, vendor and period already exists"}
+        await db.refresh(budget)
+        return budget
+
+    @staticmethod
+    async def update_amount(db: AsyncSession, budget_id: int, amount: float):
+        budget = await db.get(Budget, budget_id)
+        if not budget:
+            return {"error": "Budget not found"}
+        if amount <= 0:
+            return {"error": "Budget amount must be positive"}
+        budget.amount = amount
+        await db.commit()
+        await db.refresh(budget)
+        return budget
+
+    @staticmethod
+    def _utilization(budget: Budget) -> Dict[str, Any]:
+        row = {column: getattr(budget, column) for column in Budget.__table__.columns.keys()}
+        row["remaining"] = round(budget.amount - budget.actual, 2)
+        row["utilization"] = round(budget.actual / budget.amount, 4) if budget.amount else 0.0
+        return row
+
+    @staticmethod
+    async def get_utilization(
+        db: AsyncSession,
+        *,
+        period: str,
+        category: Optional[str] = None,
+        vendor_id: Optional[int] = None,
+        over_only: bool = False
+    ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
+        """Budgets of a period with spent, remaining and utilization, most used first."""
+        if not PERIOD_PATTERN.match(period):
+            return {"error": "Period must be in YYYY-MM format"}
+        stmt = select(Budget).where(Budget.period == period)
+        if category is not None:
+            stmt = stmt.where(Budget.category == category)
+        if vendor_id is not None:
+            stmt = stmt.where(Budget.vendor_id == vendor_id)
+        if over_only:
+            stmt = stmt.where(Budget.actual > Budget.amount)
+        budgets = (await db.execute(stmt)).scalars().all()
+        return sorted((BudgetService._utilization(b) for b in budgets), key=lambda r: -r["utilization"])
+
+    @staticmethod
+    async def get_burn_rate(
+        db: AsyncSession, *, period: str, as_of: Optional[date] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Daily spend so far for each budget of a period, the month-end spend it projects
+        to and how many days the remaining amount lasts at that rate.
+        """
+        if not PERIOD_PATTERN.match(period):
+            return {"error": "Period must be in YYYY-MM format"}
+        start, _ = period_bounds(period)
+        as_of = as_of or date.today()
+        total_days = calendar.monthrange(start.year, start.month)[1]
+        elapsed = max(0, min((as_of - start).days + 1, total_days))
+        rows = []
+        for row in await BudgetService.get_utilization(db, period=period):
+            daily = row["actual"] / elapsed if elapsed else 0.0
+            rows.append({
+                **row,
+                "days_elapsed": elapsed,
+                "days_in_period": total_days,
+                "daily_burn": round(daily, 2),
+                "projected": round(daily * total_days, 2),
+                "projected_over": daily * total_days > row["amount"],
+                "days_until_exhausted": (
+                    round(max(row["remaining"], 0.0) / daily, 1) if daily > 0 else None
+                ),
+            })
+        return rows
+
+budget_service = BudgetService()
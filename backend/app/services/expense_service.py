@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.expense import ExpenseApproval
+from app.schemas.expense import ExpenseBulkAction
+from app.services.audit_service import audit_service
+from app.services.budget_service import budget_service
+from app.services.ledger_service import ledger_service
+
+class ExpenseService:
+    @staticmethod
+    def _pending(selection: ExpenseBulkAction):
+        """Pending expenses matching the ids and filters of a bulk action, or None if nothing narrows it."""
+        conditions = []
+        if selection.ids is not None:
+            conditions.append(ExpenseApproval.id.in_(selection.ids))
+        if selection.category is not None:
+            conditions.append(ExpenseApproval.category == selection.category)
+        if selection.vendor_id is not None:
+            conditions.append(ExpenseApproval.vendor_id == selection.vendor_id)
+        if selection.submitted_before is not None:
+            conditions.append(ExpenseApproval.submitted_at < selection.submitted_before)
+        if not conditions:
+            return None
+        return update(ExpenseApproval).where(ExpenseApproval.status == "pending", *conditions)
+
+    @staticmethod
+    async def bulk_approve(db: AsyncSession, selection: ExpenseBulkAction, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Approve every pending expense in the selection with one UPDATE ... RETURNING,
+        then post their journal entries and budget actuals in bulk and write one audit
+        entry, all in one transaction. Expenses that are no longer pending are left alone.
+        """
+        stmt = ExpenseService._pending(selection)
+        if stmt is None:
+            return {"error": "Give expense ids or at least one filter"}
+        approved_at = datetime.now()
+        result = await db.execute(
+            stmt.values(status="approved", approved_at=approved_at)
+            .returning(ExpenseApproval.id, ExpenseApproval.category, ExpenseApproval.vendor_id, ExpenseApproval.amount)
+            .execution_options(synchronize_session=False)
+        )
+        approved = result.all()
+        over_budget: List[int] = []
+        if approved:
+            await ledger_service.post_expenses(db, approved)
+            over_budget = sorted(await budget_service.apply_expenses(db, approved, approved_at))
+            if over_budget:
+                await db.execute(
+                    update(ExpenseApproval)
+                    .where(ExpenseApproval.id.in_(over_budget))
+                    .values(over_budget=True)
+                    .execution_options(synchronize_session=False)
+                )
+        ids = [row.id for row in approved]
+        total = round(sum(row.amount for row in approved), 2)
+        await audit_service.log_action(
+            db,
+            user_id=user_id,
+            action="BULK_APPROVE",
+            target_table="expenseapproval",
+            changes={"ids": ids, "total": total, "over_budget": over_budget, "filters": selection.model_dump(mode="json", exclude_none=True)},
+            commit=False
+        )
+        await db.commit()
+        return {"approved": len(ids), "total": total, "ids": ids, "over_budget": over_budget}
+
+    @staticmethod
+    async def bulk_reject(db: AsyncSession, selection: ExpenseBulkAction, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """Reject every pending expense in the selection with one UPDATE ... RETURNING and one audit entry."""
+        stmt = ExpenseService._pending(selection)
+        if stmt is None:
+            return {"error": "Give expense ids or at least one filter"}
+        result = await db.execute(
+            stmt.values(status="rejected")
+            .returning(ExpenseApproval.id, ExpenseApproval.amount)
+            .execution_options(synchronize_session=False)
+        )
+        rejected = result.all()
+        ids = [row.id for row in rejected]
+        total = round(sum(row.amount for row in rejected), 2)
+        await audit_service.log_action(
+            db,
+            user_id=user_id,
+            action="BULK_REJECT",
+            target_table="expenseapproval",
+            changes={"ids": ids, "total": total, "filters": selection.model_dump(mode="json", exclude_none=True)},
+            commit=False
+        )
+        await db.commit()
+        return {"rejected": len(ids), "total": total, "ids": ids}
+
+expense_service = ExpenseService()
@@ -1,4 +1,4 @@
-from typing import List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models.student import Student
@@ -6,117 +6,509 @@ from app.models.fee_structure import FeeStructure
 from app.models.tuition_invoice import TuitionInvoice
 from app.models.transaction import Transaction
 from app.models.finance_ext import TuitionInstallment
-from app.models.marketing import Lead
-from app.schemas.tuition_invoice import TuitionInvoiceCreate
+from app.models.late_fee import LateFeeCharge
+from app.models.payment import Payment
 from app.crud.crud_tuition_invoice import tuition_invoice as crud_invoice
 from app.crud.crud_transaction import transaction as crud_transaction
 from app.crud.crud_finance_ext import installment as crud_installment
+from app.schemas.tuition_invoice import TuitionInvoiceCreate, TuitionInvoiceUpdate
+from app.schemas.payment import PaymentCreate
+from app.services.ledger_service import ledger_service
+from app.services.scholarship_service import scholarship_service
+from app.services.marketing_service import marketing_service
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, insert, update, literal, exists, case, cast, Numeric
+from sqlalchemy.exc import IntegrityError
+from app.utils.aging import bucket_bounds, billing_month
+from app.utils.installments import allocate, due_dates, split_amount
 
 class FinanceService:
     @staticmethod
-    async def generate_invoices_for_program(db: AsyncSession, program_id: int):
-        result = await db.execute(select(FeeStructure).where(FeeStructure.program_id == program_id))
-        fee = result.scalars().first()
-        if not fee:
-            return {"error": "No fee structure found for this program"}
-            
-        result = await db.execute(select(Student).where(Student.program_id == program_id))
-        students = result.scalars().all()
-        
-        count = 0
-        for student in students:
-            existing = await db.execute(select(TuitionInvoice).where(
-                TuitionInvoice.student_id == student.id,
-                TuitionInvoice.fee_structure_id == fee.id,
-                TuitionInvoice.status == "unpaid"
-            ))
-            if existing.scalars().first():
-                continue
-                
-            obj_in = TuitionInvoiceCreate(
-                student_id=student.id,
-                fee_structure_id=fee.id,
-                amount_due=fee.amount,
-                due_date=datetime.now() + timedelta(days=30)
+    def _billable_students(program_ids: Optional[List[int]], billing_period: str):
+        """
+        Students on a program with a fee structure who have no invoice yet for
+        that fee structure and billing period.
+        """
+        already_billed = exists().where(
+            TuitionInvoice.student_id == Student.id,
+            TuitionInvoice.fee_structure_id == FeeStructure.id,
+            TuitionInvoice.billing_period == billing_period
+        )
+        stmt = (
+            select(Student.id.label("student_id"), FeeStructure.id.label("fee_structure_id"), FeeStructure.program_id, FeeStructure.amount)
+            .join(FeeStructure, FeeStructure.program_id == Student.program_id)
+            .where(~already_billed)
+        )
+        if program_ids is not None:
+            stmt = stmt.where(Student.program_id.in_(program_ids))
+        return stmt
+
+    @staticmethod
+    async def generate_invoices(
+        db: AsyncSession,
+        *,
+        billing_period: str,
+        program_ids: Optional[List[int]] = None,
+        due_in_days: int = 30,
+        dry_run: bool = False,
+        apply_scholarships: bool = True
+    ):
+        """
+        Bill every student of the given programs (all programs when None) for a
+        period with one INSERT ... SELECT. Students already invoiced for the period
+        are skipped, so reruns are safe; the unique constraint backs this up.
+        Unallocated scholarships of those programs are then netted against the
+        invoices in the same transaction.
+        """
+        billable = FinanceService._billable_students(program_ids, billing_period).subquery()
+        counts = (await db.execute(
+            select(billable.c.program_id, func.count(), func.sum(billable.c.amount)).group_by(billable.c.program_id)
+        )).all()
+        by_program = {program_id: count for program_id, count, _ in counts}
+        total = sum(by_program.values())
+        if dry_run:
+            return {"billing_period": billing_period, "dry_run": True, "would_generate": total, "by_program": by_program}
+        if not total:
+            return {"message": "Generated 0 invoices", "billing_period": billing_period, "generated": 0, "by_program": {}}
+
+        due_date = datetime.now() + timedelta(days=due_in_days)
+        source = select(
+            billable.c.student_id,
+            billable.c.fee_structure_id,
+            billable.c.amount,
+            literal(0.0),
+            literal(0.0),
+            literal("unpaid"),
+            literal(due_date, TuitionInvoice.due_date.type),
+            literal(billing_period)
+        )
+        stmt = insert(TuitionInvoice).from_select(
+            ["student_id", "fee_structure_id", "amount_due", "amount_paid", "late_fee_accumulated", "status", "due_date", "billing_period"],
+            source
+        )
+        try:
+            result = await db.execute(stmt)
+            await ledger_service.post_invoice_batch(
+                db, billing_period, total=sum(amount for _, _, amount in counts), count=result.rowcount
             )
-            await crud_invoice.create(db, obj_in=obj_in)
-            count += 1
-            
-        return {"message": f"Generated {count} invoices"}
+            netted = await scholarship_service.net_scholarships(db, program_ids) if apply_scholarships else None
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return {"error": f"Invoices for {billing_period} are already being generated; retry to bill the remainder"}
+
+        return {
+            "message": f"Generated {result.rowcount} invoices",
+            "billing_period": billing_period,
+            "generated": result.rowcount,
+            "by_program": by_program,
+            "scholarships": netted
+        }
 
     @staticmethod
-    async def record_payment(db: AsyncSession, invoice_id: int, amount: float):
-        invoice = await crud_invoice.get(db, id=invoice_id)
-        if not invoice:
-            return {"error": "Invoice not found"}
-            
-        invoice.amount_paid += amount
-        if invoice.amount_paid >= (invoice.amount_due + invoice.late_fee_accumulated):
-            invoice.status = "paid"
-        elif invoice.amount_paid > 0:
-            invoice.status = "partial"
-            
-        from app.schemas.transaction import TransactionCreate
-        transaction_data = TransactionCreate(
-            description=f"Tuition Payment - Invoice #{invoice.id}",
-            amount=amount,
-            type="income",
-            category="tuition"
+    async def generate_invoices_for_program(db: AsyncSession, program_id: int, billing_period: str, dry_run: bool = False):
+        result = await db.execute(select(FeeStructure.id).where(FeeStructure.program_id == program_id))
+        if not result.first():
+            return {"error": "No fee structure found for this program"}
+        return await FinanceService.generate_invoices(
+            db, billing_period=billing_period, program_ids=[program_id], dry_run=dry_run
         )
-        await crud_transaction.create(db, obj_in=transaction_data)
-        
+
+    @staticmethod
+    async def create_invoice(db: AsyncSession, invoice_in: TuitionInvoiceCreate) -> TuitionInvoice:
+        invoice = TuitionInvoice(**invoice_in.model_dump(exclude_none=True))
+        db.add(invoice)
+        await db.flush()
+        await ledger_service.post_invoice(db, invoice)
         await db.commit()
         await db.refresh(invoice)
         return invoice
 
     @staticmethod
-    async def apply_late_fees(db: AsyncSession):
-        """Apply a 5% late fee to all overdue unpaid invoices."""
+    async def update_invoice(db: AsyncSession, invoice: TuitionInvoice, invoice_in: TuitionInvoiceUpdate):
+        """
+        Edit an invoice. It was posted to the journal when billed, so a new amount
+        due posts the difference; amount_paid only moves through payments, and the
+        amount of an invoice split into installments is fixed.
+        """
+        update_data = invoice_in.model_dump(exclude_unset=True)
+        amount_paid = update_data.pop("amount_paid", None)
+        if amount_paid is not None and round(amount_paid - (invoice.amount_paid or 0.0), 2):
+            return {"error": "Amount paid changes only through payments"}
+        if update_data.get("amount_due") is None:
+            update_data.pop("amount_due", None)
+        delta = round(update_data.get("amount_due", invoice.amount_due) - invoice.amount_due, 2)
+        if delta:
+            if update_data["amount_due"] <= 0:
+                return {"error": "Amount due must be positive"}
+            has_plan = await db.execute(select(TuitionInstallment.id).where(TuitionInstallment.invoice_id == invoice.id).limit(1))
+            if has_plan.first():
+                return {"error": "Invoice has an installment plan; its amount cannot change"}
+            await ledger_service.post_invoice_adjustment(db, invoice.id, delta)
+        return await crud_invoice.update(db, db_obj=invoice, obj_in=update_data)
+
+    PAYMENT_CHUNK = 500
+
+    @staticmethod
+    async def _apply_payment_totals(db: AsyncSession, totals: Dict[int, float]) -> Dict[int, Tuple[float, str]]:
+        """
+        Add each invoice's payment total with one conditional UPDATE ... RETURNING per
+        chunk. amount_paid and status are computed in SQL from the row's current values,
+        so concurrent payments cannot overwrite each other. Invoices already paid in
+        full are left alone and missing from the result.
+        """
+        applied: Dict[int, Tuple[float, str]] = {}
+        invoice_ids = list(totals)
+        for start in range(0, len(invoice_ids), FinanceService.PAYMENT_CHUNK):
+            chunk = {invoice_id: totals[invoice_id] for invoice_id in invoice_ids[start:start + FinanceService.PAYMENT_CHUNK]}
+            amount_paid = func.coalesce(TuitionInvoice.amount_paid, 0.0) + case(chunk, value=TuitionInvoice.id, else_=0.0)
+            owed = (
+                TuitionInvoice.amount_due
+                + func.coalesce(TuitionInvoice.late_fee_accumulated, 0.0)
+                - func.coalesce(TuitionInvoice.scholarship_credit, 0.0)
+            )
+            result = await db.execute(
+                update(TuitionInvoice)
+                .where(TuitionInvoice.id.in_(chunk), TuitionInvoice.status != "paid")
+                .values(
+                    amount_paid=amount_paid,
+                    status=case((amount_paid >= owed, "paid"), (amount_paid > 0, "partial"), else_=TuitionInvoice.status)
+                )
+                .returning(TuitionInvoice.id, TuitionInvoice.amount_paid, TuitionInvoice.status)
+                .execution_options(synchronize_session=False)
+            )
+            applied.update({invoice_id: (paid, status) for invoice_id, paid, status in result.all()})
+        return applied
+
+    @staticmethod
+    async def _record_payments(db: AsyncSession, payments: List[PaymentCreate]) -> Dict[str, Any]:
+        keys = {p.idempotency_key for p in payments if p.idempotency_key}
+        existing: Dict[str, Payment] = {}
+        if keys:
+            result = await db.execute(select(Payment).where(Payment.idempotency_key.in_(keys)))
+            existing = {p.idempotency_key: p for p in result.scalars().all()}
+
+        results: List[Optional[Payment]] = [None] * len(payments)
+        errors: List[Dict[str, Any]] = []
+        fresh: List[int] = []
+        first_with_key: Dict[str, int] = {}
+        repeats: List[Tuple[int, int]] = []
+        for i, p in enumerate(payments):
+            if p.amount <= 0:
+                errors.append({"index": i, "invoice_id": p.invoice_id, "error": "Payment amount must be positive"})
+                continue
+            if p.idempotency_key:
+                prior = existing.get(p.idempotency_key)
+                if prior is None and p.idempotency_key in first_with_key:
+                    prior = payments[first_with_key[p.idempotency_key]]
+                if prior is not None and (prior.invoice_id, prior.amount) != (p.invoice_id, p.amount):
+                    errors.append({"index": i, "invoice_id": p.invoice_id, "error": "Idempotency key was already used for a different payment"})
+                    continue
+                if p.idempotency_key in existing:
+                    results[i] = existing[p.idempotency_key]
+                    continue
+                if p.idempotency_key in first_with_key:
+                    repeats.append((i, first_with_key[p.idempotency_key]))
+                    continue
+                first_with_key[p.idempotency_key] = i
+            fresh.append(i)
+
+        totals: Dict[int, float] = {}
+        for i in fresh:
+            totals[payments[i].invoice_id] = totals.get(payments[i].invoice_id, 0.0) + payments[i].amount
+        applied = await FinanceService._apply_payment_totals(db, totals) if totals else {}
+        if applied:
+            await crud_installment.allocate(db, {invoice_id: totals[invoice_id] for invoice_id in applied})
+
+        not_applied = set(totals) - set(applied)
+        if not_applied:
+            result = await db.execute(select(TuitionInvoice.id).where(TuitionInvoice.id.in_(not_applied)))
+            paid_in_full = set(result.scalars().all())
+            for i in fresh:
+                invoice_id = payments[i].invoice_id
+                if invoice_id in not_applied:
+                    errors.append({
+                        "index": i,
+                        "invoice_id": invoice_id,
+                        "error": "Invoice is already paid" if invoice_id in paid_in_full else "Invoice not found"
+                    })
+            fresh = [i for i in fresh if payments[i].invoice_id in applied]
+
+        if fresh:
+            inserted = await db.scalars(
+                insert(Payment).returning(Payment, sort_by_parameter_order=True).execution_options(render_nulls=True),
+                [
+                    {
+                        "invoice_id": payments[i].invoice_id,
+                        "amount": payments[i].amount,
+                        "idempotency_key": payments[i].idempotency_key,
+                        "invoice_amount_paid": applied[payments[i].invoice_id][0],
+                        "invoice_status": applied[payments[i].invoice_id][1],
+                    }
+                    for i in fresh
+                ]
+            )
+            for i, payment in zip(fresh, inserted.all()):
+                results[i] = payment
+            await crud_transaction.create_many(db, [
+                {
+                    "description": f"Tuition Payment - Invoice #{results[i].invoice_id}",
+                    "amount": results[i].amount,
+                    "type": "income",
+                    "category": "tuition",
+                }
+                for i in fresh
+            ])
+            await ledger_service.post_payments(db, [(results[i].id, results[i].invoice_id, results[i].amount) for i in fresh])
+            await marketing_service.record_revenue(db, {invoice_id: totals[invoice_id] for invoice_id in applied})
+            await db.commit()
+
+        for i, first in repeats:
+            results[i] = results[first]
+        return {
+            "applied": len(fresh),
+            "replayed": sum(1 for r in results if r is not None) - len(fresh),
+            "rejected": len(errors),
+            "errors": sorted(errors, key=lambda e: e["index"]),
+            "payments": results
+        }
+
+    @staticmethod
+    async def record_payments(db: AsyncSession, payments: List[PaymentCreate]) -> Dict[str, Any]:
+        """
+        Apply a batch of payments in one transaction. Payments whose idempotency key
+        was seen before return the stored payment instead of being applied again;
+        invalid payments are reported per index and do not block the rest.
+        """
+        try:
+            return await FinanceService._record_payments(db, payments)
+        except IntegrityError:
+            # Another request committed one of these idempotency keys first. Everything
+            # here was rolled back, and a rerun replays that key instead of applying it.
+            await db.rollback()
+            return await FinanceService._record_payments(db, payments)
+
+    @staticmethod
+    async def record_payment(db: AsyncSession, invoice_id: int, amount: float, idempotency_key: Optional[str] = None):
+        result = await FinanceService.record_payments(
+            db, [PaymentCreate(invoice_id=invoice_id, amount=amount, idempotency_key=idempotency_key)]
+        )
+        if result["errors"]:
+            return {"error": result["errors"][0]["error"]}
+        return result["payments"][0]
+
+    LATE_FEE_RATE = 0.05
+
+    @staticmethod
+    async def apply_late_fees(db: AsyncSession, as_of: Optional[datetime] = None):
+        """
+        Charge a 5% late fee for the current month on every overdue installment,
+        and on overdue invoices that have no installment plan. Charges are rows in
+        the LateFeeCharge ledger keyed by period, so rerunning within the same month
+        adds nothing; late_fee_accumulated is re-derived from the ledger. The charges
+        made by a run are posted to the journal as one entry in the same transaction.
+        Everything runs as set-based statements, one INSERT ... SELECT per aging bucket.
+        """
+        as_of = as_of or datetime.now()
+        period = billing_month(as_of)
+        rate = FinanceService.LATE_FEE_RATE
+
+        # Part of the late-fee transaction: nothing is marked overdue if charging fails
+        marked_overdue = await FinanceService.sweep_overdue_installments(db, as_of, commit=False)
+
+        has_installments = exists().where(TuitionInstallment.invoice_id == TuitionInvoice.id)
+        invoice_charged = exists().where(
+            LateFeeCharge.invoice_id == TuitionInvoice.id,
+            LateFeeCharge.installment_id.is_(None),
+            LateFeeCharge.period == period
+        )
+        installment_charged = exists().where(
+            LateFeeCharge.installment_id == TuitionInstallment.id,
+            LateFeeCharge.period == period
+        )
+        columns = ["invoice_id", "installment_id", "period", "bucket", "amount"]
+
+        buckets = {}
+        fees: List[float] = []
+        for label, oldest, newest in bucket_bounds(as_of):
+            invoice_window = [TuitionInvoice.due_date < newest]
+            installment_window = [TuitionInstallment.due_date < newest]
+            if oldest is not None:
+                invoice_window.append(TuitionInvoice.due_date >= oldest)
+                installment_window.append(TuitionInstallment.due_date >= oldest)
+
+            invoices = await db.execute(insert(LateFeeCharge).from_select(columns, select(
+                TuitionInvoice.id,
+                literal(None, LateFeeCharge.installment_id.type),
+                literal(period),
+                literal(label),
+                func.round(cast(TuitionInvoice.amount_due * rate, Numeric), 2)
+            ).where(
+                TuitionInvoice.status != "paid",
+                *invoice_window,
+                ~has_installments,
+                ~invoice_charged
+            )).returning(LateFeeCharge.amount))
+            installments = await db.execute(insert(LateFeeCharge).from_select(columns, select(
+                TuitionInstallment.invoice_id,
+                TuitionInstallment.id,
+                literal(period),
+                literal(label),
+                func.round(cast(TuitionInstallment.amount * rate, Numeric), 2)
+            ).join(TuitionInvoice, TuitionInvoice.id == TuitionInstallment.invoice_id).where(
+                TuitionInstallment.status != "paid",
+                TuitionInvoice.status != "paid",
+                *installment_window,
+                ~installment_charged
+            )).returning(LateFeeCharge.amount))
+            invoice_fees = invoices.scalars().all()
+            installment_fees = installments.scalars().all()
+            buckets[label] = {"invoices": len(invoice_fees), "installments": len(installment_fees)}
+            fees.extend(invoice_fees)
+            fees.extend(installment_fees)
+
+        ledger_total = (
+            select(func.coalesce(func.sum(LateFeeCharge.amount), 0.0))
+            .where(LateFeeCharge.invoice_id == TuitionInvoice.id)
+            .scalar_subquery()
+        )
+        charged_this_period = select(LateFeeCharge.invoice_id).where(LateFeeCharge.period == period)
+        await db.execute(
+            update(TuitionInvoice)
+            .where(TuitionInvoice.id.in_(charged_this_period))
+            .values(late_fee_accumulated=ledger_total)
+        )
+        # Fees are owed on top of the invoices, so they go to the receivable with the charges
+        if fees:
+            await ledger_service.post_late_fee_batch(db, period, round(sum(fees), 2), len(fees))
+        await db.commit()
+
+        charged = len(fees)
+        return {
+            "period": period,
+            "affected": charged,
+            "installments_marked_overdue": marked_overdue,
+            "buckets": buckets
+        }
+
+    INSTALLMENT_CHUNK = 1000
+    OVERDUE_SWEEP_BATCH = 5000
+
+    @staticmethod
+    async def create_installment_plans(
+        db: AsyncSession,
+        invoice_ids: List[int],
+        num_installments: int,
+        first_due: Optional[datetime] = None,
+        interval_days: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Build installment schedules for many invoices and bulk insert them. Amounts
+        are split in whole cents with the residue on the last installment, and what
+        an invoice has already been paid is allocated to its earliest installments.
+        Invoices that are paid or already have a plan are skipped.
+        """
+        if num_installments < 1:
+            return {"error": "num_installments must be at least 1"}
+        dates = due_dates(first_due or datetime.now() + timedelta(days=interval_days), num_installments, interval_days)
         now = datetime.now()
-        result = await db.execute(select(TuitionInvoice).where(
-            TuitionInvoice.status != "paid",
-            TuitionInvoice.due_date < now
-        ))
-        overdue_invoices = result.scalars().all()
-        
-        for invoice in overdue_invoices:
-            penalty = invoice.amount_due * 0.05
-            invoice.late_fee_accumulated += penalty
-            # Only apply once per call or logic can be more complex (e.g. monthly)
-            
+        has_plan = exists().where(TuitionInstallment.invoice_id == TuitionInvoice.id)
+        skipped: Dict[str, List[int]] = {"not_found": [], "paid": [], "already_planned": []}
+        planned = 0
+        created = 0
+
+        unique_ids = list(dict.fromkeys(invoice_ids))
+        for start in range(0, len(unique_ids), FinanceService.INSTALLMENT_CHUNK):
+            chunk = unique_ids[start:start + FinanceService.INSTALLMENT_CHUNK]
+            result = await db.execute(
+                select(TuitionInvoice.id, TuitionInvoice.amount_due, TuitionInvoice.amount_paid, TuitionInvoice.status, has_plan)
+                .where(TuitionInvoice.id.in_(chunk))
+            )
+            found = {row.id: row for row in result.all()}
+            rows = []
+            for invoice_id in chunk:
+                invoice = found.get(invoice_id)
+                if invoice is None:
+                    skipped["not_found"].append(invoice_id)
+                    continue
+                if invoice.status == "paid":
+                    skipped["paid"].append(invoice_id)
+                    continue
+                if invoice[4]:
+                    skipped["already_planned"].append(invoice_id)
+                    continue
+                amounts = split_amount(invoice.amount_due, num_installments)
+                paid = {i: (amount_paid, full) for i, amount_paid, full in allocate(
+                    invoice.amount_paid or 0.0, [(i, amount, 0.0) for i, amount in enumerate(amounts)]
+                )}
+                for i, (amount, due_date) in enumerate(zip(amounts, dates)):
+                    amount_paid, full = paid.get(i, (0.0, False))
+                    rows.append({
+                        "invoice_id": invoice_id,
+                        "amount": amount,
+                        "amount_paid": amount_paid,
+                        "due_date": due_date,
+                        "status": "paid" if full else "pending",
+                        "paid_at": now if full else None,
+                    })
+                planned += 1
+            if rows:
+                await db.execute(insert(TuitionInstallment).execution_options(render_nulls=True), rows)
+                created += len(rows)
         await db.commit()
-        return {"affected": len(overdue_invoices)}
+        return {"plans_created": planned, "installments_created": created, "skipped": skipped}
 
     @staticmethod
     async def create_installment_plan(db: AsyncSession, invoice_id: int, num_installments: int):
-        invoice = await crud_invoice.get(db, id=invoice_id)
-        if not invoice:
+        result = await FinanceService.create_installment_plans(db, [invoice_id], num_installments)
+        if "error" in result:
+            return result
+        if result["skipped"]["not_found"]:
             return {"error": "Invoice not found"}
-            
-        installment_amount = invoice.amount_due / num_installments
-        for i in range(num_installments):
-            due_date = datetime.now() + timedelta(days=30 * (i + 1))
-            inst = TuitionInstallment(
-                invoice_id=invoice_id,
-                amount=installment_amount,
-                due_date=due_date,
-                status="pending"
+        if result["skipped"]["paid"]:
+            return {"error": "Invoice is already paid"}
+        if result["skipped"]["already_planned"]:
+            return {"error": "Invoice already has an installment plan"}
+        return {"message": f"Created {result['installments_created']} installments"}
+
+    @staticmethod
+    async def sweep_overdue_installments(
+        db: AsyncSession,
+        as_of: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+        commit: bool = True
+    ) -> int:
+        """
+        Mark pending installments past their due date as overdue, oldest first, in
+        batches walked off the (status, due_date) index. Each batch commits on its
+        own so a large backlog never holds locks for long; with commit=False the
+        batches stay in the caller's transaction.
+        """
+        as_of = as_of or datetime.now()
+        batch_size = batch_size or FinanceService.OVERDUE_SWEEP_BATCH
+        swept = 0
+        while True:
+            batch = (
+                select(TuitionInstallment.id)
+                .where(TuitionInstallment.status == "pending", TuitionInstallment.due_date < as_of)
+                .order_by(TuitionInstallment.due_date, TuitionInstallment.id)
+                .limit(batch_size)
             )
-            db.add(inst)
-            
-        await db.commit()
-        return {"message": f"Created {num_installments} installments"}
+            result = await db.execute(
+                update(TuitionInstallment)
+                .where(TuitionInstallment.id.in_(batch.scalar_subquery()))
+                .values(status="overdue")
+                .execution_options(synchronize_session=False)
+            )
+            if commit:
+                await db.commit()
+            swept += result.rowcount
+            if result.rowcount < batch_size:
+                return swept
 
     @staticmethod
     async def get_recruitment_funnel(db: AsyncSession):
         """Get lead counts per recruitment stage."""
-        stages = ["new", "contacted", "interested", "applicant", "admitted", "enrolled", "lost"]
-        stats = {}
-        for stage in stages:
-            res = await db.execute(select(func.count(Lead.id)).where(Lead.status == stage))
-            stats[stage] = res.scalar()
-        return stats
+        return (await marketing_service.get_funnel(db))["stages"]
 
 finance_service = FinanceService()
@@ -1,54 +1,90 @@
-from typing import List, Any
+from typing import List, Any, Dict
+from sqlalchemy import func, literal, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.db.upsert import dialect_insert
 from app.models.employee import Employee
 from app.models.payroll import Payroll
 from app.crud.crud_hr_ext import payroll as crud_payroll
+from app.services.ledger_service import ledger_service
+from app.services.payroll_service import payroll_service
 from datetime import datetime
 
+PAYROLL_COLUMNS = ["employee_id", "month", "year", "base_salary", "allowances", "deductions", "tax", "net_pay", "status"]
+
 class HRService:
     @staticmethod
-    async def generate_monthly_payroll(db: AsyncSession, month: int, year: int):
-        result = await db.execute(select(Employee).where(Employee.status == "active"))
-        employees = result.scalars().all()
-        
-        count = 0
-        for emp in employees:
-            # Check if payroll already exists
-            existing = await db.execute(select(Payroll).where(
-                Payroll.employee_id == emp.id,
-                Payroll.month == month,
-                Payroll.year == year
-            ))
-            if existing.scalars().first():
-                continue
-                
-            # Basic calculation: 10% tax (placeholder)
-            base_salary = emp.salary or 0.0
-            tax = base_salary * 0.10
-            net_pay = base_salary - tax
-            
-            p_in = {
-                "employee_id": emp.id,
-                "month": month,
-                "year": year,
-                "base_salary": base_salary,
-                "tax": tax,
-                "net_pay": net_pay,
-                "status": "pending"
-            }
-            db.add(Payroll(**p_in))
-            count += 1
-            
-        await db.commit()
-        return {"message": f"Generated payroll for {count} employees"}
+    def _payroll_rows(month: int, year: int):
+        """
+        Payroll rows, in PAYROLL_COLUMNS order, for active employees with none for the
+        period yet. Pay is gross until payroll_service calculates deductions and tax.
+        """
+        base_salary = func.coalesce(Employee.salary, 0.0)
+        allowances = func.coalesce(Employee.allowances, 0.0)
+        has_payroll = exists().where(
+            Payroll.employee_id == Employee.id, Payroll.month == month, Payroll.year == year
+        )
+        return select(
+            Employee.id,
+            literal(month),
+            literal(year),
+            base_salary,
+            allowances,
+            literal(0.0),
+            literal(0.0),
+            base_salary + allowances,
+            literal("pending")
+        ).where(Employee.status == "active", ~has_payroll)
+
+    @staticmethod
+    async def generate_monthly_payroll(db: AsyncSession, month: int, year: int, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Create the period's pending payroll rows with one INSERT ... SELECT over active
+        employees that have none yet, then calculate their pay in one pass. The unique
+        (employee, month, year) constraint and ON CONFLICT DO NOTHING keep a concurrent
+        run from paying anyone twice. A dry run only returns the totals of the rows
+        that would be created.
+        """
+        if not 1 <= month <= 12:
+            return {"error": "month must be between 1 and 12"}
+        active = (await db.execute(
+            select(func.count()).select_from(Employee).where(Employee.status == "active")
+        )).scalar()
+        if dry_run:
+            employees = HRService._payroll_rows(month, year).with_only_columns(Employee.id)
+            pay = await payroll_service.compute(db, employees, month, year)
+            created = len(pay["employee_id"])
+        else:
+            stmt = dialect_insert(db, Payroll).from_select(PAYROLL_COLUMNS, HRService._payroll_rows(month, year))
+            result = await db.execute(
+                stmt.on_conflict_do_nothing(index_elements=["employee_id", "month", "year"])
+                .returning(Payroll.id, Payroll.employee_id)
+            )
+            payroll = [tuple(row) for row in result.all()]
+            pay = await payroll_service.apply(db, payroll, [employee_id for _, employee_id in payroll], month, year)
+            await db.commit()
+            created = len(payroll)
+
+        verb = "Would generate" if dry_run else "Generated"
+        return {
+            "message": f"{verb} payroll for {created} employees",
+            "month": month,
+            "year": year,
+            "dry_run": dry_run,
+            "created": created,
+            "skipped": active - created,
+            "totals": payroll_service.totals(pay),
+        }
 
     @staticmethod
     async def approve_payroll(db: AsyncSession, payroll_id: int):
         p = await crud_payroll.get(db, id=payroll_id)
         if not p:
             return {"error": "Payroll record not found"}
+        if p.status != "pending":
+            return {"error": f"Payroll record is already {p.status}"}
         p.status = "approved"
+        await ledger_service.post_payroll(db, p)
         await db.commit()
         return p
 
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from sqlalchemy.exc import InterfaceError, OperationalError
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.schemas.marketing import LeadCreate
+from app.services.marketing_service import marketing_service
+
+logger = logging.getLogger(__name__)
+
+class BufferFull(Exception):
+    pass
+
+class LeadCaptureBuffer:
+    """
+    In-process buffer between the capture endpoint and the lead table. Accepted
+    leads are appended to a write-ahead file and queued; a background task writes
+    them with marketing_service.create_leads in batches of `batch_size`, or whatever
+    is queued once `flush_seconds` pass, and then marks them committed in the file.
+    On start, leads logged but never marked committed are queued again. create_leads
+    skips leads whose email or phone it already has, so a batch cut short by a crash
+    after its commit is not written twice, except for leads with neither an email
+    nor a phone that normalizes to a key, which are inserted again. A failed flush
+    is logged and retried; submit refuses leads if the flusher has stopped. Each
+    worker process needs its own WAL path.
+    """
+    MAX_BACKOFF = 30.0
+    TRANSIENT_ERRORS = (OperationalError, InterfaceError) # Database unreachable; worth retrying
+    COMPACT_BYTES = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        wal_path: str = settings.LEAD_BUFFER_WAL,
+        max_size: int = settings.LEAD_BUFFER_SIZE,
+        batch_size: int = settings.LEAD_BUFFER_BATCH,
+        flush_seconds: float = settings.LEAD_BUFFER_FLUSH_SECONDS
+    ) -> None:
+        self.wal_path = wal_path
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: Deque[Tuple[int, Dict[str, Any]]] = deque()
+        self._inflight: List[Tuple[int, Dict[str, Any]]] = []
+        self._seq = 0
+        self._committed = 0
+        self._wal = None
+        self._wal_bytes = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.stats = {"accepted": 0, "rejected": 0, "created": 0, "duplicates": 0, "dropped": 0, "batches": 0, "failures": 0}
+
+    # Write-ahead file: {"seq": n, "lead": {...}} per accepted lead, {"committed": n}
+    # once every lead up to n is in the database.
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        self._wal.write(line)
+        self._wal.flush()
+        self._wal_bytes += len(line)
+
+    def _rewrite(self, pending: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Replace the WAL with just the still-pending leads; the old one stays open until the new one is on disk."""
+        tmp_path = self.wal_path + ".tmp"
+        with open(tmp_path, "w") as tmp:
+            for seq, lead in pending:
+                tmp.write(json.dumps({"seq": seq, "lead": lead}, separators=(",", ":")) + "\n")
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        if self._wal is not None:
+            self._wal.close()
+        os.replace(tmp_path, self.wal_path)
+        self._wal = open(self.wal_path, "a")
+        self._wal_bytes = os.path.getsize(self.wal_path)
+
+    def _recover(self) -> List[Tuple[int, Dict[str, Any]]]:
+        if not os.path.exists(self.wal_path):
+            return []
+        logged: List[Tuple[int, Dict[str, Any]]] = []
+        committed = 0
+        with open(self.wal_path) as wal:
+            for line in wal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue # Torn last line from a crash mid-write
+                if "committed" in record:
+                    committed = max(committed, record["committed"])
+                else:
+                    logged.append((record["seq"], record["lead"]))
+        self._seq = max([committed] + [seq for seq, _ in logged])
+        self._committed = committed
+        return [(seq, lead) for seq, lead in logged if seq > committed]
+
+    # Ingestion
+
+    def submit(self, lead_in: LeadCreate) -> int:
+        """
+        Log and queue an already validated lead, returning its sequence number.
+        Raises BufferFull when the queue is at capacity so callers can shed load
+        instead of growing memory while the database is slow or down.
+        """
+        if self._wal is None or self._stopping or self._task is None or self._task.done():
+            raise BufferFull("Lead capture is not running")
+        if len(self._queue) >= self.max_size:
+            self.stats["rejected"] += 1
+            raise BufferFull("Lead capture buffer is full")
+        self._seq += 1
+        lead = lead_in.model_dump()
+        self._append({"seq": self._seq, "lead": lead})
+        self._queue.append((self._seq, lead))
+        self.stats["accepted"] += 1
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return self._seq
+
+    # Flushing
+
+    async def _write(self, leads: List[Dict[str, Any]]) -> None:
+        async with AsyncSessionLocal() as db:
+            result = await marketing_service.create_leads(db, [LeadCreate(**lead) for lead in leads])
+        self.stats["created"] += result["created"]
+        self.stats["duplicates"] += result["duplicates"]
+
+    async def _write_retrying(self, leads: List[Dict[str, Any]]) -> None:
+        """Write leads, retrying with backoff while the database is unreachable. Other errors propagate."""
+        backoff = 0.5
+        while True:
+            try:
+                await self._write(leads)
+                return
+            except self.TRANSIENT_ERRORS:
+                self.stats["failures"] += 1
+                logger.exception("Lead capture flush failed, retrying in %.1fs", backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.MAX_BACKOFF)
+
+    async def _write_batch(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Write a batch, retrying while the database is unavailable. A batch that fails
+        for any other reason (a lead the schema or the database rejects) is retried
+        lead by lead, and only the leads that still fail are dropped and logged.
+        """
+        try:
+            await self._write_retrying([lead for _, lead in batch])
+            return
+        except Exception:
+            logger.exception("Lead capture batch rejected, writing its %d leads one by one", len(batch))
+        for seq, lead in batch:
+            try:
+                await self._write_retrying([lead])
+            except Exception:
+                self.stats["dropped"] += 1
+                logger.exception("Dropped captured lead %s: %s", seq, lead)
+
+    async def _flush(self) -> None:
+        batch_size = min(self.batch_size, len(self._queue))
+        self._inflight = [self._queue.popleft() for _ in range(batch_size)]
+        # Everything up to this batch must be on disk before it is reported committed
+        await asyncio.to_thread(os.fsync, self._wal.fileno())
+        await self._write_batch(self._inflight)
+        self._committed = self._inflight[-1][0]
+        self._inflight = []
+        self.stats["batches"] += 1
+        if not self._queue:
+            self._rewrite([])
+        elif self._wal_bytes > self.COMPACT_BYTES:
+            self._rewrite(list(self._queue))
+        else:
+            self._append({"committed": self._committed})
+
+    async def _run(self) -> None:
+        backoff = 0.5
+        while not self._stopping or self._queue:
+            if len(self._queue) < self.batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+            if not self._queue:
+                continue
+            try:
+                await self._flush()
+                backoff = 0.5
+            except Exception:
+                # WAL I/O failed; keep any unwritten batch queued rather than let the flusher die
+                self.stats["failures"] += 1
+                logger.exception("Lead capture flush failed, retrying in %.1fs", backoff)
+                self._queue.extendleft(reversed(self._inflight))
+                self._inflight = []
+                if self._stopping:
+                    break # Whatever is queued is still in the WAL and is recovered on start
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.MAX_BACKOFF)
+
+    async def start(self) -> None:
+        """Queue whatever the WAL holds uncommitted and start the background flusher."""
+        if self._task is not None:
+            return
+        directory = os.path.dirname(self.wal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        pending = self._recover()
+        self._rewrite(pending)
+        self._queue.extend(pending)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting leads and write out everything still queued."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._wal.close()
+        self._wal = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued": len(self._queue),
+            "in_flight": len(self._inflight),
+            "capacity": self.max_size,
+            "last_seq": self._seq,
+            "committed_seq": self._committed,
+        }
+
+lead_capture_buffer = LeadCaptureBuffer()
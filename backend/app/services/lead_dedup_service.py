@@ -0,0 +1,180 @@
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, update, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.marketing import Lead, LeadStageEvent
+from app.services.marketing_service import LEAD_STAGES, funnel_cache, marketing_service
+from app.utils.dedup import (
+    EMAIL_SIMILARITY, NAME_SIMILARITY, UnionFind, digits_of, names_match, normalize_email, normalize_name, normalize_phone,
+    similar
+)
+
+def _stage_rank(status: Optional[str]) -> int:
+    """How far along the funnel a status is; "lost" and unknown statuses rank lowest."""
+    if status in LEAD_STAGES and status != "lost":
+        return LEAD_STAGES.index(status)
+    return -1
+
+class LeadDedupService:
+    READ_BATCH = 10000
+    WRITE_CHUNK = 1000
+    # Neighbours each lead is compared with inside its sorted block
+    WINDOW = 10
+
+    @staticmethod
+    async def _load(db: AsyncSession) -> List[Dict[str, Any]]:
+        """Surviving leads with their normalized keys, read off a server-side cursor."""
+        stmt = (
+            select(
+                Lead.id, Lead.full_name, Lead.email, Lead.phone, Lead.status, Lead.campaign_id,
+                Lead.student_id, Lead.email_key, Lead.phone_key
+            )
+            .where(Lead.duplicate_of_id.is_(None))
+            .order_by(Lead.id)
+            .execution_options(yield_per=LeadDedupService.READ_BATCH)
+        )
+        leads = []
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            for row in partition:
+                lead = row._asdict()
+                lead["stored_keys"] = (lead["email_key"], lead["phone_key"])
+                lead["email_key"] = normalize_email(lead["email"])
+                lead["phone_key"] = normalize_phone(lead["phone"])
+                lead["name"] = normalize_name(lead["full_name"])
+                leads.append(lead)
+        return leads
+
+    @staticmethod
+    def _cluster(leads: List[Dict[str, Any]]) -> Tuple[List[List[int]], int]:
+        """
+        Union leads sharing a normalized email, or a phone and a similar name. Then
+        catch typos with a sorted neighbourhood: leads are blocked by email domain
+        and sorted by email local part, by the local part reversed (for typos near
+        its start) and by name; each lead is compared with the next WINDOW leads of
+        each ordering only, so the work grows linearly, not as n^2. A pair matches
+        when the local parts carry the same digits and both they and the names are
+        similar. Sets linked to two different students are never joined. Returns
+        the clusters (as indexes into leads) and how many pairs were compared.
+        """
+        groups = UnionFind()
+        student_of: Dict[int, int] = {} # Set root -> the student its leads are linked to
+
+        def join(i: int, j: int) -> None:
+            a, b = groups.find(i), groups.find(j)
+            if a == b:
+                return
+            student_a, student_b = student_of.pop(a, None), student_of.pop(b, None)
+            if student_a is not None and student_b is not None and student_a != student_b:
+                student_of[a], student_of[b] = student_a, student_b
+                return
+            groups.union(a, b)
+            student = student_a if student_a is not None else student_b
+            if student is not None:
+                student_of[groups.find(a)] = student
+
+        first_by_email: Dict[str, int] = {}
+        by_phone: Dict[str, List[int]] = {} # One lead per distinct name seen on the number
+        by_domain: Dict[str, List[Tuple[str, str, str, int]]] = {}
+        for i, lead in enumerate(leads):
+            if lead["student_id"] is not None:
+                student_of[groups.find(i)] = lead["student_id"]
+            if lead["email_key"]:
+                join(first_by_email.setdefault(lead["email_key"], i), i)
+            if lead["phone_key"]:
+                named = by_phone.setdefault(lead["phone_key"], [])
+                match = next((j for j in named if names_match(lead["name"], leads[j]["name"])), None)
+                if match is None:
+                    named.append(i)
+                else:
+                    join(match, i)
+            if lead["email_key"] and lead["name"]:
+                local, domain = lead["email_key"].rsplit("@", 1)
+                by_domain.setdefault(domain, []).append((local, lead["name"], digits_of(local), i))
+
+        compared = 0
+        orderings = (lambda m: m[0], lambda m: m[0][::-1], lambda m: (m[1], m[0]))
+        for members in by_domain.values():
+            if len(members) < 2:
+                continue
+            for key in orderings:
+                ordered = sorted(members, key=key)
+                for n, (local, name, digits, i) in enumerate(ordered):
+                    for other_local, other_name, other_digits, j in ordered[n + 1:n + 1 + LeadDedupService.WINDOW]:
+                        if digits != other_digits or groups.find(i) == groups.find(j):
+                            continue
+                        compared += 1
+                        if similar(local, other_local, EMAIL_SIMILARITY) and similar(name, other_name, NAME_SIMILARITY):
+                            join(i, j)
+        return groups.groups(), compared
+
+    @staticmethod
+    async def _write(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Bulk UPDATE by primary key, a chunk of rows per executemany."""
+        for start in range(0, len(rows), LeadDedupService.WRITE_CHUNK):
+            await db.execute(update(Lead), rows[start:start + LeadDedupService.WRITE_CHUNK])
+
+    @staticmethod
+    async def dedup_leads(db: AsyncSession, dry_run: bool = False, sample: int = 20) -> Dict[str, Any]:
+        """
+        Find and merge duplicate leads across the whole table. Each cluster keeps one
+        lead: the one linked to a student, else the furthest along the funnel, else
+        the oldest. It takes the best stage and any contact details it lacked, and
+        the others point to it through duplicate_of_id. Normalized keys are stored
+        for every lead so later inserts are checked against them by index.
+        """
+        leads = await LeadDedupService._load(db)
+        clusters, compared = LeadDedupService._cluster(leads)
+
+        merges: List[Dict[str, Any]] = []
+        primaries: Dict[int, Dict[str, Any]] = {}
+        events: List[Dict[str, Any]] = []
+        campaigns = set()
+        samples = []
+        for members in clusters:
+            cluster = sorted((leads[i] for i in members), key=lambda l: (l["student_id"] is None, -_stage_rank(l["status"]), l["id"]))
+            primary, duplicates = cluster[0], cluster[1:]
+            best = max(cluster, key=lambda l: _stage_rank(l["status"]))["status"]
+            row = {"id": primary["id"], "status": primary["status"]}
+            for field in ("email", "phone", "student_id", "email_key", "phone_key"):
+                row[field] = primary[field] or next((d[field] for d in duplicates if d[field]), None)
+            if _stage_rank(best) > _stage_rank(primary["status"]):
+                row["status"] = best
+                events.append({"lead_id": primary["id"], "from_status": primary["status"], "to_status": best})
+            primaries[primary["id"]] = row
+            merges.extend({"id": d["id"], "duplicate_of_id": primary["id"]} for d in duplicates)
+            campaigns.update(l["campaign_id"] for l in cluster)
+            if len(samples) < sample:
+                samples.append({"keep": primary["id"], "merge": [d["id"] for d in duplicates]})
+
+        summary = {
+            "leads": len(leads),
+            "clusters": len(clusters),
+            "merged": len(merges),
+            "pairs_compared": compared,
+            "dry_run": dry_run,
+            "sample": samples,
+        }
+        if dry_run:
+            return summary
+
+        merged_ids = {m["id"] for m in merges}
+        key_updates = [
+            {"id": l["id"], "email_key": l["email_key"], "phone_key": l["phone_key"]}
+            for l in leads
+            if l["id"] not in primaries and l["id"] not in merged_ids and (l["email_key"], l["phone_key"]) != l["stored_keys"]
+        ]
+        await LeadDedupService._write(db, key_updates)
+        await LeadDedupService._write(db, list(primaries.values()))
+        await LeadDedupService._write(db, merges)
+        if events:
+            await db.execute(insert(LeadStageEvent), events)
+        campaign_ids = sorted(c for c in campaigns if c is not None)
+        if campaign_ids:
+            await marketing_service.refresh_metrics(db, campaign_ids, commit=False)
+        await db.commit()
+        for campaign_id in campaign_ids or [None]:
+            funnel_cache.invalidate(campaign_id)
+        summary["keys_updated"] = len(key_updates)
+        return summary
+
+lead_dedup_service = LeadDedupService()
@@ -0,0 +1,273 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.ledger import Account, JournalEntry, Posting, BalanceCheckpoint
+from app.models.tuition_invoice import TuitionInvoice
+
+CASH = "1000"
+RECEIVABLE = "1100"
+PAYABLE = "2000"
+SALARIES_PAYABLE = "2100"
+TAX_PAYABLE = "2200"
+TUITION_REVENUE = "4000"
+LATE_FEE_REVENUE = "4100"
+SALARY_EXPENSE = "5000"
+OPERATING_EXPENSE = "5100"
+SCHOLARSHIP_EXPENSE = "5200"
+
+CHART_OF_ACCOUNTS = [
+    (CASH, "Cash", "asset"),
+    (RECEIVABLE, "Tuition Receivable", "asset"),
+    (PAYABLE, "Accounts Payable", "liability"),
+    (SALARIES_PAYABLE, "Salaries Payable", "liability"),
+    (TAX_PAYABLE, "Payroll Tax Payable", "liability"),
+    (TUITION_REVENUE, "Tuition Revenue", "income"),
+    (LATE_FEE_REVENUE, "Late Fee Revenue", "income"),
+    (SALARY_EXPENSE, "Salary Expense", "expense"),
+    (OPERATING_EXPENSE, "Operating Expense", "expense"),
+    (SCHOLARSHIP_EXPENSE, "Scholarship Expense", "expense"),
+]
+
+# Accounts whose balance is normally a credit, reported credit-positive
+CREDIT_NORMAL = {"liability", "equity", "income"}
+
+class LedgerService:
+    """
+    Append-only double-entry journal. post() only flushes, so a journal entry
+    commits or rolls back with the business write that caused it.
+    """
+    def __init__(self) -> None:
+        self._accounts: Dict[str, Tuple[int, str]] = {}
+
+    async def ensure_accounts(self, db: AsyncSession) -> Dict[str, Tuple[int, str]]:
+        """Account ids and types by code, creating any missing chart-of-accounts entries."""
+        if self._accounts:
+            return self._accounts
+        result = await db.execute(select(Account.code, Account.id, Account.type))
+        accounts = {code: (id_, type_) for code, id_, type_ in result.all()}
+        missing = [(code, name, type_) for code, name, type_ in CHART_OF_ACCOUNTS if code not in accounts]
+        if not missing:
+            self._accounts = accounts
+            return accounts
+
+        # Created inside the caller's transaction, so not cached until seen committed
+        await db.execute(insert(Account), [{"code": c, "name": n, "type": t} for c, n, t in missing])
+        result = await db.execute(select(Account.code, Account.id, Account.type))
+        return {code: (id_, type_) for code, id_, type_ in result.all()}
+
+    async def post(
+        self,
+        db: AsyncSession,
+        *,
+        description: str,
+        lines: List[Tuple[str, float]],
+        entry_date: Optional[datetime] = None,
+        source_type: Optional[str] = None,
+        source_id: Any = None
+    ) -> int:
+        """
+        Append one balanced journal entry from (account code, signed amount) lines,
+        debits positive. Returns the entry id. Does not commit.
+        """
+        entry_ids = await self.post_many(db, [{
+            "description": description,
+            "lines": lines,
+            "entry_date": entry_date,
+            "source_type": source_type,
+            "source_id": source_id,
+        }])
+        return entry_ids[0]
+
+    async def post_many(self, db: AsyncSession, entries: List[Dict[str, Any]]) -> List[int]:
+        """
+        Append many journal entries (dicts with the arguments of post()) using one
+        INSERT for the entries and one for all their postings. Does not commit.
+        """
+        if not entries:
+            return []
+        accounts = await self.ensure_accounts(db)
+        now = datetime.now()
+        prepared = []
+        for entry in entries:
+            lines = [(code, round(amount, 2)) for code, amount in entry["lines"] if round(amount, 2)]
+            if round(sum(amount for _, amount in lines), 2) != 0:
+                raise ValueError(f"Unbalanced journal entry '{entry['description']}': {lines}")
+            prepared.append((entry.get("entry_date") or now, lines))
+
+        result = await db.execute(
+            insert(JournalEntry).returning(JournalEntry.id, sort_by_parameter_order=True).execution_options(render_nulls=True),
+            [
+                {
+                    "entry_date": entry_date,
+                    "description": entry["description"],
+                    "source_type": entry.get("source_type"),
+                    "source_id": str(entry["source_id"]) if entry.get("source_id") is not None else None,
+                }
+                for entry, (entry_date, _) in zip(entries, prepared)
+            ]
+        )
+        entry_ids = list(result.scalars().all())
+
+        postings = [
+            {"entry_id": entry_id, "account_id": accounts[code][0], "amount": amount, "entry_date": entry_date}
+            for entry_id, (entry_date, lines) in zip(entry_ids, prepared)
+            for code, amount in lines
+        ]
+        if postings:
+            await db.execute(insert(Posting), postings)
+            # A backdated entry invalidates later checkpoints of the accounts it touches
+            await db.execute(delete(BalanceCheckpoint).where(
+                BalanceCheckpoint.account_id.in_({p["account_id"] for p in postings}),
+                BalanceCheckpoint.as_of > min(p["entry_date"] for p in postings)
+            ))
+        return entry_ids
+
+    async def _raw_balance(self, db: AsyncSession, account_id: int, as_of: datetime) -> float:
+        """Sum of postings before as_of, starting from the latest checkpoint at or before it."""
+        result = await db.execute(
+            select(BalanceCheckpoint.as_of, BalanceCheckpoint.balance)
+            .where(BalanceCheckpoint.account_id == account_id, BalanceCheckpoint.as_of <= as_of)
+            .order_by(BalanceCheckpoint.as_of.desc())
+            .limit(1)
+        )
+        checkpoint = result.first()
+        stmt = select(func.coalesce(func.sum(Posting.amount), 0.0)).where(
+            Posting.account_id == account_id,
+            Posting.entry_date < as_of
+        )
+        if checkpoint:
+            stmt = stmt.where(Posting.entry_date >= checkpoint.as_of)
+        delta = (await db.execute(stmt)).scalar()
+        return (checkpoint.balance if checkpoint else 0.0) + delta
+
+    async def balance(self, db: AsyncSession, code: str, as_of: Optional[datetime] = None) -> float:
+        """Balance of an account in its normal direction (credit-positive for liabilities and income)."""
+        accounts = await self.ensure_accounts(db)
+        if code not in accounts:
+            raise KeyError(code)
+        account_id, account_type = accounts[code]
+        raw = await self._raw_balance(db, account_id, as_of or datetime.now())
+        return round(-raw if account_type in CREDIT_NORMAL else raw, 2)
+
+    async def balances(self, db: AsyncSession, as_of: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        await self.ensure_accounts(db)
+        result = await db.execute(select(Account).order_by(Account.code))
+        return [
+            {
+                "code": account.code,
+                "name": account.name,
+                "type": account.type,
+                "balance": await self.balance(db, account.code, as_of)
+            }
+            for account in result.scalars().all()
+        ]
+
+    async def create_checkpoints(self, db: AsyncSession, as_of: datetime) -> int:
+        """Snapshot every account's balance at as_of so later queries start from there."""
+        accounts = await self.ensure_accounts(db)
+        rows = [
+            {"account_id": account_id, "as_of": as_of, "balance": await self._raw_balance(db, account_id, as_of)}
+            for account_id, _ in accounts.values()
+        ]
+        await db.execute(delete(BalanceCheckpoint).where(BalanceCheckpoint.as_of == as_of))
+        await db.execute(insert(BalanceCheckpoint), rows)
+        await db.commit()
+        return len(rows)
+
+    # Business events
+
+    async def post_invoice(self, db: AsyncSession, invoice: TuitionInvoice) -> int:
+        return await self.post(
+            db,
+            description=f"Tuition invoice #{invoice.id}",
+            source_type="invoice",
+            source_id=invoice.id,
+            lines=[(RECEIVABLE, invoice.amount_due), (TUITION_REVENUE, -invoice.amount_due)]
+        )
+
+    async def post_invoice_batch(self, db: AsyncSession, billing_period: str, total: float, count: int) -> int:
+        return await self.post(
+            db,
+            description=f"Tuition billed for {billing_period} ({count} invoices)",
+            source_type="invoice_batch",
+            source_id=billing_period,
+            lines=[(RECEIVABLE, total), (TUITION_REVENUE, -total)]
+        )
+
+    async def post_payments(self, db: AsyncSession, payments: List[Tuple[int, int, float]]) -> List[int]:
+        """One entry per (payment id, invoice id, amount), appended in a single batch."""
+        return await self.post_many(db, [
+            {
+                "description": f"Tuition payment - Invoice #{invoice_id}",
+                "source_type": "payment",
+                "source_id": payment_id,
+                "lines": [(CASH, amount), (RECEIVABLE, -amount)],
+            }
+            for payment_id, invoice_id, amount in payments
+        ])
+
+    async def post_invoice_adjustment(self, db: AsyncSession, invoice_id: int, delta: float) -> int:
+        """Change in an invoice's amount due after it was billed; negative reduces it."""
+        return await self.post(
+            db,
+            description=f"Tuition invoice #{invoice_id} adjusted",
+            source_type="invoice",
+            source_id=invoice_id,
+            lines=[(RECEIVABLE, delta), (TUITION_REVENUE, -delta)]
+        )
+
+    async def post_late_fee_batch(self, db: AsyncSession, period: str, total: float, count: int) -> int:
+        return await self.post(
+            db,
+            description=f"Late fees charged for {period} ({count} charges)",
+            source_type="late_fee_batch",
+            source_id=period,
+            lines=[(RECEIVABLE, total), (LATE_FEE_REVENUE, -total)]
+        )
+
+    async def post_scholarship_batch(self, db: AsyncSession, total: float, count: int) -> int:
+        return await self.post(
+            db,
+            description=f"Scholarships credited to invoices ({count} allocations)",
+            source_type="scholarship_batch",
+            lines=[(SCHOLARSHIP_EXPENSE, total), (RECEIVABLE, -total)]
+        )
+
+    async def post_payroll(self, db: AsyncSession, payroll: Any) -> int:
+        gross = (payroll.base_salary or 0.0) + (payroll.allowances or 0.0) - (payroll.deductions or 0.0)
+        tax = payroll.tax or 0.0
+        return await self.post(
+            db,
+            description=f"Payroll #{payroll.id} {payroll.month}/{payroll.year}",
+            source_type="payroll",
+            source_id=payroll.id,
+            lines=[(SALARY_EXPENSE, gross), (TAX_PAYABLE, -tax), (SALARIES_PAYABLE, -(gross - tax))]
+        )
+
+    async def post_expense(self, db: AsyncSession, expense: Any) -> int:
+        return (await self.post_expenses(db, [expense]))[0]
+
+    async def post_expenses(self, db: AsyncSession, expenses: List[Any]) -> List[int]:
+        """One journal entry per approved expense (anything with id, category and amount)."""
+        return await self.post_many(db, [
+            {
+                "description": f"Expense #{expense.id}: {expense.category}",
+                "source_type": "expense",
+                "source_id": expense.id,
+                "lines": [(OPERATING_EXPENSE, expense.amount), (PAYABLE, -expense.amount)],
+            }
+            for expense in expenses
+        ])
+
+    async def reverse_expense(self, db: AsyncSession, expense: Any) -> int:
+        """Reverse the entry posted when an expense was approved, e.g. on a later rejection."""
+        return await self.post(
+            db,
+            description=f"Reversal of expense #{expense.id}: {expense.category}",
+            source_type="expense",
+            source_id=expense.id,
+            lines=[(OPERATING_EXPENSE, -expense.amount), (PAYABLE, expense.amount)]
+        )
+
+ledger_service = LedgerService()
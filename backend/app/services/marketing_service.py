@@ -0,0 +1,454 @@
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, insert, update, delete, func, case, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.upsert import upsert_increment
+from app.models.marketing import MarketingCampaign, Lead, LeadStageEvent, CampaignMetrics
+from app.models.student import Student
+from app.models.tuition_invoice import TuitionInvoice
+from app.schemas.marketing import MarketingCampaignCreate, LeadCreate
+from app.utils.cache import ScopedCache
+from app.utils.dedup import names_match, normalize_email, normalize_name, normalize_phone
+
+LEAD_STAGES = ["new", "contacted", "interested", "applicant", "admitted", "enrolled", "lost"]
+FUNNEL_PERIODS = ("week", "month")
+
+# Funnel results, scoped by campaign so a lead write only invalidates its campaign (and the totals)
+funnel_cache = ScopedCache(ttl_seconds=300)
+
+def _period_start(day: Any, period: str) -> str:
+    """Start of the week (Monday) or month a day falls in, as an ISO date string."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    elif isinstance(day, datetime):
+        day = day.date()
+    if period == "week":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    return day.replace(day=1).isoformat()
+
+def _stage_counts() -> Dict[str, int]:
+    return {stage: 0 for stage in LEAD_STAGES}
+
+class MarketingService:
+    @staticmethod
+    async def _bump(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Add deltas (campaign_id plus leads/enrolled/students/revenue) onto campaign metrics. Does not commit."""
+        rows = [row for row in rows if row.get("campaign_id") is not None]
+        if not rows:
+            return
+        columns = ("leads", "enrolled", "students", "revenue")
+        await upsert_increment(
+            db,
+            CampaignMetrics,
+            [{"campaign_id": row["campaign_id"], **{c: row.get(c, 0) for c in columns}} for row in rows],
+            index_elements=["campaign_id"],
+            increment=list(columns)
+        )
+
+    @staticmethod
+    async def _student_revenue(db: AsyncSession, student_id: int) -> float:
+        result = await db.execute(
+            select(func.coalesce(func.sum(TuitionInvoice.amount_paid), 0.0)).where(TuitionInvoice.student_id == student_id)
+        )
+        return result.scalar() or 0.0
+
+    @staticmethod
+    async def create_campaign(db: AsyncSession, campaign_in: MarketingCampaignCreate) -> MarketingCampaign:
+        campaign = MarketingCampaign(**campaign_in.model_dump())
+        db.add(campaign)
+        await db.flush()
+        db.add(CampaignMetrics(campaign_id=campaign.id, budget=campaign.budget or 0.0, leads=0, enrolled=0, students=0, revenue=0.0))
+        await db.commit()
+        await db.refresh(campaign)
+        return campaign
+
+    @staticmethod
+    async def find_duplicate(
+        db: AsyncSession,
+        email_key: Optional[str],
+        phone_key: Optional[str],
+        full_name: Optional[str] = None
+    ) -> Optional[Lead]:
+        """
+        The surviving lead with the same normalized email, else the one with the same
+        phone and a similar name (a family often shares one number), via the indexed
+        key columns.
+        """
+        if email_key:
+            result = await db.execute(
+                select(Lead).where(Lead.email_key == email_key, Lead.duplicate_of_id.is_(None)).order_by(Lead.id).limit(1)
+            )
+            lead = result.scalars().first()
+            if lead is not None:
+                return lead
+        if phone_key:
+            name = normalize_name(full_name)
+            result = await db.execute(
+                select(Lead).where(Lead.phone_key == phone_key, Lead.duplicate_of_id.is_(None)).order_by(Lead.id)
+            )
+            for lead in result.scalars().all():
+                if names_match(name, normalize_name(lead.full_name)):
+                    return lead
+        return None
+
+    @staticmethod
+    async def create_lead(db: AsyncSession, lead_in: LeadCreate) -> Lead:
+        """
+        Create a lead unless one with the same normalized email or phone exists; then
+        that lead is returned instead, with any blank contact details filled in.
+        """
+        email_key, phone_key = normalize_email(lead_in.email), normalize_phone(lead_in.phone)
+        existing = await MarketingService.find_duplicate(db, email_key, phone_key, lead_in.full_name)
+        if existing is not None:
+            if not existing.phone and lead_in.phone:
+                existing.phone, existing.phone_key = lead_in.phone, phone_key
+            if not existing.email and lead_in.email:
+                existing.email, existing.email_key = lead_in.email, email_key
+            await db.commit()
+            await db.refresh(existing)
+            return existing
+
+        lead = Lead(**lead_in.model_dump(), email_key=email_key, phone_key=phone_key)
+        db.add(lead)
+        await db.flush()
+        db.add(LeadStageEvent(lead_id=lead.id, from_status=None, to_status=lead.status or "new"))
+        await MarketingService._bump(db, [{"campaign_id": lead.campaign_id, "leads": 1, "enrolled": int(lead.status == "enrolled")}])
+        await db.commit()
+        await db.refresh(lead)
+        funnel_cache.invalidate(lead.campaign_id)
+        return lead
+
+    @staticmethod
+    async def create_leads(db: AsyncSession, leads_in: List[LeadCreate]) -> Dict[str, int]:
+        """
+        Bulk create_lead: one lookup of the normalized keys, one INSERT ... RETURNING
+        for the new leads and one for their creation events. Leads matching an
+        existing lead, or an earlier one in the batch, are skipped (by phone only
+        with a similar name, as in find_duplicate), so replaying a batch creates
+        nothing twice, unless a lead has neither an email nor a phone key.
+        """
+        keyed = [
+            (lead_in, normalize_email(lead_in.email), normalize_phone(lead_in.phone), normalize_name(lead_in.full_name))
+            for lead_in in leads_in
+        ]
+        email_keys = {e for _, e, _, _ in keyed if e}
+        phone_keys = {p for _, _, p, _ in keyed if p}
+        seen_emails: set = set()
+        names_by_phone: Dict[str, List[str]] = {}
+        if email_keys or phone_keys:
+            result = await db.execute(
+                select(Lead.email_key, Lead.phone_key, Lead.full_name).where(
+                    Lead.duplicate_of_id.is_(None),
+                    or_(Lead.email_key.in_(email_keys), Lead.phone_key.in_(phone_keys))
+                )
+            )
+            for email_key, phone_key, full_name in result.all():
+                seen_emails.add(email_key)
+                names_by_phone.setdefault(phone_key, []).append(normalize_name(full_name))
+
+        rows = []
+        for lead_in, email_key, phone_key, name in keyed:
+            if email_key and email_key in seen_emails:
+                continue
+            if phone_key and any(names_match(name, other) for other in names_by_phone.get(phone_key, [])):
+                continue
+            seen_emails.add(email_key)
+            names_by_phone.setdefault(phone_key, []).append(name)
+            rows.append({**lead_in.model_dump(), "email_key": email_key, "phone_key": phone_key})
+        if rows:
+            inserted = await db.execute(
+                insert(Lead).returning(Lead.id, Lead.status, sort_by_parameter_order=True).execution_options(render_nulls=True),
+                rows
+            )
+            await db.execute(insert(LeadStageEvent), [
+                {"lead_id": lead_id, "from_status": None, "to_status": status or "new"} for lead_id, status in inserted.all()
+            ])
+            deltas: Dict[int, Dict[str, Any]] = {}
+            for row in rows:
+                if row["campaign_id"] is not None:
+                    delta = deltas.setdefault(row["campaign_id"], {"campaign_id": row["campaign_id"], "leads": 0, "enrolled": 0})
+                    delta["leads"] += 1
+                    delta["enrolled"] += int(row["status"] == "enrolled")
+            await MarketingService._bump(db, list(deltas.values()))
+        await db.commit()
+        if rows:
+            for campaign_id in {row["campaign_id"] for row in rows}:
+                funnel_cache.invalidate(campaign_id)
+        return {"created": len(rows), "duplicates": len(leads_in) - len(rows)}
+
+    @staticmethod
+    async def _move(db: AsyncSession, lead: Lead, status: str) -> None:
+        """Record a stage change and keep the campaign's enrolled count in step. Does not commit."""
+        db.add(LeadStageEvent(lead_id=lead.id, from_status=lead.status, to_status=status))
+        enrolled = int(status == "enrolled") - int(lead.status == "enrolled")
+        if enrolled:
+            await MarketingService._bump(db, [{"campaign_id": lead.campaign_id, "enrolled": enrolled}])
+        lead.status = status
+
+    @staticmethod
+    async def change_status(db: AsyncSession, lead_id: int, status: str):
+        """Move a lead to another stage and record when it got there."""
+        if status not in LEAD_STAGES:
+            return {"error": f"Unknown stage. Use one of: {', '.join(LEAD_STAGES)}"}
+        lead = await db.get(Lead, lead_id)
+        if not lead:
+            return {"error": "Lead not found"}
+        if lead.status == status:
+            return lead
+        await MarketingService._move(db, lead, status)
+        await db.commit()
+        await db.refresh(lead)
+        funnel_cache.invalidate(lead.campaign_id)
+        return lead
+
+    @staticmethod
+    async def link_student(db: AsyncSession, lead_id: int, student_id: int):
+        """
+        Record the student a lead became and move it to "enrolled". The student's
+        tuition paid so far is credited to the lead's campaign.
+        """
+        lead = await db.get(Lead, lead_id)
+        if not lead:
+            return {"error": "Lead not found"}
+        if not await db.get(Student, student_id):
+            return {"error": "Student not found"}
+        if lead.student_id == student_id:
+            return lead
+        delta = {"campaign_id": lead.campaign_id, "revenue": await MarketingService._student_revenue(db, student_id)}
+        if lead.student_id is None:
+            delta["students"] = 1
+        else:
+            delta["revenue"] -= await MarketingService._student_revenue(db, lead.student_id)
+        await MarketingService._bump(db, [delta])
+        lead.student_id = student_id
+        if lead.status != "enrolled":
+            await MarketingService._move(db, lead, "enrolled")
+        await db.commit()
+        await db.refresh(lead)
+        funnel_cache.invalidate(lead.campaign_id)
+        return lead
+
+    @staticmethod
+    async def link_students_by_email(db: AsyncSession) -> Dict[str, Any]:
+        """
+        Link every unlinked lead to the student with the same email (case-insensitive)
+        and mark it enrolled, in one UPDATE plus one INSERT ... SELECT for the stage
+        events, then recompute the metrics of the campaigns touched.
+        """
+        match = (
+            select(Student.id)
+            .where(func.lower(Student.email) == func.lower(Lead.email))
+            .limit(1)
+            .scalar_subquery()
+        )
+        unlinked = (Lead.student_id.is_(None), Lead.duplicate_of_id.is_(None), Lead.email.isnot(None), match.isnot(None))
+        await db.execute(insert(LeadStageEvent).from_select(
+            ["lead_id", "from_status", "to_status"],
+            select(Lead.id, Lead.status, literal("enrolled")).where(*unlinked, Lead.status != "enrolled")
+        ))
+        result = await db.execute(
+            update(Lead)
+            .where(*unlinked)
+            .values(student_id=match, status="enrolled")
+            .returning(Lead.campaign_id)
+            .execution_options(synchronize_session=False)
+        )
+        linked = result.scalars().all()
+        campaign_ids = sorted({campaign_id for campaign_id in linked if campaign_id is not None})
+        if campaign_ids:
+            await MarketingService.refresh_metrics(db, campaign_ids, commit=False)
+        await db.commit()
+        if linked:
+            for campaign_id in campaign_ids or [None]:
+                funnel_cache.invalidate(campaign_id)
+        return {"linked": len(linked), "campaigns": campaign_ids}
+
+    @staticmethod
+    async def record_revenue(db: AsyncSession, invoice_amounts: Dict[int, float]) -> None:
+        """
+        Credit payments (invoice id -> amount) to the campaigns whose leads became
+        the paying students, with one lookup and one upsert. Does not commit.
+        """
+        if not invoice_amounts:
+            return
+        result = await db.execute(
+            select(TuitionInvoice.id, Lead.campaign_id)
+            .join(Lead, Lead.student_id == TuitionInvoice.student_id)
+            .where(TuitionInvoice.id.in_(list(invoice_amounts)), Lead.campaign_id.isnot(None), Lead.duplicate_of_id.is_(None))
+        )
+        revenue: Dict[int, float] = {}
+        for invoice_id, campaign_id in result.all():
+            revenue[campaign_id] = round(revenue.get(campaign_id, 0.0) + invoice_amounts[invoice_id], 2)
+        await MarketingService._bump(db, [{"campaign_id": c, "revenue": amount} for c, amount in revenue.items()])
+
+    @staticmethod
+    async def refresh_metrics(db: AsyncSession, campaign_ids: Optional[List[int]] = None, commit: bool = True) -> int:
+        """
+        Recompute campaign metrics from leads and invoices with two grouped queries,
+        for the given campaigns or all of them. Repairs any drift in the running totals.
+        """
+        campaigns = select(MarketingCampaign.id, MarketingCampaign.budget)
+        leads = select(
+            Lead.campaign_id,
+            func.count(Lead.id),
+            func.sum(case((Lead.status == "enrolled", 1), else_=0)),
+            func.count(Lead.student_id)
+        ).where(Lead.campaign_id.isnot(None), Lead.duplicate_of_id.is_(None)).group_by(Lead.campaign_id)
+        revenue = (
+            select(Lead.campaign_id, func.sum(TuitionInvoice.amount_paid))
+            .join(TuitionInvoice, TuitionInvoice.student_id == Lead.student_id)
+            .where(Lead.campaign_id.isnot(None), Lead.duplicate_of_id.is_(None))
+            .group_by(Lead.campaign_id)
+        )
+        if campaign_ids is not None:
+            campaigns = campaigns.where(MarketingCampaign.id.in_(campaign_ids))
+            leads = leads.where(Lead.campaign_id.in_(campaign_ids))
+            revenue = revenue.where(Lead.campaign_id.in_(campaign_ids))
+        budgets = dict((await db.execute(campaigns)).all())
+        lead_counts = {row[0]: row[1:] for row in (await db.execute(leads)).all()}
+        revenues = dict((await db.execute(revenue)).all())
+
+        now = datetime.now()
+        rows = []
+        for campaign_id, budget in budgets.items():
+            count, enrolled, students = lead_counts.get(campaign_id, (0, 0, 0))
+            rows.append({
+                "campaign_id": campaign_id, "budget": budget or 0.0, "leads": count, "enrolled": enrolled or 0,
+                "students": students, "revenue": round(revenues.get(campaign_id) or 0.0, 2), "refreshed_at": now
+            })
+        await db.execute(delete(CampaignMetrics).where(CampaignMetrics.campaign_id.in_(list(budgets))))
+        if rows:
+            await db.execute(CampaignMetrics.__table__.insert(), rows)
+        if commit:
+            await db.commit()
+        return len(rows)
+
+    @staticmethod
+    async def get_campaign_metrics(db: AsyncSession, campaign_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Cost per lead, cost per enrolled student, revenue and ROI per campaign, from CampaignMetrics only."""
+        stmt = select(CampaignMetrics).order_by(CampaignMetrics.campaign_id)
+        if campaign_id is not None:
+            stmt = stmt.where(CampaignMetrics.campaign_id == campaign_id)
+        metrics = (await db.execute(stmt)).scalars().all()
+        names = dict((await db.execute(
+            select(MarketingCampaign.id, MarketingCampaign.name).where(MarketingCampaign.id.in_([m.campaign_id for m in metrics]))
+        )).all())
+        rows = []
+        for m in metrics:
+            budget = m.budget or 0.0
+            rows.append({
+                "campaign_id": m.campaign_id,
+                "name": names.get(m.campaign_id),
+                "budget": budget,
+                "leads": m.leads,
+                "enrolled": m.enrolled,
+                "students": m.students,
+                "revenue": round(m.revenue, 2),
+                "cost_per_lead": round(budget / m.leads, 2) if m.leads else None,
+                "cost_per_student": round(budget / m.students, 2) if m.students else None,
+                "conversion_rate": round(m.students / m.leads, 4) if m.leads else None,
+                "roi": round((m.revenue - budget) / budget, 4) if budget else None,
+                "refreshed_at": m.refreshed_at,
+            })
+        return rows
+
+    @staticmethod
+    async def get_funnel(
+        db: AsyncSession,
+        *,
+        campaign_id: Optional[int] = None,
+        by_campaign: bool = False,
+        period: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Lead counts per stage from one GROUP BY over the lead table, optionally broken
+        down by campaign and/or by the week or month leads were created in. Cached
+        until a lead of the same campaign is written.
+        """
+        if period is not None and period not in FUNNEL_PERIODS:
+            return {"error": f"period must be one of: {', '.join(FUNNEL_PERIODS)}"}
+        key = ("funnel", campaign_id, by_campaign, period)
+        cached = funnel_cache.get(key)
+        if cached is not None:
+            return cached
+
+        columns = [Lead.status]
+        if by_campaign:
+            columns.append(Lead.campaign_id)
+        if period is not None:
+            # Grouped by day in SQL, rolled up to weeks or months below
+            columns.append(func.date(Lead.created_at))
+        stmt = select(*columns, func.count(Lead.id)).where(Lead.duplicate_of_id.is_(None)).group_by(*columns)
+        if campaign_id is not None:
+            stmt = stmt.where(Lead.campaign_id == campaign_id)
+
+        stages = _stage_counts()
+        breakdown: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        for row in (await db.execute(stmt)).all():
+            status, count = row[0], row[-1]
+            stages[status] = stages.get(status, 0) + count
+            if by_campaign or period is not None:
+                group_campaign = row[1] if by_campaign else None
+                group_period = _period_start(row[-2], period) if period is not None and row[-2] is not None else None
+                group = breakdown.get((group_campaign, group_period))
+                if group is None:
+                    group = breakdown[(group_campaign, group_period)] = {
+                        "campaign_id": group_campaign, "period": group_period, "stages": _stage_counts(), "total": 0
+                    }
+                group["stages"][status] = group["stages"].get(status, 0) + count
+                group["total"] += count
+
+        funnel: Dict[str, Any] = {"stages": stages, "total": sum(stages.values())}
+        if breakdown:
+            funnel["breakdown"] = sorted(
+                breakdown.values(), key=lambda g: (g["campaign_id"] is None, g["campaign_id"] or 0, g["period"] or "")
+            )
+        funnel_cache.set(key, funnel, scope=campaign_id)
+        return funnel
+
+    @staticmethod
+    async def get_conversion_times(
+        db: AsyncSession,
+        *,
+        stage: str = "enrolled",
+        campaign_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Days from lead creation to first reaching `stage`, per campaign, from recorded transitions."""
+        if stage not in LEAD_STAGES:
+            return {"error": f"Unknown stage. Use one of: {', '.join(LEAD_STAGES)}"}
+        key = ("conversion", stage, campaign_id)
+        cached = funnel_cache.get(key)
+        if cached is not None:
+            return cached
+
+        stmt = (
+            select(Lead.campaign_id, Lead.created_at, func.min(LeadStageEvent.changed_at))
+            .join(LeadStageEvent, LeadStageEvent.lead_id == Lead.id)
+            .where(LeadStageEvent.to_status == stage, LeadStageEvent.from_status.isnot(None), Lead.duplicate_of_id.is_(None))
+            .group_by(Lead.id, Lead.campaign_id, Lead.created_at)
+        )
+        if campaign_id is not None:
+            stmt = stmt.where(Lead.campaign_id == campaign_id)
+        days: Dict[Optional[int], List[float]] = {}
+        for campaign, created_at, reached_at in (await db.execute(stmt)).all():
+            if created_at is None or reached_at is None:
+                continue
+            days.setdefault(campaign, []).append((reached_at - created_at).total_seconds() / 86400)
+
+        def summary(values: List[float]) -> Dict[str, Any]:
+            return {
+                "leads": len(values),
+                "average_days": round(statistics.fmean(values), 2) if values else None,
+                "median_days": round(statistics.median(values), 2) if values else None,
+            }
+
+        result = {
+            "stage": stage,
+            **summary([d for values in days.values() for d in values]),
+            "by_campaign": [{"campaign_id": c, **summary(v)} for c, v in sorted(days.items(), key=lambda i: (i[0] is None, i[0] or 0))],
+        }
+        funnel_cache.set(key, result, scope=campaign_id)
+        return result
+
+marketing_service = MarketingService()
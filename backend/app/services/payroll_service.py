@@ -0,0 +1,185 @@
+from typing import Any, Dict, List, Tuple
+from datetime import datetime
+import numpy as np
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+from app.models.payroll import Payroll
+from app.utils.payroll import period_bounds, working_days, leave_days, progressive_tax
+
+class PayrollService:
+    @staticmethod
+    async def _inputs(db: AsyncSession, employees: Any, month: int, year: int) -> Dict[str, np.ndarray]:
+        """
+        Salary, allowances, unpaid leave days and late / half-day check-ins for the
+        month, one array entry per employee in `employees` (ids or a select of ids),
+        ordered by id. Leave and attendance come from one query each.
+        """
+        result = await db.execute(
+            select(Employee.id, func.coalesce(Employee.salary, 0.0), func.coalesce(Employee.allowances, 0.0))
+            .where(Employee.id.in_(employees))
+            .order_by(Employee.id)
+        )
+        rows = result.all()
+        n = len(rows)
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        inputs = {
+            "employee_id": ids,
+            "base_salary": np.array([row[1] for row in rows], dtype=float),
+            "allowances": np.array([row[2] for row in rows], dtype=float),
+            "unpaid_leave_days": np.zeros(n),
+            "late_days": np.zeros(n),
+            "half_days": np.zeros(n),
+        }
+        if not n:
+            return inputs
+
+        start, end = period_bounds(month, year)
+        result = await db.execute(
+            select(LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date).where(
+                LeaveRequest.employee_id.in_(employees),
+                LeaveRequest.status == "approved",
+                LeaveRequest.leave_type.in_(settings.PAYROLL_UNPAID_LEAVE_TYPES),
+                LeaveRequest.start_date < end,
+                LeaveRequest.end_date >= start
+            )
+        )
+        leaves = result.all()
+        if leaves:
+            index = np.searchsorted(ids, [leave[0] for leave in leaves])
+            days = leave_days([leave[1] for leave in leaves], [leave[2] for leave in leaves], month, year)
+            inputs["unpaid_leave_days"] = np.bincount(index, weights=days, minlength=n)
+
+        result = await db.execute(
+            select(Attendance.employee_id, Attendance.status, func.count(Attendance.id))
+            .where(
+                Attendance.employee_id.in_(employees),
+                Attendance.status.in_(["late", "half-day"]),
+                Attendance.check_in >= datetime.combine(start, datetime.min.time()),
+                Attendance.check_in < datetime.combine(end, datetime.min.time())
+            )
+            .group_by(Attendance.employee_id, Attendance.status)
+        )
+        for employee_id, status, count in result.all():
+            key = "late_days" if status == "late" else "half_days"
+            inputs[key][np.searchsorted(ids, employee_id)] = count
+        return inputs
+
+    @staticmethod
+    def calculate(inputs: Dict[str, np.ndarray], month: int, year: int) -> Dict[str, Any]:
+        """
+        Pay for every employee at once. Unpaid leave, half days and late check-ins
+        are charged at the daily rate (salary over the month's working days) and
+        never exceed the salary; the rest is taxed through the progressive brackets.
+        """
+        days = working_days(month, year)
+        base_salary = inputs["base_salary"]
+        daily_rate = base_salary / days
+        absent_days = np.minimum(inputs["unpaid_leave_days"] + 0.5 * inputs["half_days"], days)
+        leave_deduction = np.round(daily_rate * absent_days, 2)
+        lateness_deduction = np.round(daily_rate * inputs["late_days"] * settings.PAYROLL_LATE_DEDUCTION_DAYS, 2)
+        deductions = np.minimum(leave_deduction + lateness_deduction, base_salary)
+        taxable = base_salary + inputs["allowances"] - deductions
+        bracket_tax = np.round(progressive_tax(taxable, settings.PAYROLL_TAX_BRACKETS), 2)
+        tax = bracket_tax.sum(axis=1)
+        return {
+            **inputs,
+            "working_days": days,
+            "daily_rate": np.round(daily_rate, 2),
+            "leave_deduction": leave_deduction,
+            "lateness_deduction": lateness_deduction,
+            "deductions": np.round(deductions, 2),
+            "taxable": np.round(taxable, 2),
+            "bracket_tax": bracket_tax,
+            "tax": np.round(tax, 2),
+            "net_pay": np.round(taxable - tax, 2),
+        }
+
+    @staticmethod
+    async def compute(db: AsyncSession, employees: Any, month: int, year: int) -> Dict[str, Any]:
+        """Load inputs for `employees` (ids or a select of ids) and calculate their pay."""
+        return PayrollService.calculate(await PayrollService._inputs(db, employees, month, year), month, year)
+
+    @staticmethod
+    def totals(pay: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            column: round(float(pay[column].sum()), 2)
+            for column in ("base_salary", "allowances", "deductions", "tax", "net_pay")
+        }
+
+    @staticmethod
+    def _rows(pay: Dict[str, Any], payroll: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Bulk UPDATE parameters for (payroll id, employee id) pairs, breakdown included."""
+        columns = {
+            key: pay[key].tolist()
+            for key in (
+                "base_salary", "allowances", "deductions", "tax", "net_pay", "daily_rate", "unpaid_leave_days",
+                "half_days", "late_days", "leave_deduction", "lateness_deduction", "taxable", "bracket_tax"
+            )
+        }
+        index = np.searchsorted(pay["employee_id"], [employee_id for _, employee_id in payroll]).tolist()
+        rows = []
+        for (payroll_id, _), i in zip(payroll, index):
+            rows.append({
+                "id": payroll_id,
+                "base_salary": columns["base_salary"][i],
+                "allowances": columns["allowances"][i],
+                "deductions": columns["deductions"][i],
+                "tax": columns["tax"][i],
+                "net_pay": columns["net_pay"][i],
+                "breakdown": {
+                    "working_days": pay["working_days"],
+                    "daily_rate": columns["daily_rate"][i],
+                    "unpaid_leave_days": columns["unpaid_leave_days"][i],
+                    "half_days": columns["half_days"][i],
+                    "late_days": columns["late_days"][i],
+                    "leave_deduction": columns["leave_deduction"][i],
+                    "lateness_deduction": columns["lateness_deduction"][i],
+                    "taxable": columns["taxable"][i],
+                    "tax_by_bracket": columns["bracket_tax"][i],
+                },
+            })
+        return rows
+
+    @staticmethod
+    async def apply(db: AsyncSession, payroll: List[Tuple[int, int]], employees: Any, month: int, year: int) -> Dict[str, Any]:
+        """
+        Calculate pay for `employees` and store it on the (payroll id, employee id)
+        rows of the period with one bulk UPDATE. Does not commit.
+        """
+        pay = await PayrollService.compute(db, employees, month, year)
+        if payroll:
+            await db.execute(update(Payroll), PayrollService._rows(pay, payroll))
+        return pay
+
+    @staticmethod
+    async def recalculate(db: AsyncSession, month: int, year: int, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Recalculate every pending payroll row of the period from current salaries,
+        leave and attendance. Approved and paid rows are left as they are.
+        """
+        if not 1 <= month <= 12:
+            return {"error": "month must be between 1 and 12"}
+        pending = select(Payroll.id, Payroll.employee_id).where(
+            Payroll.month == month, Payroll.year == year, Payroll.status == "pending"
+        )
+        employees = pending.with_only_columns(Payroll.employee_id)
+        if dry_run:
+            payroll = []
+            pay = await PayrollService.compute(db, employees, month, year)
+        else:
+            payroll = [tuple(row) for row in (await db.execute(pending)).all()]
+            pay = await PayrollService.apply(db, payroll, employees, month, year)
+            await db.commit()
+        return {
+            "month": month,
+            "year": year,
+            "dry_run": dry_run,
+            "recalculated": len(pay["employee_id"]),
+            "totals": PayrollService.totals(pay),
+        }
+
+payroll_service = PayrollService()
@@ -0,0 +1,273 @@
+import asyncio
+import time
+from typing import Any, Dict, FrozenSet, List, Optional
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.course import Course, course_prerequisites
+from app.models.enrollment import Enrollment
+from app.models.grade import Grade
+from app.models.program import ProgramCourseAssociation
+from app.models.student import Student
+from app.utils.academic import calculate_course_total
+
+# Pairs with fewer co-takers than this carry no grade-correlation signal
+MIN_CO_TAKERS = 3
+# A stale model (grades changed) is rebuilt at most this often
+REBUILD_INTERVAL_SECONDS = 15 * 60
+
+def _course_totals(grade_rows: List[Any]) -> Dict[int, Dict[int, float]]:
+    """Weighted course totals keyed by student, then course."""
+    grouped: Dict[int, Dict[int, List[Any]]] = {}
+    for g in grade_rows:
+        grouped.setdefault(g.student_id, {}).setdefault(g.course_id, []).append(g)
+    return {
+        sid: {cid: calculate_course_total(grades) for cid, grades in courses.items()}
+        for sid, courses in grouped.items()
+    }
+
+class CourseRecommender:
+    """
+    Course-by-course co-enrollment counts and grade correlations built offline
+    from Enrollment and Grade, served from memory.
+    """
+    def __init__(self) -> None:
+        self.built_at: Optional[float] = None
+        self.stale = False
+        self._lock = asyncio.Lock()
+        self.course_ids = np.zeros(0, dtype=int)
+        self.index: Dict[int, int] = {}
+        self.courses: Dict[int, Dict[str, Any]] = {}
+        self.prerequisites: Dict[int, FrozenSet[int]] = {}
+        self.program_courses: Dict[int, np.ndarray] = {}
+        self.co_counts = np.zeros((0, 0), dtype=np.float32)
+        self.grade_corr = np.zeros((0, 0), dtype=np.float32)
+        self.course_counts = np.zeros(0, dtype=np.float32)
+        self.course_mean = np.zeros(0)
+        self.course_std = np.ones(0)
+        self.seats_taken: Dict[str, np.ndarray] = {}
+        self.current_term: Optional[str] = None
+        self.capacity = np.zeros(0, dtype=int)
+
+    async def build(self, db: AsyncSession) -> Dict[str, Any]:
+        started = time.perf_counter()
+        courses = (await db.execute(
+            select(Course.id, Course.code, Course.title, Course.capacity).order_by(Course.id)
+        )).all()
+        course_ids = np.array([c.id for c in courses], dtype=int)
+        index = {cid: i for i, cid in enumerate(course_ids.tolist())}
+        n = len(course_ids)
+
+        prerequisites: Dict[int, set] = {}
+        for cid, pid in (await db.execute(select(course_prerequisites.c.course_id, course_prerequisites.c.prerequisite_id))).all():
+            prerequisites.setdefault(cid, set()).add(pid)
+
+        program_courses: Dict[int, List[int]] = {}
+        for pid, cid in (await db.execute(select(ProgramCourseAssociation.program_id, ProgramCourseAssociation.course_id))).all():
+            if cid in index:
+                program_courses.setdefault(pid, []).append(index[cid])
+
+        # Capacity is per term, so seats are counted per term
+        seats_taken: Dict[str, np.ndarray] = {}
+        for term, cid, count in (await db.execute(
+            select(Enrollment.term, Enrollment.course_id, func.count(Enrollment.id))
+            .where(Enrollment.status == "enrolled")
+            .group_by(Enrollment.term, Enrollment.course_id)
+        )).all():
+            if cid in index:
+                seats_taken.setdefault(term, np.zeros(n, dtype=int))[index[cid]] = count
+        # The term of the latest enrollment is the one registration is open for
+        current_term = (await db.execute(select(Enrollment.term).order_by(Enrollment.id.desc()).limit(1))).scalar()
+
+        # Course history per student: enrolled courses plus any graded ones
+        history: Dict[int, set] = {}
+        for sid, cid in (await db.execute(
+            select(Enrollment.student_id, Enrollment.course_id).where(Enrollment.status != "dropped")
+        )).all():
+            history.setdefault(sid, set()).add(cid)
+        grade_rows = (await db.execute(
+            select(Grade.student_id, Grade.course_id, Grade.assessment_type, Grade.score, Grade.is_resit)
+            .order_by(Grade.id)
+        )).all()
+        totals = _course_totals(grade_rows)
+        for sid, course_totals in totals.items():
+            history.setdefault(sid, set()).update(course_totals)
+
+        # Per-course moments of the weighted totals, used to standardise grades
+        sums = np.zeros(n)
+        sq_sums = np.zeros(n)
+        graded = np.zeros(n)
+        for course_totals in totals.values():
+            for cid, total in course_totals.items():
+                if cid in index:
+                    i = index[cid]
+                    sums[i] += total
+                    sq_sums[i] += total * total
+                    graded[i] += 1
+        mean = np.divide(sums, graded, out=np.zeros(n), where=graded > 0)
+        var = np.divide(sq_sums, graded, out=np.zeros(n), where=graded > 0) - mean ** 2
+        std = np.sqrt(np.clip(var, 0, None))
+        std[std == 0] = 1.0
+
+        co_counts = np.zeros((n, n), dtype=np.float32)
+        corr_sums = np.zeros((n, n), dtype=np.float32)
+        for sid, cids in history.items():
+            idx = np.array([index[c] for c in cids if c in index], dtype=int)
+            if len(idx) < 2:
+                if len(idx) == 1:
+                    co_counts[idx[0], idx[0]] += 1
+                continue
+            student_totals = totals.get(sid, {})
+            z = np.array([
+                (student_totals[c] - mean[index[c]]) / std[index[c]] if c in student_totals else 0.0
+                for c in cids if c in index
+            ], dtype=np.float32)
+            block = np.ix_(idx, idx)
+            co_counts[block] += 1
+            corr_sums[block] += np.outer(z, z)
+
+        course_counts = np.diag(co_counts).copy()
+        np.fill_diagonal(co_counts, 0)
+        grade_corr = np.divide(corr_sums, co_counts, out=np.zeros_like(corr_sums), where=co_counts >= MIN_CO_TAKERS)
+        np.fill_diagonal(grade_corr, 0)
+
+        self.course_ids = course_ids
+        self.index = index
+        self.courses = {c.id: {"code": c.code, "title": c.title} for c in courses}
+        self.prerequisites = {cid: frozenset(pids) for cid, pids in prerequisites.items()}
+        self.program_courses = {pid: np.array(idx, dtype=int) for pid, idx in program_courses.items()}
+        self.co_counts = co_counts
+        self.grade_corr = np.clip(grade_corr, -1, 1)
+        self.course_counts = course_counts
+        self.course_mean = mean
+        self.course_std = std
+        self.seats_taken = seats_taken
+        self.current_term = current_term
+        self.capacity = np.array([c.capacity if c.capacity is not None else np.iinfo(np.int32).max for c in courses], dtype=int)
+        self.built_at = time.time()
+        self.stale = False
+        return {"courses": n, "students": len(history), "build_seconds": round(time.perf_counter() - started, 3)}
+
+    async def ensure_built(self, db: AsyncSession) -> None:
+        needs_build = self.built_at is None or (
+            self.stale and time.time() - self.built_at > REBUILD_INTERVAL_SECONDS
+        )
+        if not needs_build:
+            return
+        async with self._lock:
+            if self.built_at is None or self.stale:
+                await self.build(db)
+
+    def mark_stale(self) -> None:
+        """Grades or enrollments changed; correlations are refreshed on the next rebuild window."""
+        self.stale = True
+
+    def record_enrollment(self, course_id: int, other_course_ids: List[int], term: str) -> None:
+        """Fold a single new enrollment into the co-enrollment counts and the term's seat usage."""
+        if self.built_at is None or course_id not in self.index:
+            return
+        self.current_term = term
+        i = self.index[course_id]
+        others = np.array([self.index[c] for c in set(other_course_ids) if c in self.index and c != course_id], dtype=int)
+        if len(others):
+            self.co_counts[i, others] += 1
+            self.co_counts[others, i] += 1
+        self.course_counts[i] += 1
+        self.seats_taken.setdefault(term, np.zeros(len(self.course_ids), dtype=int))[i] += 1
+
+    def release_seat(self, course_id: int, term: str) -> None:
+        """An enrollment in the course was dropped or completed; its seat in the term is free."""
+        if self.built_at is not None and course_id in self.index and term in self.seats_taken:
+            i = self.index[course_id]
+            self.seats_taken[term][i] = max(self.seats_taken[term][i] - 1, 0)
+
+    async def recommend(
+        self, db: AsyncSession, student_id: int, limit: int = 3, term: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Courses for the student to take in `term` (default: the term of the latest enrollment)."""
+        await self.ensure_built(db)
+        seats_taken = self.seats_taken.get(term or self.current_term)
+
+        st_res = await db.execute(select(Student.id, Student.program_id).where(Student.id == student_id))
+        student = st_res.first()
+        if not student or not len(self.course_ids):
+            return []
+
+        taken = {cid for (cid,) in (await db.execute(
+            select(Enrollment.course_id).where(Enrollment.student_id == student_id, Enrollment.status != "dropped")
+        )).all()}
+        grade_rows = (await db.execute(
+            select(Grade.student_id, Grade.course_id, Grade.assessment_type, Grade.score, Grade.is_resit)
+            .where(Grade.student_id == student_id)
+            .order_by(Grade.id)
+        )).all()
+        totals = _course_totals(grade_rows).get(student_id, {})
+        taken.update(totals)
+        passed = {cid for cid, total in totals.items() if total >= 50}
+
+        history = [c for c in taken if c in self.index]
+        n = len(self.course_ids)
+        candidates = np.ones(n, dtype=bool)
+        if student.program_id in self.program_courses:
+            candidates[:] = False
+            candidates[self.program_courses[student.program_id]] = True
+        if history:
+            candidates[[self.index[c] for c in history]] = False
+        if seats_taken is not None:
+            candidates &= seats_taken < self.capacity
+        for cid, prereqs in self.prerequisites.items():
+            if cid in self.index and not prereqs <= passed:
+                candidates[self.index[cid]] = False
+        if not candidates.any():
+            return []
+
+        if history:
+            hist_idx = np.array([self.index[c] for c in history], dtype=int)
+            # Weight each past course by how well the student did in it (0.5 when ungraded)
+            weights = np.array([totals.get(c, 50.0) / 100.0 for c in history])
+            norm = np.sqrt(np.outer(self.course_counts[hist_idx], self.course_counts).clip(min=1))
+            similarity = self.co_counts[hist_idx] / norm
+            contributions = similarity * weights[:, None]
+            affinity = contributions.sum(axis=0)
+            peak = affinity[candidates].max() if candidates.any() else 0
+            affinity = affinity / peak if peak > 0 else affinity
+
+            z = np.array([
+                (totals[c] - self.course_mean[self.index[c]]) / self.course_std[self.index[c]] if c in totals else 0.0
+                for c in history
+            ])
+            predicted = z @ self.grade_corr[hist_idx] / len(history)
+            expected = np.clip(0.5 + 0.25 * predicted, 0, 1)
+            top_source = hist_idx[contributions.argmax(axis=0)]
+        else:
+            # No history: fall back to course popularity
+            peak = self.course_counts.max()
+            affinity = self.course_counts / peak if peak > 0 else np.zeros(n)
+            expected = np.full(n, 0.5)
+            top_source = None
+
+        scores = np.where(candidates, 100 * (0.6 * affinity + 0.4 * expected), -np.inf)
+        k = min(limit, int(candidates.sum()))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        recommendations = []
+        for i in top:
+            course_id = int(self.course_ids[i])
+            if top_source is not None and affinity[i] > 0:
+                source = self.courses[int(self.course_ids[top_source[i]])]
+                reason = f"Frequently taken with {source['code']}."
+            else:
+                reason = "Popular with other students."
+            if expected[i] > 0.6:
+                reason += " Strong predicted performance based on related grades."
+            recommendations.append({
+                "course_id": course_id,
+                "title": self.courses[course_id]["title"],
+                "code": self.courses[course_id]["code"],
+                "match_score": round(float(scores[i]), 1),
+                "reason": reason
+            })
+        return recommendations
+
+course_recommender = CourseRecommender()
@@ -0,0 +1,275 @@
+import csv
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from datetime import datetime
+from sqlalchemy import select, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.payment import Payment
+from app.models.reconciliation import BankStatementImport, ReconciliationItem
+from app.models.student import Student
+from app.models.tuition_invoice import TuitionInvoice
+from app.schemas.payment import PaymentCreate
+from app.services.finance_service import finance_service
+from app.utils.bank_statement import PARSERS, invoice_refs, tokens
+
+def _cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+class _InvoiceIndex:
+    """
+    Open invoices hashed by id, student matricule and outstanding amount. Built
+    once per import; its size depends on open invoices, not on the statement.
+    Outstanding amounts are drawn down as lines match, so later lines in the same
+    file see earlier matches.
+    """
+    def __init__(self, rows: List[Tuple[int, Optional[str], float]]) -> None:
+        self.outstanding: Dict[int, float] = {}
+        self.by_matricule: Dict[str, List[int]] = {}
+        self.by_amount: Dict[int, Set[int]] = {} # cents owed -> open invoices owing exactly that
+        for invoice_id, matricule, owed in rows:
+            if owed <= 0:
+                continue
+            self.outstanding[invoice_id] = owed
+            if matricule:
+                self.by_matricule.setdefault(matricule.upper(), []).append(invoice_id)
+            self.by_amount.setdefault(_cents(owed), set()).add(invoice_id)
+
+    def match(self, line: Dict[str, Any]) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+        """(invoice id, match method, None) for a match, else (None, None, reason)."""
+        text = " ".join(filter(None, [line["reference"], line["description"]]))
+        refs = invoice_refs(text)
+        for invoice_id in refs:
+            if invoice_id in self.outstanding:
+                return invoice_id, "invoice_ref", None
+
+        for token in tokens(text):
+            for invoice_id in self.by_matricule.get(token, []):
+                if invoice_id in self.outstanding:
+                    return invoice_id, "matricule", None
+
+        candidates = self.by_amount.get(_cents(line["amount"]), set())
+        if len(candidates) == 1:
+            return next(iter(candidates)), "amount", None
+        if candidates:
+            return None, None, f"Amount matches {len(candidates)} open invoices"
+        if refs:
+            return None, None, f"Invoice INV-{refs[0]} is not open"
+        return None, None, "No matching invoice"
+
+    def draw_down(self, invoice_id: int, amount: float) -> None:
+        owed = self.outstanding[invoice_id]
+        self.by_amount[_cents(owed)].discard(invoice_id)
+        owed = round(owed - amount, 2)
+        if owed > 0:
+            self.outstanding[invoice_id] = owed
+            self.by_amount.setdefault(_cents(owed), set()).add(invoice_id)
+        else:
+            del self.outstanding[invoice_id]
+
+class ReconciliationService:
+    CHUNK = 1000
+
+    @staticmethod
+    async def _build_index(db: AsyncSession) -> _InvoiceIndex:
+        owed = (
+            TuitionInvoice.amount_due
+            + func.coalesce(TuitionInvoice.late_fee_accumulated, 0.0)
+            - func.coalesce(TuitionInvoice.amount_paid, 0.0)
+            - func.coalesce(TuitionInvoice.scholarship_credit, 0.0)
+        )
+        result = await db.execute(
+            select(TuitionInvoice.id, Student.matricule, owed)
+            .join(Student, Student.id == TuitionInvoice.student_id)
+            .where(TuitionInvoice.status != "paid")
+            .order_by(TuitionInvoice.due_date, TuitionInvoice.id)
+        )
+        return _InvoiceIndex(result.all())
+
+    @staticmethod
+    async def _process_chunk(
+        db: AsyncSession,
+        statement: BankStatementImport,
+        lines: List[Dict[str, Any]],
+        index: _InvoiceIndex
+    ) -> None:
+        """Match a chunk of lines, post the matches as one payment batch and store the items."""
+        result = await db.execute(
+            select(Payment).where(Payment.idempotency_key.in_([line["key"] for line in lines]))
+        )
+        recorded = {p.idempotency_key: p for p in result.scalars().all()}
+
+        items: List[Dict[str, Any]] = []
+        to_post: List[int] = []
+        skipped = 0
+        for line in lines:
+            if line["error"] is None and line["amount"] <= 0:
+                skipped += 1
+                continue
+            item = {
+                "import_id": statement.id,
+                "line_no": line["line_no"],
+                "idempotency_key": line["key"],
+                "txn_date": line["txn_date"],
+                "amount": line["amount"],
+                "reference": line["reference"],
+                "description": line["description"],
+                "status": "unmatched",
+                "match_method": None,
+                "reason": line["error"],
+                "invoice_id": None,
+                "payment_id": None,
+            }
+            prior = recorded.get(line["key"])
+            if prior is not None:
+                # Line from a statement imported before; its payment already exists
+                item.update(status="matched", match_method="previous_import", invoice_id=prior.invoice_id, payment_id=prior.id)
+            elif line["error"] is None:
+                invoice_id, method, reason = index.match(line)
+                if invoice_id is None:
+                    item["reason"] = reason
+                else:
+                    index.draw_down(invoice_id, line["amount"])
+                    item.update(status="matched", match_method=method, invoice_id=invoice_id)
+                    to_post.append(len(items))
+            items.append(item)
+
+        if to_post:
+            result = await finance_service.record_payments(db, [
+                PaymentCreate(invoice_id=items[i]["invoice_id"], amount=items[i]["amount"], idempotency_key=items[i]["idempotency_key"])
+                for i in to_post
+            ])
+            errors = {e["index"]: e["error"] for e in result["errors"]}
+            for n, (i, payment) in enumerate(zip(to_post, result["payments"])):
+                if payment is None:
+                    items[i].update(status="unmatched", match_method=None, invoice_id=None, reason=errors.get(n))
+                else:
+                    items[i]["payment_id"] = payment.id
+
+        if items:
+            # render_nulls keeps rows with different NULL columns in one executemany batch
+            await db.execute(insert(ReconciliationItem).execution_options(render_nulls=True), items)
+        # The payment batch committed (or rolled back and retried), so reload before counting
+        await db.refresh(statement)
+        statement.total_lines += len(lines)
+        statement.skipped += skipped
+        for item in items:
+            if item["status"] == "matched":
+                statement.matched += 1
+                statement.amount_matched = round(statement.amount_matched + item["amount"], 2)
+            else:
+                statement.unmatched += 1
+        await db.commit()
+
+    @staticmethod
+    async def import_statement(
+        db: AsyncSession,
+        lines: Iterator[str],
+        *,
+        format: str,
+        filename: Optional[str] = None,
+        imported_by: Optional[int] = None
+    ) -> BankStatementImport:
+        """
+        Reconcile a bank statement streamed line by line. Lines are parsed lazily and
+        handled CHUNK at a time: matched credits go through the payment path as one
+        batch per chunk, keyed per line so re-importing a file pays nothing twice,
+        and everything else lands in the review queue.
+        """
+        statement = BankStatementImport(
+            filename=filename, format=format, status="running",
+            total_lines=0, matched=0, unmatched=0, skipped=0, amount_matched=0.0,
+            imported_by=imported_by
+        )
+        db.add(statement)
+        await db.commit()
+        await db.refresh(statement)
+
+        try:
+            index = await ReconciliationService._build_index(db)
+            chunk: List[Dict[str, Any]] = []
+            for line in PARSERS[format](lines):
+                chunk.append(line)
+                if len(chunk) >= ReconciliationService.CHUNK:
+                    await ReconciliationService._process_chunk(db, statement, chunk, index)
+                    chunk = []
+            if chunk:
+                await ReconciliationService._process_chunk(db, statement, chunk, index)
+            statement.status = "completed"
+        except (ValueError, UnicodeError, csv.Error) as e:
+            await db.rollback()
+            await db.refresh(statement)
+            statement.status = "failed"
+            statement.error = str(e)
+        except Exception as e:
+            # Never leave the import "running"; record the failure and let the error surface
+            await db.rollback()
+            await db.refresh(statement)
+            statement.status = "failed"
+            statement.error = str(e)
+            statement.finished_at = datetime.now()
+            await db.commit()
+            raise
+        statement.finished_at = datetime.now()
+        await db.commit()
+        await db.refresh(statement)
+        return statement
+
+    @staticmethod
+    async def get_review_queue(
+        db: AsyncSession,
+        *,
+        status: str = "unmatched",
+        import_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[ReconciliationItem]:
+        stmt = select(ReconciliationItem).where(ReconciliationItem.status == status)
+        if import_id is not None:
+            stmt = stmt.where(ReconciliationItem.import_id == import_id)
+        result = await db.execute(stmt.order_by(ReconciliationItem.import_id, ReconciliationItem.line_no).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    @staticmethod
+    async def resolve_item(db: AsyncSession, item_id: int, invoice_id: int):
+        """Apply an unmatched line to an invoice chosen by hand."""
+        item = await db.get(ReconciliationItem, item_id)
+        if not item:
+            return {"error": "Reconciliation item not found"}
+        if item.status != "unmatched":
+            return {"error": f"Item is already {item.status}"}
+        if item.amount is None or item.amount <= 0:
+            return {"error": "Item has no payable amount"}
+
+        payment = await finance_service.record_payment(
+            db, invoice_id=invoice_id, amount=item.amount, idempotency_key=item.idempotency_key
+        )
+        if isinstance(payment, dict):
+            return payment
+        item.status = "resolved"
+        item.match_method = "manual"
+        item.reason = None
+        item.invoice_id = invoice_id
+        item.payment_id = payment.id
+        statement = await db.get(BankStatementImport, item.import_id)
+        statement.unmatched -= 1
+        statement.matched += 1
+        statement.amount_matched = round(statement.amount_matched + item.amount, 2)
+        await db.commit()
+        await db.refresh(item)
+        return item
+
+    @staticmethod
+    async def ignore_item(db: AsyncSession, item_id: int, reason: Optional[str] = None):
+        """Take a line that is not a tuition payment out of the review queue."""
+        item = await db.get(ReconciliationItem, item_id)
+        if not item:
+            return {"error": "Reconciliation item not found"}
+        if item.status != "unmatched":
+            return {"error": f"Item is already {item.status}"}
+        item.status = "ignored"
+        if reason:
+            item.reason = reason
+        await db.commit()
+        await db.refresh(item)
+        return item
+
+reconciliation_service = ReconciliationService()
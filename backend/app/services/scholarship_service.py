@@ -0,0 +1,177 @@
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import select, update, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.crud_finance_ext import installment as crud_installment
+from app.crud.crud_scholarship import scholarship as crud_scholarship
+from app.db.upsert import upsert_increment
+from app.models.scholarship import Scholarship, ScholarshipAllocation
+from app.models.student import Student
+from app.models.tuition_invoice import TuitionInvoice
+from app.schemas.scholarship import ScholarshipUpdate
+from app.services.ledger_service import ledger_service
+from app.utils.installments import to_cents
+
+class ScholarshipService:
+    CHUNK = 1000
+
+    @staticmethod
+    def _remaining(program_ids: Optional[List[int]]):
+        """Scholarships with an unallocated amount left, for students of the given programs."""
+        allocated = (
+            select(ScholarshipAllocation.scholarship_id, func.sum(ScholarshipAllocation.amount).label("allocated"))
+            .group_by(ScholarshipAllocation.scholarship_id)
+            .subquery()
+        )
+        remaining = Scholarship.amount - func.coalesce(allocated.c.allocated, 0.0)
+        stmt = (
+            select(Scholarship.id, Scholarship.student_id, remaining.label("remaining"))
+            .outerjoin(allocated, allocated.c.scholarship_id == Scholarship.id)
+            .where(remaining >= 0.01)
+        )
+        if program_ids is not None:
+            stmt = stmt.join(Student, Student.id == Scholarship.student_id).where(Student.program_id.in_(program_ids))
+        return stmt
+
+    @staticmethod
+    async def _credit_invoices(db: AsyncSession, credits: Dict[int, float]) -> Set[int]:
+        """
+        Add scholarship credit to invoices with one conditional UPDATE ... RETURNING per
+        chunk, deriving the status in SQL as payments do. Invoices paid off meanwhile
+        are left out of the result and get no credit.
+        """
+        credited: Set[int] = set()
+        invoice_ids = list(credits)
+        for start in range(0, len(invoice_ids), ScholarshipService.CHUNK):
+            chunk = {invoice_id: credits[invoice_id] for invoice_id in invoice_ids[start:start + ScholarshipService.CHUNK]}
+            credit = func.coalesce(TuitionInvoice.scholarship_credit, 0.0) + case(chunk, value=TuitionInvoice.id, else_=0.0)
+            settled = func.coalesce(TuitionInvoice.amount_paid, 0.0) + credit
+            owed = TuitionInvoice.amount_due + func.coalesce(TuitionInvoice.late_fee_accumulated, 0.0)
+            result = await db.execute(
+                update(TuitionInvoice)
+                .where(TuitionInvoice.id.in_(chunk), TuitionInvoice.status != "paid")
+                .values(
+                    scholarship_credit=credit,
+                    status=case((settled >= owed, "paid"), (settled > 0, "partial"), else_=TuitionInvoice.status)
+                )
+                .returning(TuitionInvoice.id)
+                .execution_options(synchronize_session=False)
+            )
+            credited.update(result.scalars().all())
+        return credited
+
+    @staticmethod
+    async def net_scholarships(db: AsyncSession, program_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Credit every unallocated scholarship amount against its student's open invoices,
+        oldest due first, for whole programs at once (all programs when None). The
+        remaining amounts and open balances come from two grouped queries. Invoices are
+        credited with bulk conditional updates, the credit is spread over their
+        installments as payments are, and each application is recorded as a
+        ScholarshipAllocation. Only what is still unallocated gets applied, so reruns
+        add nothing. Does not commit.
+        """
+        remaining = (await db.execute(
+            ScholarshipService._remaining(program_ids).order_by(Scholarship.student_id, Scholarship.id)
+        )).all()
+        if not remaining:
+            return {"allocations": 0, "invoices_credited": 0, "amount_applied": 0.0}
+
+        open_balance = (
+            TuitionInvoice.amount_due
+            + func.coalesce(TuitionInvoice.late_fee_accumulated, 0.0)
+            - func.coalesce(TuitionInvoice.amount_paid, 0.0)
+            - func.coalesce(TuitionInvoice.scholarship_credit, 0.0)
+        )
+        students = ScholarshipService._remaining(program_ids).with_only_columns(Scholarship.student_id)
+        result = await db.execute(
+            select(TuitionInvoice.id, TuitionInvoice.student_id, open_balance)
+            .where(TuitionInvoice.student_id.in_(students), TuitionInvoice.status != "paid", open_balance >= 0.01)
+            .order_by(TuitionInvoice.student_id, TuitionInvoice.due_date.is_(None), TuitionInvoice.due_date, TuitionInvoice.id)
+        )
+        open_invoices: Dict[int, List[List[int]]] = {}
+        for invoice_id, student_id, balance in result.all():
+            open_invoices.setdefault(student_id, []).append([invoice_id, to_cents(balance)])
+
+        # Greedy in whole cents: each scholarship fills the student's oldest open invoices
+        allocations: List[Dict[str, Any]] = []
+        for scholarship_id, student_id, amount in remaining:
+            left = to_cents(amount)
+            for invoice in open_invoices.get(student_id, []):
+                if left <= 0:
+                    break
+                applied = min(left, invoice[1])
+                if applied <= 0:
+                    continue
+                invoice[1] -= applied
+                left -= applied
+                allocations.append({"scholarship_id": scholarship_id, "invoice_id": invoice[0], "amount": applied / 100})
+
+        credits: Dict[int, float] = {}
+        for allocation in allocations:
+            credits[allocation["invoice_id"]] = round(credits.get(allocation["invoice_id"], 0.0) + allocation["amount"], 2)
+        credited = await ScholarshipService._credit_invoices(db, credits) if credits else set()
+        allocations = [a for a in allocations if a["invoice_id"] in credited]
+        if credited:
+            # Credit settles installments like a payment, so covered ones are not swept overdue
+            await crud_installment.allocate(db, {invoice_id: credits[invoice_id] for invoice_id in credited})
+
+        for start in range(0, len(allocations), ScholarshipService.CHUNK):
+            await upsert_increment(
+                db,
+                ScholarshipAllocation,
+                allocations[start:start + ScholarshipService.CHUNK],
+                index_elements=["scholarship_id", "invoice_id"],
+                increment=["amount"]
+            )
+        total = round(sum(a["amount"] for a in allocations), 2)
+        if allocations:
+            await ledger_service.post_scholarship_batch(db, total=total, count=len(allocations))
+        return {"allocations": len(allocations), "invoices_credited": len(credited), "amount_applied": total}
+
+    @staticmethod
+    async def apply_scholarships(db: AsyncSession, program_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        result = await ScholarshipService.net_scholarships(db, program_ids)
+        await db.commit()
+        return result
+
+    @staticmethod
+    async def _allocated(db: AsyncSession, scholarship: Scholarship) -> float:
+        """Amount of the scholarship already credited to invoices, holding its row until commit."""
+        await db.execute(select(Scholarship.id).where(Scholarship.id == scholarship.id).with_for_update())
+        result = await db.execute(
+            select(func.coalesce(func.sum(ScholarshipAllocation.amount), 0.0))
+            .where(ScholarshipAllocation.scholarship_id == scholarship.id)
+        )
+        return round(result.scalar(), 2)
+
+    @staticmethod
+    async def update_scholarship(db: AsyncSession, scholarship: Scholarship, obj_in: ScholarshipUpdate):
+        """
+        Edit a scholarship. Credited amounts stay on their invoices and in the journal,
+        so the amount cannot drop below what is allocated, nor move to another student.
+        """
+        update_data = obj_in.model_dump(exclude_unset=True)
+        allocated = await ScholarshipService._allocated(db, scholarship)
+        if allocated:
+            if update_data.get("amount") is not None and round(update_data["amount"], 2) < allocated:
+                return {"error": f"Scholarship amount cannot be below the {allocated:.2f} already allocated"}
+            if update_data.get("student_id") not in (None, scholarship.student_id):
+                return {"error": "Scholarship is already allocated; its student cannot change"}
+        return await crud_scholarship.update(db, db_obj=scholarship, obj_in=update_data)
+
+    @staticmethod
+    async def delete_scholarship(db: AsyncSession, scholarship: Scholarship):
+        if await ScholarshipService._allocated(db, scholarship):
+            return {"error": "Scholarship is already allocated to invoices and cannot be deleted"}
+        return await crud_scholarship.remove(db, id=scholarship.id)
+
+    @staticmethod
+    async def get_allocations(db: AsyncSession, scholarship_id: int) -> List[ScholarshipAllocation]:
+        result = await db.execute(
+            select(ScholarshipAllocation)
+            .where(ScholarshipAllocation.scholarship_id == scholarship_id)
+            .order_by(ScholarshipAllocation.id)
+        )
+        return result.scalars().all()
+
+scholarship_service = ScholarshipService()
@@ -0,0 +1,113 @@
+from typing import Any, AsyncIterator, Optional, Sequence
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal
+from app.models.payment import Payment
+from app.models.student import Student
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionDailyRollup
+from app.models.tuition_invoice import TuitionInvoice
+from app.utils.export import csv_header, encode_rows
+
+STATEMENT_COLUMNS = {
+    "transactions": ["id", "date", "description", "category", "type", "amount", "balance"],
+    "payments": ["id", "received_at", "invoice_id", "student_id", "matricule", "amount", "balance"],
+}
+
+class StatementService:
+    YIELD_PER = 2000
+
+    @staticmethod
+    def _bounds(start_date: Optional[date], end_date: Optional[date]):
+        start = datetime.combine(start_date, time.min) if start_date else None
+        end = datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None
+        return start, end
+
+    @staticmethod
+    async def _opening_balance(db: AsyncSession, source: str, start_date: Optional[date], category: Optional[str]) -> float:
+        """Balance carried into the range: net rollup totals before it, or payments received before it."""
+        if start_date is None:
+            return 0.0
+        if source == "transactions":
+            signed = case(
+                (TransactionDailyRollup.type == "income", TransactionDailyRollup.total),
+                (TransactionDailyRollup.type == "expense", -TransactionDailyRollup.total),
+                else_=0.0
+            )
+            stmt = select(func.sum(signed)).where(TransactionDailyRollup.day < start_date)
+            if category is not None:
+                stmt = stmt.where(TransactionDailyRollup.category == category)
+        else:
+            stmt = select(func.sum(Payment.amount)).where(Payment.received_at < StatementService._bounds(start_date, None)[0])
+        return (await db.execute(stmt)).scalar() or 0.0
+
+    @staticmethod
+    def _query(source: str, start_date: Optional[date], end_date: Optional[date], category: Optional[str], opening: float):
+        """Statement rows in order with the running balance computed by a window function."""
+        start, end = StatementService._bounds(start_date, end_date)
+        if source == "transactions":
+            signed = case(
+                (Transaction.type == "income", Transaction.amount),
+                (Transaction.type == "expense", -Transaction.amount),
+                else_=0.0
+            )
+            order = (Transaction.date, Transaction.id)
+            stmt = select(
+                Transaction.id, Transaction.date, Transaction.description, Transaction.category,
+                Transaction.type, Transaction.amount,
+                (opening + func.sum(signed).over(order_by=order)).label("balance")
+            )
+            if category is not None:
+                stmt = stmt.where(Transaction.category == category)
+            column = Transaction.date
+        else:
+            order = (Payment.received_at, Payment.id)
+            stmt = (
+                select(
+                    Payment.id, Payment.received_at, Payment.invoice_id, TuitionInvoice.student_id,
+                    Student.matricule, Payment.amount,
+                    (opening + func.sum(Payment.amount).over(order_by=order)).label("balance")
+                )
+                .join(TuitionInvoice, TuitionInvoice.id == Payment.invoice_id)
+                .join(Student, Student.id == TuitionInvoice.student_id)
+            )
+            column = Payment.received_at
+        if start is not None:
+            stmt = stmt.where(column >= start)
+        if end is not None:
+            stmt = stmt.where(column < end)
+        return stmt.order_by(*order)
+
+    @staticmethod
+    def _format_row(row: Sequence[Any]) -> list:
+        row = list(row)
+        row[-1] = round(row[-1] or 0.0, 2)
+        return row
+
+    @staticmethod
+    async def export(
+        *,
+        source: str,
+        format: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a statement as CSV or NDJSON. Rows come off a server-side cursor
+        YIELD_PER at a time and are written out partition by partition, so memory
+        stays flat however long the range is. Runs in its own session because it
+        outlives the request handler.
+        """
+        columns = STATEMENT_COLUMNS[source]
+        async with AsyncSessionLocal() as db:
+            opening = await StatementService._opening_balance(db, source, start_date, category)
+            stmt = StatementService._query(source, start_date, end_date, category, opening)
+            if format == "csv":
+                yield csv_header(columns)
+            result = await db.stream(stmt.execution_options(yield_per=StatementService.YIELD_PER))
+            async for partition in result.partitions():
+                yield encode_rows(format, columns, [StatementService._format_row(row) for row in partition])
+
+statement_service = StatementService()
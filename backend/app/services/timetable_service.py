@@ -0,0 +1,211 @@
+import asyncio
+import queue
+import time
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.crud_batch_job import batch_job as crud_batch_job
+from app.models.batch_job import BatchJob
+from app.models.course import Course, course_corequisites
+from app.models.enrollment import Enrollment
+from app.models.timetable import TimetableEntry
+from app.schemas.timetable import TimetableGenerate
+from app.utils.timetable import COREQUISITE_WEIGHT, TimetableSolver, add_conflict
+
+class TimetableService:
+    TIMETABLE_JOB = "timetable"
+    PROGRESS_INTERVAL = 1.0 # Seconds between progress commits
+
+    @staticmethod
+    def _solve(solver: TimetableSolver, time_limit: float, progress: "queue.SimpleQueue") -> Dict[str, Any]:
+        """Run the solver and room assignment; meant for a worker thread, progress goes to the queue."""
+        for step in solver.solve(time_limit=time_limit):
+            progress.put(step)
+        return {"seats": solver.assign_rooms(), "clashes": solver.clashes()}
+
+    @staticmethod
+    async def get_timetable_job(db: AsyncSession, term: str) -> BatchJob:
+        """
+        The term's unfinished timetable job, or a new pending one. A job still
+        running with a live heartbeat is returned as is; claim_timetable_job
+        refuses it, so a term is never solved by two workers at once.
+        """
+        job = await crud_batch_job.get_unfinished(db, name=TimetableService.TIMETABLE_JOB, scope=term)
+        if job:
+            return job
+        job = BatchJob(name=TimetableService.TIMETABLE_JOB, scope=term, status="pending", detail={"phase": "pending"})
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def claim_timetable_job(db: AsyncSession, job: BatchJob, request: TimetableGenerate) -> bool:
+        """
+        Claim the job for a run with these solver settings, which travel in the job
+        detail. A crashed run (no heartbeat) is taken over and starts afresh.
+        """
+        total = (await db.execute(
+            select(func.count(func.distinct(Enrollment.course_id))).where(
+                Enrollment.term == request.term,
+                Enrollment.status == "enrolled"
+            )
+        )).scalar() or 0
+        return await crud_batch_job.claim(
+            db, job,
+            total=total, processed=0, elapsed_seconds=0.0, started_at=datetime.now(),
+            detail={"phase": "pending", "request": request.model_dump()}
+        )
+
+    @staticmethod
+    async def _load_problem(db: AsyncSession, term: str) -> Dict[str, Any]:
+        """Sections offered in a term and the student/co-requisite conflicts between them."""
+        result = await db.execute(
+            select(Course.id, Course.hours_per_week, Course.capacity, func.count(Enrollment.id))
+            .join(Enrollment, Enrollment.course_id == Course.id)
+            .where(Enrollment.term == term, Enrollment.status == "enrolled")
+            .group_by(Course.id, Course.hours_per_week, Course.capacity)
+        )
+        sections = {
+            cid: {"hours": hours or 1, "size": max(capacity or 0, enrolled)}
+            for cid, hours, capacity, enrolled in result.all()
+        }
+
+        conflicts: Dict[int, Dict[int, int]] = {}
+        result = await db.execute(
+            select(Enrollment.student_id, Enrollment.course_id)
+            .where(Enrollment.term == term, Enrollment.status == "enrolled")
+            .order_by(Enrollment.student_id)
+        )
+        current_student, current_courses = None, []
+        for student_id, course_id in result.all():
+            if student_id != current_student:
+                current_student, current_courses = student_id, []
+            for other in current_courses:
+                add_conflict(conflicts, course_id, other)
+            current_courses.append(course_id)
+
+        result = await db.execute(select(course_corequisites.c.course_id, course_corequisites.c.corequisite_id))
+        for course_id, corequisite_id in result.all():
+            if course_id in sections and corequisite_id in sections:
+                add_conflict(conflicts, course_id, corequisite_id, COREQUISITE_WEIGHT)
+        return {"sections": sections, "conflicts": conflicts}
+
+    @staticmethod
+    async def run_timetable(db: AsyncSession, job: BatchJob) -> BatchJob:
+        """
+        Solve and store the timetable for the job's term. The caller claims the job
+        first (claim_timetable_job). Solver progress is committed to the job as it
+        goes so it can be polled; each commit is a heartbeat.
+        """
+        request = TimetableGenerate(**job.detail["request"])
+
+        try:
+            started = time.perf_counter()
+            problem = await TimetableService._load_problem(db, request.term)
+            solver = TimetableSolver(
+                problem["sections"],
+                problem["conflicts"],
+                days=len(request.days),
+                periods_per_day=request.periods_per_day,
+                rooms=[(r.name, r.capacity) for r in request.rooms] if request.rooms else None
+            )
+            job.total = len(problem["sections"])
+
+            # The solver is CPU-bound, so it runs in a thread; the loop only commits progress
+            progress: queue.SimpleQueue = queue.SimpleQueue()
+            solving = asyncio.create_task(asyncio.to_thread(
+                TimetableService._solve, solver, request.time_limit_seconds, progress
+            ))
+            while True:
+                done, _ = await asyncio.wait({solving}, timeout=TimetableService.PROGRESS_INTERVAL)
+                latest = None
+                while not progress.empty():
+                    latest = progress.get_nowait()
+                    if latest["phase"] == "construct":
+                        job.processed = latest["placed"]
+                if done:
+                    break
+                if latest is not None:
+                    job.detail = {**job.detail, **latest}
+                job.elapsed_seconds = time.perf_counter() - started
+                job.updated_at = datetime.now()
+                await db.commit()
+            solved = solving.result()
+            seats = solved["seats"]
+            rows = [
+                {
+                    "term": request.term,
+                    "course_id": cid,
+                    "day": request.days[slot // request.periods_per_day],
+                    "period": slot % request.periods_per_day,
+                    "room": seats.get((cid, slot)),
+                    "job_id": job.id,
+                }
+                for cid, slots in solver.assignment.items()
+                for slot in slots
+            ]
+            await db.execute(delete(TimetableEntry).where(TimetableEntry.term == request.term))
+            if rows:
+                await db.execute(insert(TimetableEntry), rows)
+
+            clashes = solved["clashes"]
+            job.processed = len(problem["sections"])
+            job.detail = {
+                **job.detail,
+                "phase": "done",
+                "meetings": len(rows),
+                "clashes": len(clashes),
+                "unseated": sum(1 for room in seats.values() if room is None) if request.rooms else 0,
+            }
+            job.elapsed_seconds = time.perf_counter() - started
+            job.status = "completed"
+            job.finished_at = datetime.now()
+            job.updated_at = job.finished_at
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            await db.refresh(job)
+            job.status = "failed"
+            job.error = str(e)
+            job.updated_at = datetime.now()
+            await db.commit()
+            raise
+
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_timetable(db: AsyncSession, term: str, course_id: Optional[int] = None) -> List[TimetableEntry]:
+        stmt = select(TimetableEntry).where(TimetableEntry.term == term)
+        if course_id is not None:
+            stmt = stmt.where(TimetableEntry.course_id == course_id)
+        result = await db.execute(stmt.order_by(TimetableEntry.course_id, TimetableEntry.day, TimetableEntry.period))
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_clashes(db: AsyncSession, *, student_id: int, course_id: int, term: str) -> List[Dict[str, Any]]:
+        """
+        Slots where `course_id` meets at the same time as a course the student is
+        already enrolled in for the term. Only the two courses' entries are read.
+        """
+        course_slots = select(TimetableEntry.day, TimetableEntry.period).where(
+            TimetableEntry.term == term,
+            TimetableEntry.course_id == course_id
+        ).subquery()
+        result = await db.execute(
+            select(TimetableEntry.course_id, TimetableEntry.day, TimetableEntry.period)
+            .join(course_slots, (course_slots.c.day == TimetableEntry.day) & (course_slots.c.period == TimetableEntry.period))
+            .join(Enrollment, (Enrollment.course_id == TimetableEntry.course_id) & (Enrollment.term == term))
+            .where(
+                TimetableEntry.term == term,
+                TimetableEntry.course_id != course_id,
+                Enrollment.student_id == student_id,
+                Enrollment.status == "enrolled"
+            )
+            .order_by(TimetableEntry.day, TimetableEntry.period)
+        )
+        return [{"course_id": cid, "day": day, "period": period} for cid, day, period in result.all()]
+
+timetable_service = TimetableService()
@@ -30,17 +30,24 @@ def calculate_course_total(grades: List[Grade]) -> float:
     
     return (avg_ca * 0.3) + (final_score * 0.7)
 
+# ICT 4.0 GPA scale: (minimum total score, grade point)
+GRADE_POINT_SCALE = [
+    (80, 4.0), # A
+    (70, 3.5), # B+
+    (60, 3.0), # B
+    (55, 2.5), # C+
+    (50, 2.0), # C
+    (45, 1.5), # D+
+    (40, 1.0), # D
+]
+
 def get_grade_point(total_score: float) -> float:
     """
     Convert 0-100 score to ICT 4.0 GPA scale.
     """
-    if total_score >= 80: return 4.0 # A
-    if total_score >= 70: return 3.5 # B+
-    if total_score >= 60: return 3.0 # B
-    if total_score >= 55: return 2.5 # C+
-    if total_score >= 50: return 2.0 # C
-    if total_score >= 45: return 1.5 # D+
-    if total_score >= 40: return 1.0 # D
+    for min_score, grade_point in GRADE_POINT_SCALE:
+        if total_score >= min_score:
+            return grade_point
     return 0.0 # F
 
 def get_classification(cgpa: float) -> str:
@@ -115,7 +122,8 @@ def is_fee_cleared(invoice: TuitionInvoice) -> bool:
     Rule 1.1: 50% "First Installment" fee clearance for Active status.
     """
     if not invoice: return False
-    return invoice.amount_paid >= (0.5 * invoice.amount_due)
+    # Scholarship credit counts towards clearance like a payment
+    return (invoice.amount_paid or 0.0) + (invoice.scholarship_credit or 0.0) >= (0.5 * invoice.amount_due)
 
 def is_barred_from_final(grades: List[Grade]) -> bool:
     """
@@ -138,3 +146,13 @@ def check_max_stay(enrollment_date: date) -> bool:
     if not enrollment_date: return True
     years_stayed = (datetime.now().date() - enrollment_date).days / 365.25
     return years_stayed <= 7.0
+
+def is_resit_eligible(grades: List[Grade]) -> bool:
+    """
+    Rule 3.1: Resit allowed after a failed Final Exam (total < 50) with no resit taken yet.
+    """
+    if not any(g.assessment_type == "Final" and not g.is_resit for g in grades):
+        return False
+    if any(g.is_resit for g in grades):
+        return False
+    return calculate_course_total(grades) < 50
@@ -0,0 +1,29 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+
+# (label, first day overdue, last day overdue); None means open-ended
+AGING_BUCKETS: List[Tuple[str, int, Optional[int]]] = [
+    ("1-30", 1, 30),
+    ("31-60", 31, 60),
+    ("61-90", 61, 90),
+    ("90+", 91, None),
+]
+
+def bucket_bounds(as_of: datetime) -> List[Tuple[str, Optional[datetime], datetime]]:
+    """
+    Due-date ranges per aging bucket as (label, oldest, newest): a due date d is in
+    the bucket when oldest <= d < newest. Plain comparisons keep the SQL portable.
+    """
+    bounds = []
+    for label, first_day, last_day in AGING_BUCKETS:
+        newest = as_of - timedelta(days=first_day - 1)
+        oldest = as_of - timedelta(days=last_day) if last_day is not None else None
+        bounds.append((label, oldest, newest))
+    return bounds
+
+def billing_month(as_of: datetime) -> str:
+    return as_of.strftime("%Y-%m")
+
+# Receivables aging adds a bucket for balances not yet due
+CURRENT_BUCKET = "current"
+AR_BUCKETS: List[str] = [CURRENT_BUCKET] + [label for label, _, _ in AGING_BUCKETS]
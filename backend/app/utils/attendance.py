@@ -0,0 +1,30 @@
+from typing import Optional
+
+def set_session_bit(bitmap: Optional[bytes], session_index: int, present: bool) -> bytes:
+    """
+    Return a copy of the attendance bitmap with the bit for session_index set or cleared.
+    Bit i lives in byte i // 8 (little-endian bit order), growing the bitmap as needed.
+    """
+    data = bytearray(bitmap or b"")
+    byte_index, bit = divmod(session_index, 8)
+    if byte_index >= len(data):
+        if not present:
+            return bytes(data)
+        data.extend(b"\x00" * (byte_index + 1 - len(data)))
+    if present:
+        data[byte_index] |= 1 << bit
+    else:
+        data[byte_index] &= ~(1 << bit) & 0xFF
+    return bytes(data)
+
+def count_present(bitmap: Optional[bytes]) -> int:
+    """Number of sessions attended (popcount of the bitmap)."""
+    if not bitmap:
+        return 0
+    return int.from_bytes(bitmap, "little").bit_count()
+
+def attendance_rate(bitmap: Optional[bytes], sessions_held: int) -> Optional[float]:
+    """Share of held sessions attended, or None when no session has been held."""
+    if not sessions_held:
+        return None
+    return min(count_present(bitmap) / sessions_held, 1.0)
@@ -0,0 +1,107 @@
+import csv
+import hashlib
+import io
+import re
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+
+# Fixed-width statement layout: (field, start, end) character offsets
+FIXED_WIDTH_LAYOUT: List[Tuple[str, int, int]] = [
+    ("date", 0, 10),         # YYYY-MM-DD
+    ("amount", 10, 25),      # right-aligned, e.g. "      1250.00"
+    ("reference", 25, 45),
+    ("description", 45, 120),
+]
+
+# Header names accepted for each CSV column, compared lowercased
+CSV_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "date": ("date", "value date", "transaction date", "posted"),
+    "amount": ("amount", "credit", "credit amount"),
+    "reference": ("reference", "ref", "payment reference"),
+    "description": ("description", "narrative", "details", "memo"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d")
+
+INVOICE_REF = re.compile(r"\bINV[-\s#]?0*(\d+)\b", re.IGNORECASE)
+TOKEN = re.compile(r"[A-Za-z0-9]+")
+
+def text_lines(stream: BinaryIO, encoding: str = "utf-8-sig") -> Iterator[str]:
+    """Decode an uploaded file line by line without reading it into memory."""
+    return io.TextIOWrapper(stream, encoding=encoding, errors="replace", newline="")
+
+def line_key(line_no: int, raw: str) -> str:
+    """Idempotency key for a statement line, stable across re-imports of the same file."""
+    return "bank:" + hashlib.sha1(f"{line_no}|{raw.strip()}".encode()).hexdigest()[:32]
+
+def parse_amount(value: str) -> float:
+    cleaned = value.strip().replace(",", "").replace(" ", "")
+    if cleaned.startswith("(") and cleaned.endswith(")"):
+        cleaned = "-" + cleaned[1:-1]
+    return round(float(cleaned), 2)
+
+def parse_date(value: str) -> Optional[datetime]:
+    value = value.strip()
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date '{value}'")
+
+def _line(line_no: int, raw: str, fields: Dict[str, str]) -> Dict[str, Any]:
+    line = {
+        "line_no": line_no,
+        "key": line_key(line_no, raw),
+        "txn_date": None,
+        "amount": None,
+        "reference": (fields.get("reference") or "").strip() or None,
+        "description": (fields.get("description") or "").strip() or None,
+        "error": None,
+    }
+    try:
+        line["txn_date"] = parse_date(fields.get("date") or "")
+        line["amount"] = parse_amount(fields.get("amount") or "")
+    except ValueError as e:
+        line["error"] = str(e) or "Unparseable line"
+    return line
+
+def parse_csv(lines: Iterator[str]) -> Iterator[Dict[str, Any]]:
+    """Yield statement lines from a CSV with a header row, one at a time."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    names = [h.strip().lower() for h in header]
+    columns = {
+        field: next((names.index(a) for a in aliases if a in names), None)
+        for field, aliases in CSV_COLUMNS.items()
+    }
+    if columns["amount"] is None:
+        raise ValueError("CSV statement has no amount column")
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        fields = {field: row[i] if i is not None and i < len(row) else "" for field, i in columns.items()}
+        yield _line(reader.line_num, ",".join(row), fields)
+
+def parse_fixed_width(lines: Iterator[str]) -> Iterator[Dict[str, Any]]:
+    """Yield statement lines from a fixed-width file laid out as FIXED_WIDTH_LAYOUT."""
+    for line_no, raw in enumerate(lines, start=1):
+        raw = raw.rstrip("\r\n")
+        if not raw.strip():
+            continue
+        yield _line(line_no, raw, {field: raw[start:end] for field, start, end in FIXED_WIDTH_LAYOUT})
+
+PARSERS = {"csv": parse_csv, "fixed": parse_fixed_width}
+
+def invoice_refs(text: str) -> List[int]:
+    """Invoice ids quoted as INV-123 / INV 123 / INV#123."""
+    return [int(m) for m in INVOICE_REF.findall(text)]
+
+def tokens(text: str) -> Iterator[str]:
+    """Uppercased alphanumeric tokens, for looking up matricules."""
+    for token in TOKEN.findall(text):
+        yield token.upper()
@@ -0,0 +1,33 @@
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class ScopedCache:
+    """
+    Small in-process cache whose entries are tagged with a scope (e.g. a term)
+    so that a write can invalidate only the entries it affects. Entries also
+    expire after ttl_seconds as a safety net for writes that bypass invalidation.
+    """
+    def __init__(self, ttl_seconds: float = 600):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Hashable, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, _, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, scope: Hashable = None) -> None:
+        self._entries[key] = (time.monotonic(), scope, value)
+
+    def invalidate(self, scope: Hashable = None) -> None:
+        """Drop entries of the given scope, plus unscoped (cross-scope) entries."""
+        for key in [k for k, (_, s, _) in self._entries.items() if s is None or s == scope]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
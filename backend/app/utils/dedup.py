@@ -0,0 +1,82 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, Hashable, List, Optional
+
+# Trailing digits kept from a phone number: drops country codes and trunk zeros alike
+PHONE_KEY_DIGITS = 9
+# Two leads are the same person when both their names and their email local parts
+# are at least this similar by difflib ratio (and the locals carry the same digits)
+NAME_SIMILARITY = 0.85
+EMAIL_SIMILARITY = 0.85
+GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercase, drop +tags, and drop the dots Gmail ignores."""
+    if not email or "@" not in email:
+        return None
+    local, domain = email.strip().lower().rsplit("@", 1)
+    local = local.split("+", 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}" if local and domain else None
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) < PHONE_KEY_DIGITS:
+        return None
+    return digits[-PHONE_KEY_DIGITS:]
+
+def normalize_name(name: Optional[str]) -> str:
+    """Accent-free lowercase name tokens in sorted order, so "Smith, John" matches "john smith"."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(sorted(re.findall(r"[a-z]+", text)))
+
+def similar(a: str, b: str, threshold: float) -> bool:
+    """difflib ratio >= threshold, trying its cheap upper bounds first."""
+    matcher = SequenceMatcher(None, a, b)
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+def names_match(a: str, b: str) -> bool:
+    """Normalized names that are both present and similar; what a shared phone number needs to count as a match."""
+    return bool(a) and bool(b) and similar(a, b, NAME_SIMILARITY)
+
+def digits_of(text: str) -> str:
+    """The digits of an email local part: john.smith12 and john.smith13 are different people."""
+    return re.sub(r"\D", "", text)
+
+class UnionFind:
+    """Disjoint sets with path halving and union by size."""
+    def __init__(self) -> None:
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def find(self, item: Hashable) -> Hashable:
+        parent = self.parent.setdefault(item, item)
+        self.size.setdefault(item, 1)
+        while parent != item:
+            grandparent = self.parent[parent]
+            self.parent[item] = grandparent
+            item, parent = grandparent, self.parent[grandparent]
+        return item
+
+    def union(self, a: Hashable, b: Hashable) -> None:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+    def groups(self) -> List[List[Hashable]]:
+        """Sets with more than one member."""
+        by_root: Dict[Hashable, List[Hashable]] = {}
+        for item in self.parent:
+            by_root.setdefault(self.find(item), []).append(item)
+        return [members for members in by_root.values() if len(members) > 1]
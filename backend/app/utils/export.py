@@ -0,0 +1,26 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, List, Sequence
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def csv_header(columns: Sequence[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue()
+
+def encode_rows(format: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """One chunk of export output, CSV lines or one JSON object per line."""
+    if format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    lines: List[str] = [json.dumps(dict(zip(columns, row)), default=_json_default) for row in rows]
+    return "\n".join(lines) + "\n" if lines else ""
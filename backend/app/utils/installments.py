@@ -0,0 +1,37 @@
+from typing import List, Tuple
+from datetime import datetime, timedelta
+
+def to_cents(amount: float) -> int:
+    return int(round((amount or 0.0) * 100))
+
+def split_amount(total: float, parts: int) -> List[float]:
+    """
+    Split an amount into `parts` installments in whole cents. Every installment
+    gets the floor share and the last one absorbs the residue, so they always sum
+    back to the total exactly.
+    """
+    cents = to_cents(total)
+    share = cents // parts
+    return [share / 100] * (parts - 1) + [(cents - share * (parts - 1)) / 100]
+
+def due_dates(first_due: datetime, parts: int, interval_days: int = 30) -> List[datetime]:
+    return [first_due + timedelta(days=interval_days * i) for i in range(parts)]
+
+def allocate(amount: float, installments: List[Tuple[int, float, float]]) -> List[Tuple[int, float, bool]]:
+    """
+    Spread a payment over (id, amount, amount_paid) installments already sorted by
+    due date, filling each before the next. Returns (id, new amount_paid, fully paid)
+    for the installments it touched; anything beyond the schedule is left unallocated.
+    """
+    remaining = to_cents(amount)
+    touched = []
+    for installment_id, due, paid in installments:
+        if remaining <= 0:
+            break
+        open_cents = to_cents(due) - to_cents(paid)
+        if open_cents <= 0:
+            continue
+        applied = min(open_cents, remaining)
+        remaining -= applied
+        touched.append((installment_id, (to_cents(paid) + applied) / 100, applied == open_cents))
+    return touched
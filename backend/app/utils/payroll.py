@@ -0,0 +1,33 @@
+from typing import List, Optional, Sequence, Tuple
+from datetime import date
+import numpy as np
+
+def period_bounds(month: int, year: int) -> Tuple[date, date]:
+    """First day of the month and first day of the next."""
+    start = date(year, month, 1)
+    return start, date(year + month // 12, month % 12 + 1, 1)
+
+def working_days(month: int, year: int) -> int:
+    start, end = period_bounds(month, year)
+    return int(np.busday_count(start, end))
+
+def leave_days(starts: Sequence[date], ends: Sequence[date], month: int, year: int) -> np.ndarray:
+    """Working days of each leave (end date inclusive) that fall within the month."""
+    start, end = period_bounds(month, year)
+    starts = np.maximum(np.array(starts, dtype="datetime64[D]"), np.datetime64(start))
+    ends = np.minimum(np.array(ends, dtype="datetime64[D]") + 1, np.datetime64(end))
+    return np.busday_count(starts, np.maximum(ends, starts))
+
+def bracket_table(brackets: List[Tuple[Optional[float], float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(lower bounds, widths, rates) of [upper bound, rate] brackets; a null bound is open-ended."""
+    uppers = np.array([np.inf if upper is None else upper for upper, _ in brackets], dtype=float)
+    lowers = np.concatenate(([0.0], uppers[:-1]))
+    return lowers, uppers - lowers, np.array([rate for _, rate in brackets], dtype=float)
+
+def progressive_tax(taxable: np.ndarray, brackets: List[Tuple[Optional[float], float]]) -> np.ndarray:
+    """
+    Tax owed in each bracket, one row per taxable amount: the part of the amount
+    inside a bracket is taxed at that bracket's rate. Sum the rows for the total.
+    """
+    lowers, widths, rates = bracket_table(brackets)
+    return np.clip(taxable[:, None] - lowers, 0.0, widths) * rates
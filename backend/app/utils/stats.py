@@ -0,0 +1,31 @@
+from typing import List, Optional, Tuple
+
+HISTOGRAM_BINS = 10
+HISTOGRAM_WIDTH = 100 / HISTOGRAM_BINS
+
+def histogram_bin(score: float) -> int:
+    """Index of the fixed-width bin a 0-100 score falls into; 100 lands in the top bin."""
+    return min(max(int(score // HISTOGRAM_WIDTH), 0), HISTOGRAM_BINS - 1)
+
+def welford_add(count: int, mean: float, m2: float, x: float) -> Tuple[int, float, float]:
+    """Fold one observation into a running (count, mean, M2)."""
+    count += 1
+    delta = x - mean
+    mean += delta / count
+    m2 += delta * (x - mean)
+    return count, mean, m2
+
+def welford_remove(count: int, mean: float, m2: float, x: float) -> Tuple[int, float, float]:
+    """Take one previously added observation back out of a running (count, mean, M2)."""
+    if count <= 1:
+        return 0, 0.0, 0.0
+    new_mean = (count * mean - x) / (count - 1)
+    m2 -= (x - new_mean) * (x - mean)
+    return count - 1, new_mean, max(m2, 0.0)
+
+def variance(count: int, m2: float) -> Optional[float]:
+    """Sample variance from a running M2."""
+    return m2 / (count - 1) if count > 1 else None
+
+def empty_histogram() -> List[int]:
+    return [0] * HISTOGRAM_BINS
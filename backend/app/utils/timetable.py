@@ -0,0 +1,288 @@
+import heapq
+import random
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Co-requisites must be takeable together, so a clash costs as much as this many students
+COREQUISITE_WEIGHT = 1000
+# Penalty per section that cannot be seated in any free room of its slot
+ROOM_WEIGHT = 1000
+
+def add_conflict(conflicts: Dict[int, Dict[int, int]], a: int, b: int, weight: int = 1) -> None:
+    """Accumulate a symmetric conflict weight between two courses."""
+    if a == b:
+        return
+    conflicts.setdefault(a, {})
+    conflicts.setdefault(b, {})
+    conflicts[a][b] = conflicts[a].get(b, 0) + weight
+    conflicts[b][a] = conflicts[b].get(a, 0) + weight
+
+class _IndexedSet:
+    """Set with O(1) add, discard and uniform random choice."""
+    def __init__(self) -> None:
+        self.items: List[Any] = []
+        self.pos: Dict[Any, int] = {}
+
+    def add(self, item: Any) -> None:
+        if item not in self.pos:
+            self.pos[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item: Any) -> None:
+        i = self.pos.pop(item, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.pos[last] = i
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+class TimetableSolver:
+    """
+    Weekly timetable for course sections. Each course needs `hours` distinct slots;
+    two courses sharing students (or linked as co-requisites) should not share a
+    slot, and with rooms given every slot must seat its sections.
+
+    Construction is DSatur graph colouring on the course conflict graph, followed
+    by a tabu min-conflicts local search on whatever clashes remain.
+    """
+    def __init__(
+        self,
+        sections: Dict[int, Dict[str, int]],
+        conflicts: Dict[int, Dict[int, int]],
+        days: int = 5,
+        periods_per_day: int = 8,
+        rooms: Optional[List[Tuple[str, int]]] = None,
+        seed: int = 0
+    ) -> None:
+        self.sections = sections
+        self.adj = {cid: conflicts.get(cid, {}) for cid in sections}
+        self.days = days
+        self.periods_per_day = periods_per_day
+        self.n_slots = days * periods_per_day
+        self.rooms = sorted(rooms or [], key=lambda r: r[1])
+        self.room_caps = [cap for _, cap in self.rooms]
+        self.rng = random.Random(seed)
+        # Sections no room can seat are reported by assign_rooms but not allowed to
+        # block the room check for everyone else sharing their slots
+        self.oversized = {
+            cid for cid, section in sections.items()
+            if self.rooms and section["size"] > self.room_caps[-1]
+        }
+
+        self.assignment: Dict[int, List[int]] = {cid: [] for cid in sections}
+        self.slot_courses: List[Set[int]] = [set() for _ in range(self.n_slots)]
+        # Section sizes per slot as {size: count}; course capacities repeat a lot
+        self.slot_sizes: List[Dict[int, int]] = [{} for _ in range(self.n_slots)]
+
+    # Rooms: sections fit rooms with capacity >= size, a nested structure, so a
+    # slot can seat its sections iff for every size t the sections of size >= t
+    # do not outnumber the rooms of capacity >= t.
+    def _rooms_at_least(self, size: int) -> int:
+        return len(self.room_caps) - bisect_left(self.room_caps, size)
+
+    def _overflow(self, slot: int, add: Optional[int] = None, remove: Optional[int] = None) -> int:
+        """Sections of `slot` left without a room, optionally with one section added or removed."""
+        if not self.rooms:
+            return 0
+        counts = dict(self.slot_sizes[slot])
+        if add is not None:
+            counts[add] = counts.get(add, 0) + 1
+        if remove is not None:
+            counts[remove] -= 1
+        worst = 0
+        at_least = 0
+        for size in sorted(counts, reverse=True):
+            at_least += counts[size]
+            worst = max(worst, at_least - self._rooms_at_least(size))
+        return worst
+
+    def _student_cost(self, cid: int, slot: int) -> int:
+        """Weighted clashes course `cid` would have in `slot` (excluding itself)."""
+        neighbours = self.adj[cid]
+        occupants = self.slot_courses[slot]
+        if len(neighbours) < len(occupants):
+            return sum(w for n, w in neighbours.items() if n in occupants)
+        return sum(neighbours.get(n, 0) for n in occupants if n != cid)
+
+    def _place(self, cid: int, slot: int) -> None:
+        self.assignment[cid].append(slot)
+        self.slot_courses[slot].add(cid)
+        if cid not in self.oversized:
+            sizes = self.slot_sizes[slot]
+            size = self.sections[cid]["size"]
+            sizes[size] = sizes.get(size, 0) + 1
+
+    def _unplace(self, cid: int, slot: int) -> None:
+        self.assignment[cid].remove(slot)
+        self.slot_courses[slot].discard(cid)
+        if cid not in self.oversized:
+            sizes = self.slot_sizes[slot]
+            size = self.sections[cid]["size"]
+            sizes[size] -= 1
+            if not sizes[size]:
+                del sizes[size]
+
+    def _day(self, slot: int) -> int:
+        return slot // self.periods_per_day
+
+    def _choose_slots(self, cid: int, blocked: int) -> List[int]:
+        """Pick `hours` slots for a course, spreading meetings across days."""
+        size = None if cid in self.oversized else self.sections[cid]["size"]
+        hours = min(self.sections[cid]["hours"], self.n_slots)
+        chosen: List[int] = []
+        for _ in range(hours):
+            used_days = [self._day(s) for s in chosen]
+            best, best_key = None, None
+            for slot in range(self.n_slots):
+                if slot in chosen:
+                    continue
+                free = not (blocked >> slot) & 1
+                clash = 0 if free else self._student_cost(cid, slot)
+                overflow = self._overflow(slot, add=size) - self._overflow(slot)
+                key = (clash + ROOM_WEIGHT * overflow, used_days.count(self._day(slot)), len(self.slot_courses[slot]), slot)
+                if best_key is None or key < best_key:
+                    best, best_key = slot, key
+            chosen.append(best)
+        return chosen
+
+    def construct(self) -> Iterator[Dict[str, Any]]:
+        """DSatur: colour the most constrained course (most blocked slots) first."""
+        blocked = {cid: 0 for cid in self.sections}
+        degree = {cid: sum(self.adj[cid].values()) for cid in self.sections}
+        heap = [(0, -degree[cid], -self.sections[cid]["hours"], cid) for cid in self.sections]
+        heapq.heapify(heap)
+        placed = 0
+        total = len(self.sections)
+        while heap:
+            neg_sat, _, _, cid = heapq.heappop(heap)
+            if self.assignment[cid] or -neg_sat != bin(blocked[cid]).count("1"):
+                continue
+            for slot in self._choose_slots(cid, blocked[cid]):
+                self._place(cid, slot)
+                bit = 1 << slot
+                for n in self.adj[cid]:
+                    if not self.assignment[n] and not blocked[n] & bit:
+                        blocked[n] |= bit
+                        heapq.heappush(heap, (-bin(blocked[n]).count("1"), -degree[n], -self.sections[n]["hours"], n))
+            placed += 1
+            if placed % 100 == 0 or placed == total:
+                yield {"phase": "construct", "placed": placed, "total": total}
+
+    def _meeting_cost(self, cid: int, slot: int) -> int:
+        cost = self._student_cost(cid, slot)
+        if self.rooms and self._overflow(slot):
+            cost += ROOM_WEIGHT
+        return cost
+
+    def total_cost(self) -> int:
+        clashes = sum(
+            self._student_cost(cid, slot) for cid, slots in self.assignment.items() for slot in slots
+        ) // 2
+        return clashes + ROOM_WEIGHT * sum(self._overflow(slot) for slot in range(self.n_slots))
+
+    def improve(self, max_iterations: int = 20000, time_limit: float = 10.0, tabu_tenure: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Tabu min-conflicts: repeatedly move a random clashing meeting to its
+        cheapest slot, forbidding recently vacated slots unless that beats the best.
+        """
+        conflicted = _IndexedSet()
+
+        def refresh(cid: int, slot: int) -> None:
+            if slot in self.assignment[cid] and self._meeting_cost(cid, slot) > 0:
+                conflicted.add((cid, slot))
+            else:
+                conflicted.discard((cid, slot))
+
+        for cid, slots in self.assignment.items():
+            for slot in slots:
+                refresh(cid, slot)
+
+        cost = self.total_cost()
+        best_cost = cost
+        best = {cid: list(slots) for cid, slots in self.assignment.items()}
+        tabu: Dict[Tuple[int, int], int] = {}
+        started = time.perf_counter()
+        iteration = 0
+        while conflicted and iteration < max_iterations and time.perf_counter() - started < time_limit:
+            iteration += 1
+            cid, source = conflicted.items[self.rng.randrange(len(conflicted))]
+            size = None if cid in self.oversized else self.sections[cid]["size"]
+            own = set(self.assignment[cid])
+            leave = self._student_cost(cid, source) + ROOM_WEIGHT * (
+                self._overflow(source) - self._overflow(source, remove=size)
+            )
+
+            candidates: List[int] = []
+            best_delta = None
+            for slot in range(self.n_slots):
+                if slot in own:
+                    continue
+                delta = self._student_cost(cid, slot) + ROOM_WEIGHT * (
+                    self._overflow(slot, add=size) - self._overflow(slot)
+                ) - leave
+                if tabu.get((cid, slot), 0) > iteration and cost + delta >= best_cost:
+                    continue
+                if best_delta is None or delta < best_delta:
+                    best_delta, candidates = delta, [slot]
+                elif delta == best_delta:
+                    candidates.append(slot)
+            if not candidates:
+                continue
+
+            target = self.rng.choice(candidates)
+            self._unplace(cid, source)
+            self._place(cid, target)
+            tabu[(cid, source)] = iteration + tabu_tenure
+            cost += best_delta
+
+            affected = {(cid, source), (cid, target)}
+            for slot in (source, target):
+                for other in (self.slot_courses[slot] if self.rooms else self.slot_courses[slot] & self.adj[cid].keys()):
+                    affected.add((other, slot))
+            for other, slot in affected:
+                refresh(other, slot)
+
+            if cost < best_cost:
+                best_cost = cost
+                best = {c: list(slots) for c, slots in self.assignment.items()}
+            if iteration % 1000 == 0:
+                yield {"phase": "improve", "iteration": iteration, "conflicts": best_cost}
+
+        if cost > best_cost:
+            for c, slots in best.items():
+                for slot in list(self.assignment[c]):
+                    self._unplace(c, slot)
+            for c, slots in best.items():
+                for slot in slots:
+                    self._place(c, slot)
+        yield {"phase": "improve", "iteration": iteration, "conflicts": best_cost}
+
+    def solve(self, max_iterations: int = 20000, time_limit: float = 10.0) -> Iterator[Dict[str, Any]]:
+        """Run both phases, yielding progress dicts along the way."""
+        yield from self.construct()
+        yield from self.improve(max_iterations=max_iterations, time_limit=time_limit)
+
+    def assign_rooms(self) -> Dict[Tuple[int, int], Optional[str]]:
+        """Seat each slot's sections, largest first into the smallest room that fits."""
+        seats: Dict[Tuple[int, int], Optional[str]] = {}
+        for slot, courses in enumerate(self.slot_courses):
+            free = list(self.rooms)
+            for cid in sorted(courses, key=lambda c: -self.sections[c]["size"]):
+                i = bisect_left([cap for _, cap in free], self.sections[cid]["size"])
+                seats[(cid, slot)] = free.pop(i)[0] if i < len(free) else None
+        return seats
+
+    def clashes(self) -> List[Tuple[int, int, int]]:
+        """Remaining (course, course, slot) clashes."""
+        found = []
+        for slot, courses in enumerate(self.slot_courses):
+            for cid in courses:
+                for other, weight in self.adj[cid].items():
+                    if cid < other and other in courses:
+                        found.append((cid, other, slot))
+        return found
@@ -0,0 +1,14 @@
+import asyncio
+import sys
+from app.db.session import AsyncSessionLocal
+from app.services.lead_dedup_service import lead_dedup_service
+
+async def dedup_leads(dry_run: bool):
+    async with AsyncSessionLocal() as db:
+        result = await lead_dedup_service.dedup_leads(db, dry_run=dry_run)
+        action = "Would merge" if dry_run else "Merged"
+        print(f"{action} {result['merged']} of {result['leads']} leads into {result['clusters']} clusters")
+
+if __name__ == "__main__":
+    # Pass --apply to write the merges; without it this is a dry run
+    asyncio.run(dedup_leads(dry_run="--apply" not in sys.argv[1:]))
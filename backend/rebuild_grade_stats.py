@@ -0,0 +1,13 @@
+import asyncio
+import sys
+from app.db.session import AsyncSessionLocal
+from app.crud.crud_course_grade_stat import course_grade_stat
+
+async def rebuild_grade_stats(course_id: int = None):
+    async with AsyncSessionLocal() as db:
+        rebuilt = await course_grade_stat.rebuild(db, course_id=course_id)
+        scope = f"course {course_id}" if course_id else "all courses"
+        print(f"Rebuilt {rebuilt} grade statistic rows for {scope}")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_grade_stats(int(sys.argv[1]) if len(sys.argv) > 1 else None))
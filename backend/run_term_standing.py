@@ -0,0 +1,23 @@
+import asyncio
+import sys
+from app.db.session import AsyncSessionLocal
+from app.services.academic_service import academic_service
+
+async def run_term_standing(term: str, restart: bool = False):
+    async with AsyncSessionLocal() as db:
+        job = await academic_service.get_standing_job(db, term=term, restart=restart)
+        if not await academic_service.claim_standing_job(db, job):
+            print(f"Job #{job.id} is already running ({job.processed}/{job.total})")
+            return
+        if job.last_processed_id:
+            print(f"Resuming job #{job.id} after student {job.last_processed_id} ({job.processed}/{job.total})")
+        else:
+            print(f"Starting job #{job.id} for {term} ({job.total} students)")
+        job = await academic_service.run_term_standing(db, job)
+        print(f"Processed {job.processed} students in {job.elapsed_seconds:.2f}s ({job.throughput} students/s)")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('Usage: python run_term_standing.py "Fall 2026" [--restart]')
+        sys.exit(1)
+    asyncio.run(run_term_standing(sys.argv[1], restart="--restart" in sys.argv))
@@ -0,0 +1,12 @@
+import asyncio
+from app.db.session import AsyncSessionLocal
+from app.services.aging_service import aging_service
+
+async def snapshot_ar_aging():
+    async with AsyncSessionLocal() as db:
+        rows = await aging_service.create_snapshot(db)
+        print(f"Stored {rows} aging snapshot rows")
+
+if __name__ == "__main__":
+    # Run daily (e.g. from cron) so trend charts have one snapshot per day
+    asyncio.run(snapshot_ar_aging())